@@ -0,0 +1,71 @@
+"""
+Compares the single-pass extraction engine with the original root-level
+find/select parser (kept in ``tests/legacy_store_parser.py``).
+
+For each fixture page the script reports the median time to build the
+BeautifulSoup tree and the median extraction time of both implementations,
+after checking that they produce identical output.
+
+Usage:
+    python benchmarks/bench_extraction.py [--runs 30]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from bs4 import BeautifulSoup
+
+from legacy_store_parser import parse_game_details
+from steamscraper.steam_data.store_html_extract import STORE_EXTRACTOR
+
+FIXTURES = ['Cyberpunk_2077-1091500-schinese.html', 'ELDEN_RING-1245620-english.html']
+
+
+def tree_build_ms(html: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        BeautifulSoup(html, 'html.parser').decompose()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def median_ms(fn, html: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        soup = BeautifulSoup(html, 'html.parser')
+        started = time.perf_counter()
+        fn(soup)
+        samples.append(time.perf_counter() - started)
+        soup.decompose()
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'page':<40}{'tree ms':>10}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}")
+    for name in FIXTURES:
+        with open(os.path.join(REPO_ROOT, 'tests', 'test_data', name), 'r', encoding='utf-8') as f:
+            html = f.read()
+        engine_out = STORE_EXTRACTOR.extract(BeautifulSoup(html, 'html.parser'))
+        legacy_out = parse_game_details(BeautifulSoup(html, 'html.parser'))
+        assert json.dumps(engine_out) == json.dumps(legacy_out), f"Output mismatch on {name}"
+
+        tree = tree_build_ms(html, max(3, args.runs // 5))
+        legacy = median_ms(parse_game_details, html, args.runs)
+        engine = median_ms(STORE_EXTRACTOR.extract, html, args.runs)
+        print(f"{name:<40}{tree:>10.1f}{legacy:>12.2f}{engine:>12.2f}{legacy / engine:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Tail latency of single-app lookups with and without request hedging.
+
+The mock store answers most requests after ``--latency`` (+ jitter) but a
+``--slow-rate`` share of responses is delayed by ``--slow-latency`` seconds,
+like the occasional stuck Steam response. The same lookups are run through
+``SteamAppDetailsDataSource`` without a hedger and with one (95th-percentile
+trigger, 5% budget by default), and latency percentiles, hedge rate and the
+time saved by winning hedges are reported.
+
+Usage:
+    python benchmarks/bench_hedging.py [--lookups 1000] [--concurrency 8] [--slow-rate 0.02] [--slow-latency 1.0]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from load_test import percentile
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_utils.hedging import Hedger
+from steamscraper.steam_utils.web_utils import SharedSession
+
+
+def run(store_url: str, lookups: int, concurrency: int, hedger):
+    with SharedSession(pool_size=concurrency * 2) as session:
+        source = SteamAppDetailsDataSource(store_url=store_url, session=session, hedger=hedger)
+
+        def one(i):
+            started = time.perf_counter()
+            source.get_data(str(1000 + i))
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return sorted(executor.map(one, range(lookups)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--slow-rate', type=float, default=0.02)
+    parser.add_argument('--slow-latency', type=float, default=1.0)
+    parser.add_argument('--percentile', type=float, default=95.0, help='Hedge trigger percentile.')
+    parser.add_argument('--budget', type=float, default=0.05, help='Maximum share of hedged lookups.')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print(f"{args.lookups} lookups, concurrency {args.concurrency}, {args.slow_rate:.0%} of responses "
+          f"delayed by {args.slow_latency * 1000:.0f} ms\n")
+    print(f"{'mode':<10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'p99.9 ms':>10}{'mean ms':>9}{'hedged':>8}{'wins':>6}{'saved s':>9}")
+    for name, hedger in (('baseline', None), ('hedged', Hedger(percentile=args.percentile, budget=args.budget))):
+        # A fresh, identically seeded server per mode so both see the same outliers
+        with MockSteamServer(latency=args.latency, jitter=args.jitter, slow_rate=args.slow_rate,
+                             slow_latency=args.slow_latency, any_app=True, seed=1) as server:
+            latencies = run(server.url, args.lookups, args.concurrency, hedger)
+            time.sleep(args.slow_latency)  # Let cancelled primaries finish so savings are counted
+        stats = hedger.stats() if hedger else {'hedge_rate': 0.0, 'hedge_wins': 0, 'saved_seconds': 0.0}
+        if hedger:
+            hedger.close()
+        print(f"{name:<10}" + ''.join(f"{percentile(latencies, pct) * 1000:>9.1f}" for pct in (50, 95, 99))
+              + f"{percentile(latencies, 99.9) * 1000:>10.1f}{sum(latencies) / len(latencies) * 1000:>9.1f}"
+              f"{stats['hedge_rate']:>8.1%}{stats['hedge_wins']:>6}{stats['saved_seconds']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
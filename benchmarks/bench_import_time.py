@@ -0,0 +1,65 @@
+"""
+Import-time benchmark for the package and CLI cold start.
+
+Each target is imported in a fresh interpreter (``python -X importtime``) so
+that nothing is already cached in ``sys.modules``. The median cumulative
+import time is compared against a budget and the script exits non-zero if any
+target is over it.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 7] [--budget-ms 20]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# target module -> default budget in milliseconds
+TARGETS = {
+    'steamscraper': 20.0,
+    'steamscraper.cli': 40.0,
+}
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(\S+)")
+
+
+def measure_import_ms(module: str) -> float:
+    """
+    Returns the cumulative import time of ``module`` in milliseconds, measured
+    in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000.0
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark package import time.')
+    parser.add_argument('--runs', type=int, default=7, help='Number of fresh-interpreter runs per target.')
+    parser.add_argument('--budget-ms', type=float, help='Override the budget for every target.')
+    args = parser.parse_args()
+
+    over_budget = False
+    for module, default_budget in TARGETS.items():
+        budget = args.budget_ms if args.budget_ms is not None else default_budget
+        samples = [measure_import_ms(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        status = 'OK' if median <= budget else 'OVER BUDGET'
+        over_budget |= median > budget
+        print(f"{module:<20} median={median:7.2f}ms min={min(samples):7.2f}ms budget={budget:.0f}ms {status}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
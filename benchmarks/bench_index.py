@@ -0,0 +1,110 @@
+"""
+Benchmarks the inverted index against a linear scan over the same records.
+
+Generates N synthetic records shaped like store-html output (tags, features,
+language support, reviews, price, release date), builds a GameIndex, and times
+a set of boolean/range queries against the equivalent list-comprehension scan.
+Also times incremental updates after the index has been queried.
+
+Usage:
+    python benchmarks/bench_index.py [--records 100000] [--runs 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from steamscraper.steam_index import GameIndex, Range, Term, parse_price
+
+TAGS = ['Roguelike', 'Indie', 'Action', 'RPG', 'Strategy', 'Puzzle', 'Simulation', 'Adventure', 'Casual', 'Horror',
+        'Open World', 'Co-op', 'Pixel Graphics', 'Story Rich', 'Sci-fi', 'Fantasy', 'Anime', 'Sports', 'Racing', 'Survival']
+FEATURES = ['Single-player', 'Online Co-op', 'Steam Achievements', 'Full controller support', 'Steam Cloud', 'Family Sharing']
+LANGUAGES = ['English', 'Japanese', 'French', 'German', 'Simplified Chinese', 'Spanish - Spain', 'Russian', 'Korean']
+SUMMARIES = ['Overwhelmingly Positive', 'Very Positive', 'Mostly Positive', 'Mixed', 'Mostly Negative']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def synthetic_record(rng: random.Random) -> dict:
+    return {
+        'tags': rng.sample(TAGS, rng.randint(3, 12)),
+        'features': rng.sample(FEATURES, rng.randint(1, 5)),
+        'developer': {'name': f'Studio {rng.randint(0, 5000)}', 'link': None},
+        'publisher': {'name': f'Publisher {rng.randint(0, 800)}', 'link': None},
+        'language_support': [
+            {'language': lang, 'interface': True, 'full_audio': rng.random() < 0.3, 'subtitles': rng.random() < 0.8}
+            for lang in rng.sample(LANGUAGES, rng.randint(1, len(LANGUAGES)))
+        ],
+        'reviews': {'recent': {'summary': rng.choice(SUMMARIES), 'tooltip': ''},
+                    'all': {'summary': rng.choice(SUMMARIES), 'tooltip': ''}},
+        'price': rng.choice(['Free to Play', f'${rng.randint(1, 70)}.99']),
+        'release_date': f'{rng.randint(1, 28)} {rng.choice(MONTHS)}, {rng.randint(2005, 2025)}',
+    }
+
+
+def _has_audio(record, language):
+    return any(entry['language'] == language and entry['full_audio'] for entry in record['language_support'])
+
+
+QUERIES = [
+    ('tag=Roguelike & audio=Japanese & recent=Mostly Positive',
+     Term('tag', 'Roguelike') & Term('audio_language', 'Japanese') & Term('recent_reviews', 'Mostly Positive'),
+     lambda r: 'Roguelike' in r['tags'] and _has_audio(r, 'Japanese') and r['reviews']['recent']['summary'] == 'Mostly Positive'),
+    ('(RPG | Strategy) & ~Casual & price <= 20',
+     (Term('tag', 'RPG') | Term('tag', 'Strategy')) & ~Term('tag', 'Casual') & Range('price', high=20),
+     lambda r: ('RPG' in r['tags'] or 'Strategy' in r['tags']) and 'Casual' not in r['tags'] and parse_price(r) <= 20),
+    ('feature=Online Co-op & released >= 2020',
+     Term('feature', 'Online Co-op') & Range('release_date', low=date(2020, 1, 1)),
+     lambda r: 'Online Co-op' in r['features'] and int(r['release_date'][-4:]) >= 2020),
+]
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = [synthetic_record(rng) for _ in range(args.records)]
+
+    index = GameIndex()
+    started = time.perf_counter()
+    index.add_many(enumerate(records))
+    print(f"Built index over {len(index)} records in {time.perf_counter() - started:.2f}s")
+
+    print(f"\n{'query':<58}{'matches':>9}{'first ms':>10}{'index ms':>10}{'scan ms':>10}")
+    for name, query, predicate in QUERIES:
+        started = time.perf_counter()
+        index.search(query)
+        first = time.perf_counter() - started  # Includes building any posting bitmaps not yet used
+        index_time, matches = timed(lambda: index.search(query), args.runs)
+        scan_time, expected = timed(lambda: [i for i, r in enumerate(records) if predicate(r)], max(1, args.runs // 10))
+        assert matches == expected, name
+        print(f"{name:<58}{len(matches):>9}{first * 1000:>10.2f}{index_time * 1000:>10.2f}{scan_time * 1000:>10.1f}")
+
+    updates = 1000
+    started = time.perf_counter()
+    for n in range(updates):
+        index.add(n, synthetic_record(rng))
+    elapsed = time.perf_counter() - started
+    print(f"\nIncremental updates after querying: {updates / elapsed:.0f} records/s")
+
+
+if __name__ == '__main__':
+    main()
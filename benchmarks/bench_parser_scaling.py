@@ -0,0 +1,83 @@
+"""
+Store-page parse time as each repeated section grows, using the synthetic
+page generator in ``tests/synthetic_pages.py``.
+
+For every dimension (description paragraphs, videos, screenshots, DLC rows,
+language rows, system requirement lines, features, tags) pages with 1x, 4x
+and 16x the base size are parsed with
+    default  ``BeautifulSoup(html, 'html.parser')`` + the extraction engine
+    store    ``parse_store_html`` + the extraction engine (what StoreHtmlDataSource uses)
+    legacy   the original root-level find/select parser (``tests/legacy_store_parser.py``)
+and the time per page and the growth exponent between the two largest sizes
+(1.0 = linear, 2.0 = quadratic) are reported.
+
+Usage:
+    python benchmarks/bench_parser_scaling.py [--scale 1.0] [--repeats 3]
+"""
+import argparse
+import gc
+import math
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from bs4 import BeautifulSoup
+
+from legacy_store_parser import parse_game_details
+from synthetic_pages import synthetic_store_page
+from steamscraper.steam_data.store_html_extract import STORE_EXTRACTOR, parse_store_html
+
+BASE_SIZES = {
+    'paragraphs': 1000,
+    'videos': 25,
+    'screenshots': 50,
+    'dlcs': 50,
+    'languages': 50,
+    'requirements': 250,
+    'features': 50,
+    'tags': 50,
+}
+
+PARSERS = {
+    'default': lambda html: STORE_EXTRACTOR.extract(BeautifulSoup(html, 'html.parser')),
+    'store': lambda html: STORE_EXTRACTOR.extract(parse_store_html(html)),
+    'legacy': lambda html: parse_game_details(BeautifulSoup(html, 'html.parser')),
+}
+
+
+def best_time(fn, html: str, repeats: int) -> float:
+    best = math.inf
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            fn(html)
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for the base section sizes.')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'dimension':<14}{'parser':<9}{'items':>7}{'page KB':>9}{'1x ms':>9}{'4x ms':>9}{'16x ms':>10}{'exponent':>10}")
+    for dimension, base in BASE_SIZES.items():
+        sizes = [max(1, int(base * args.scale * factor)) for factor in (1, 4, 16)]
+        pages = [synthetic_store_page(7, **{dimension: size}) for size in sizes]
+        for name, fn in PARSERS.items():
+            times = [best_time(fn, page, args.repeats) for page in pages]
+            exponent = math.log(times[2] / times[1]) / math.log(sizes[2] / sizes[1])
+            print(f"{dimension:<14}{name:<9}{sizes[2]:>7}{len(pages[2]) // 1024:>9}"
+                  + ''.join(f"{t * 1000:>9.1f}" for t in times[:2]) + f"{times[2] * 1000:>10.1f}{exponent:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
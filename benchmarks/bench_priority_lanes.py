@@ -0,0 +1,89 @@
+"""
+Interactive lookup latency while a bulk crawl saturates the rate limit.
+
+A crawl of ``--crawl-workers`` threads keeps the shared session's token bucket
+(``--rate`` requests per second) busy while an interactive client issues one
+single-app lookup every ``--interval`` seconds. The same run is repeated with
+one plain TokenBucket, where interactive requests queue behind the crawl, and
+with PriorityLanes, where they go through the interactive lane. Interactive
+latency percentiles and the crawl's throughput are reported.
+
+Usage:
+    python benchmarks/bench_priority_lanes.py [--rate 50] [--crawl-workers 16] [--lookups 50] [--interval 0.1]
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from load_test import percentile
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_utils.priority_lanes import CRAWL, PriorityLanes, fetch_lane
+from steamscraper.steam_utils.rate_limit import TokenBucket
+from steamscraper.steam_utils.web_utils import SharedSession
+
+
+def run(store_url: str, session: SharedSession, crawl_workers: int, lookups: int, interval: float):
+    source = SteamAppDetailsDataSource(store_url=store_url, session=session)
+    stop = threading.Event()
+    crawled = []
+
+    def crawl(worker: int):
+        with fetch_lane(CRAWL):
+            app_id = 100000 * (worker + 1)
+            while not stop.is_set():
+                source.get_data(str(app_id))
+                crawled.append(app_id)
+                app_id += 1
+
+    latencies = []
+    with ThreadPoolExecutor(max_workers=crawl_workers) as executor:
+        for worker in range(crawl_workers):
+            executor.submit(crawl, worker)
+        time.sleep(1.0)  # Let the crawl build up its backlog
+        started = time.perf_counter()
+        for i in range(lookups):
+            lookup_started = time.perf_counter()
+            source.get_data(str(10 + i))
+            latencies.append(time.perf_counter() - lookup_started)
+            time.sleep(max(0.0, interval - latencies[-1]))
+        elapsed = time.perf_counter() - started
+        stop.set()
+    return sorted(latencies), len(crawled) / (elapsed + 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=50.0, help='Upstream requests per second shared by both clients.')
+    parser.add_argument('--crawl-workers', type=int, default=16)
+    parser.add_argument('--lookups', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.1, help='Seconds between interactive lookups.')
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print(f"{args.crawl_workers} crawl threads, {args.rate:.0f} requests/s, {args.lookups} interactive lookups\n")
+    print(f"{'mode':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'crawl req/s':>13}")
+    pool_size = args.crawl_workers + 4
+    for name in ('token-bucket', 'priority-lanes'):
+        bucket = TokenBucket(args.rate, burst=1)
+        if name == 'token-bucket':
+            session = SharedSession(pool_size=pool_size, rate_limiter=bucket)
+        else:
+            session = SharedSession(pool_size=pool_size, lanes=PriorityLanes(max_concurrency=pool_size, rate_limiter=bucket))
+        with MockSteamServer(latency=args.latency, any_app=True) as server, session:
+            latencies, crawl_rate = run(server.url, session, args.crawl_workers, args.lookups, args.interval)
+        print(f"{name:<14}" + ''.join(f"{percentile(latencies, pct) * 1000:>9.1f}" for pct in (50, 95, 99))
+              + f"{latencies[-1] * 1000:>9.1f}{crawl_rate:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Simulates a catalog refresh under a fixed request budget and compares the
+adaptive RefreshScheduler with a uniform round-robin refresh.
+
+Each simulated app changes as a Poisson process. Popular apps (more reviews)
+change more often, a third of the catalog never changes (dead apps), and
+discounted apps change faster while the discount runs. Freshness is the share
+of apps whose last fetched copy is still current, sampled every simulated hour;
+weighted freshness weighs each app by popularity (1 + log10(1 + reviews)), which
+is closer to the share of lookups that see current data.
+
+Usage:
+    python benchmarks/bench_refresh_scheduler.py [--apps 5000] [--days 30] [--requests-per-day 5000]
+"""
+import argparse
+import bisect
+import math
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from steamscraper.steam_crawl.refresh_scheduler import RefreshScheduler
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class SimulatedCatalog:
+    def __init__(self, apps: int, days: int, seed: int):
+        rng = random.Random(seed)
+        self.reviews = {}
+        self.discounted = {}
+        self.change_times = {}
+        for app_id in range(apps):
+            dead = rng.random() < 0.33
+            reviews = 0 if dead else int(10 ** rng.uniform(0, 6))
+            discounted = not dead and rng.random() < 0.1
+            # Changes per day: ~0 for dead apps, up to several per day for popular/discounted ones
+            rate = 0.0 if dead else 0.02 * (1 + reviews ** 0.35) * (3 if discounted else 1)
+            times, t = [], 0.0
+            while rate:
+                t += rng.expovariate(rate / DAY)
+                if t > days * DAY:
+                    break
+                times.append(t)
+            self.reviews[app_id] = reviews
+            self.discounted[app_id] = discounted
+            self.change_times[app_id] = times
+
+    def version(self, app_id: int, now: float) -> int:
+        return bisect.bisect_right(self.change_times[app_id], now)
+
+    def record(self, app_id: int, now: float) -> dict:
+        tooltip = f"90% of the {self.reviews[app_id]:,} user reviews for this game are positive."
+        price = {'discount_price': '$5', 'original_price': '$10'} if self.discounted[app_id] else '$10'
+        return {'title': f'App {app_id}', 'short_description': f'v{self.version(app_id, now)}', 'price': price,
+                'reviews': {'all': {'summary': 'Positive', 'tooltip': tooltip}}}
+
+
+def simulate(catalog: SimulatedCatalog, apps: int, days: int, requests_per_day: int, adaptive: bool):
+    clock = [0.0]
+    seen_version = {}
+    scheduler = RefreshScheduler(requests_per_hour=requests_per_day / 24, burst=requests_per_day / 24,
+                                 base_interval=apps / requests_per_day * DAY, min_interval=HOUR, clock=lambda: clock[0])
+    scheduler.add(range(apps), due=0.0)
+    cursor = 0
+    fetches = detected = 0
+    freshness, weighted = [], []
+    weights = {app_id: 1 + math.log10(1 + catalog.reviews[app_id]) for app_id in range(apps)}
+    total_weight = sum(weights.values())
+    for hour in range(days * 24):
+        clock[0] = hour * HOUR
+        if adaptive:
+            batch = scheduler.next_batch(max_size=requests_per_day)
+        else:
+            count = int(requests_per_day / 24)
+            batch = [(cursor + i) % apps for i in range(count)]
+            cursor = (cursor + count) % apps
+        for app_id in batch:
+            version = catalog.version(app_id, clock[0])
+            if app_id in seen_version and version != seen_version[app_id]:
+                detected += 1
+            seen_version[app_id] = version
+            fetches += 1
+            if adaptive:
+                scheduler.record_fetch(app_id, catalog.record(app_id, clock[0]))
+        fresh = [app_id for app_id, version in seen_version.items() if catalog.version(app_id, clock[0]) == version]
+        freshness.append(len(fresh) / apps)
+        weighted.append(sum(weights[app_id] for app_id in fresh) / total_weight)
+    # Skip the first day, while the initial full pass is still running
+    steady, steady_weighted = freshness[24:] or freshness, weighted[24:] or weighted
+    return sum(steady) / len(steady), sum(steady_weighted) / len(steady_weighted), fetches, detected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apps', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--requests-per-day', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    catalog = SimulatedCatalog(args.apps, args.days, args.seed)
+    total_changes = sum(len(times) for times in catalog.change_times.values())
+    print(f"{args.apps} apps, {total_changes} changes over {args.days} days, budget {args.requests_per_day} requests/day\n")
+    print(f"{'strategy':<12}{'freshness':>11}{'weighted':>10}{'requests':>10}{'changes seen':>14}{'changes/request':>17}")
+    for name, adaptive in (('uniform', False), ('adaptive', True)):
+        freshness, weighted, fetches, detected = simulate(catalog, args.apps, args.days, args.requests_per_day, adaptive)
+        print(f"{name:<12}{freshness:>10.1%}{weighted:>10.1%}{fetches:>10}{detected:>14}{detected / max(1, fetches):>17.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares lookups through the long-running HTTP server with one CLI process
+per lookup, both against the local mock Steam server.
+
+Reported per mode: latency percentiles and throughput for
+    cli          ``python -m steamscraper.cli <id> --source combined`` per lookup (cold start every time)
+    server-cold  GET /app/<id> for apps not yet cached
+    server-warm  GET /app/<id> for cached apps
+    server-batch one streamed GET /apps request for the same apps
+and the concurrent throughput of ``--clients`` clients hitting /app/<id>.
+
+Usage:
+    python benchmarks/bench_server.py [--lookups 20] [--clients 16] [--latency 0.05]
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+import requests
+
+from load_test import percentile
+from mock_steam_server import MockSteamServer
+from steamscraper.server import ScraperService, SteamScraperServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_utils.web_utils import SharedSession
+
+
+def timed(fn, items):
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t)
+    return latencies, time.perf_counter() - started
+
+
+def report(name: str, latencies, wall: float):
+    ordered = sorted(latencies)
+    print(f"{name:<14}{percentile(ordered, 50) * 1000:>9.1f}{percentile(ordered, 95) * 1000:>9.1f}"
+          f"{statistics.fmean(ordered) * 1000:>10.1f}{len(latencies) / wall:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=20, help='Sequential lookups per mode.')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent clients for the throughput run.')
+    parser.add_argument('--concurrent-lookups', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock store response delay in seconds.')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    with MockSteamServer(latency=args.latency, any_app=True) as store:
+        def cli(app_id):
+            subprocess.run([sys.executable, '-m', 'steamscraper.cli', str(app_id), '--source', 'combined',
+                            '--store-url', store.url], cwd=REPO_ROOT, capture_output=True, check=True)
+
+        session = SharedSession(pool_size=32)
+        source = CombinedSteamDataSource(store_url=store.url, session=session)
+        with SteamScraperServer(ScraperService(source, max_workers=16), port=0) as server:
+            client = requests.Session()
+
+            def lookup(app_id):
+                client.get(f"{server.url}/app/{app_id}").raise_for_status()
+
+            def batch(app_ids):
+                with client.get(f"{server.url}/apps", params={'ids': ','.join(map(str, app_ids))}, stream=True) as response:
+                    for _ in response.iter_lines():
+                        pass
+
+            print(f"mock store latency {args.latency * 1000:.0f} ms, {args.lookups} sequential lookups per mode\n")
+            print(f"{'mode':<14}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>10}{'lookups/s':>11}")
+            report('cli', *timed(cli, range(1000, 1000 + args.lookups)))
+            report('server-cold', *timed(lookup, range(2000, 2000 + args.lookups)))
+            report('server-warm', *timed(lookup, range(2000, 2000 + args.lookups)))
+            # A batch is one request; report it as the per-app share of its wall time
+            started = time.perf_counter()
+            batch(list(range(3000, 3000 + args.lookups)))
+            wall = time.perf_counter() - started
+            report('server-batch', [wall / args.lookups] * args.lookups, wall)
+
+            app_ids = [4000 + i % (args.concurrent_lookups // 4) for i in range(args.concurrent_lookups)]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.clients) as executor:
+                list(executor.map(lambda app_id: requests.get(f"{server.url}/app/{app_id}").raise_for_status(), app_ids))
+            wall = time.perf_counter() - started
+            stats = server.service.stats()
+            print(f"\n{args.clients} concurrent clients: {len(app_ids)} lookups ({len(set(app_ids))} distinct apps) "
+                  f"in {wall:.2f}s = {len(app_ids) / wall:.0f} lookups/s, "
+                  f"{stats['upstream_lookups']} upstream lookups in total, cache hit rate {stats['cache']['hit_rate']:.0%}")
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
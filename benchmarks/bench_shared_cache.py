@@ -0,0 +1,77 @@
+"""
+Upstream traffic and hit rate of worker processes with private in-memory
+caches versus one ``SharedCache`` file shared by all of them.
+
+``--workers`` processes each look up ``--lookups`` apps drawn from a skewed
+popularity distribution over ``--apps`` apps (a few apps are requested by
+every worker) through ``CombinedSteamDataSource`` against the local mock
+store. With private caches every worker fetches each popular app itself; with
+the shared cache an app fetched by one worker is served to all the others.
+
+Usage:
+    python benchmarks/bench_shared_cache.py [--workers 4] [--lookups 300] [--apps 200]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_utils.shared_cache import SharedCache
+
+
+def worker(store_url: str, cache_path, app_ids):
+    logging.basicConfig(level=logging.CRITICAL)
+    shared_cache = SharedCache(cache_path) if cache_path else None
+    source = CombinedSteamDataSource(store_url=store_url, cache_size=1000, shared_cache=shared_cache)
+    for app_id in app_ids:
+        source.get_data(app_id)
+    if shared_cache is not None:
+        shared_cache.flush_stats()
+    stats = source.cache_stats()
+    # Lookups answered by the in-process cache or, failing that, by the shared file
+    return stats['hits'] + (stats['shared']['hits'] if shared_cache is not None else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--lookups', type=int, default=300, help='Lookups per worker.')
+    parser.add_argument('--apps', type=int, default=200, help='Distinct apps to draw from.')
+    parser.add_argument('--latency', type=float, default=0.02, help='Mock store response delay in seconds.')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    rng = random.Random(1)
+    weights = [1 / (rank + 1) for rank in range(args.apps)]
+    plans = [rng.choices(range(1000, 1000 + args.apps), weights, k=args.lookups) for _ in range(args.workers)]
+
+    print(f"{args.workers} workers x {args.lookups} lookups over {args.apps} apps, "
+          f"mock store latency {args.latency * 1000:.0f} ms\n")
+    print(f"{'cache':<10}{'wall s':>8}{'upstream':>10}{'hit rate':>10}")
+    context = multiprocessing.get_context('spawn')
+    for mode in ('private', 'shared'):
+        with tempfile.TemporaryDirectory() as tmp, \
+                MockSteamServer(latency=args.latency, any_app=True) as store:
+            cache_path = os.path.join(tmp, 'cache.sqlite') if mode == 'shared' else None
+            if cache_path:
+                SharedCache(cache_path)
+            started = time.perf_counter()
+            with context.Pool(args.workers) as pool:
+                results = pool.starmap(worker, [(store.url, cache_path, plan) for plan in plans])
+            wall = time.perf_counter() - started
+            upstream = sum(count for status, count in store.stats.items() if status != 'bytes_sent')
+        print(f"{mode:<10}{wall:>8.2f}{upstream:>10}{sum(results) / (args.workers * args.lookups):>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Refreshing price and review summaries of a catalog: one store page per app
+against the search listing (up to 100 apps per request).
+
+Both run against the mock store with ``--latency`` per request. The store
+pages are the (full-size) fixture pages, fetched by ``get_many`` on
+``--workers`` threads; the listing is read one page at a time with the next
+page prefetched. Requests, bytes sent by the server and wall time are
+reported, and parse time per app is measured separately on in-memory
+content.
+
+Usage:
+    python benchmarks/bench_store_search.py [--apps 300] [--latency 0.05] [--workers 8] [--page-size 100]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import MockSteamServer, TEST_DATA_DIR
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_data.store_search import StoreSearchDataSource, parse_search_rows
+
+
+def refresh(server, fn) -> dict:
+    server.stats.clear()
+    started = time.perf_counter()
+    refreshed = fn()
+    elapsed = time.perf_counter() - started
+    return {'apps': refreshed, 'requests': server.stats[200], 'mib': server.stats['bytes_sent'] / 2 ** 20, 'seconds': elapsed}
+
+
+def parse_cost(server, page_size: int) -> tuple:
+    """Returns seconds per app for parsing a store page and a listing row."""
+    with open(os.path.join(TEST_DATA_DIR, 'ELDEN_RING-1245620-english.html'), encoding='utf-8') as f:
+        page = f.read()
+    listing = json.dumps(server.search_page('', 0, page_size, 'english'))
+    parser = StoreHtmlDataSource()
+    started = time.perf_counter()
+    for _ in range(20):
+        parser.parse_static_content(page)
+    per_page = (time.perf_counter() - started) / 20
+    started = time.perf_counter()
+    rows = 0
+    for _ in range(20):
+        rows += len(parse_search_rows(json.loads(listing)['results_html']))
+    return per_page, (time.perf_counter() - started) / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apps', type=int, default=300, help='Apps in the catalog to refresh.')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock store latency per request in seconds.')
+    parser.add_argument('--workers', type=int, default=8, help='Threads fetching store pages.')
+    parser.add_argument('--page-size', type=int, default=100, help='Rows per search listing request.')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    with MockSteamServer(latency=args.latency, any_app=True, search_apps=args.apps) as server:
+        search = StoreSearchDataSource(store_url=server.url, page_size=args.page_size)
+        app_ids = [row['app_id'] for row in search.iter_apps()]
+        store = StoreHtmlDataSource(store_url=server.url)
+        results = {
+            'store-html': refresh(server, lambda: sum(record is not None for _, record in
+                                                      store.get_many(app_ids, max_workers=args.workers))),
+            'store-search': refresh(server, lambda: sum(1 for _ in search.iter_apps())),
+        }
+        per_page, per_row = parse_cost(server, args.page_size)
+
+    print(f"{len(app_ids)} apps, {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'source':<14}{'apps':>7}{'requests':>10}{'MiB':>9}{'seconds':>9}{'apps/s':>9}")
+    for name, result in results.items():
+        print(f"{name:<14}{result['apps']:>7}{result['requests']:>10}{result['mib']:>9.2f}{result['seconds']:>9.2f}"
+              f"{result['apps'] / result['seconds']:>9.0f}")
+    print(f"\nparse time per app: store page {per_page * 1000:.2f} ms, listing row {per_row * 1000:.3f} ms "
+          f"({per_page / per_row:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares the full-download path against the streaming, early-terminating path
+for store pages.
+
+A local HTTP server serves the fixture pages from ``tests/test_data`` at a
+throttled bandwidth so that the transfer time is visible. For each field set,
+the script reports bytes transferred and time-to-result (fetch + parse).
+
+Usage:
+    python benchmarks/bench_streaming_fetch.py [--kbps 2000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bs4 import BeautifulSoup
+
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_data.store_html_sections import StoreSectionTracker
+from steamscraper.steam_utils.web_utils import fetch_steam_store_html, stream_steam_store_html
+
+FIXTURE = os.path.join(REPO_ROOT, 'tests', 'test_data', 'Cyberpunk_2077-1091500-schinese.html')
+FIELD_SETS = [
+    ['title'],
+    ['title', 'price', 'tags'],
+    ['reviews', 'developer', 'publisher', 'release_date'],
+    ['media'],
+]
+
+
+def make_handler(body: bytes, kbps: int):
+    chunk = 8192
+    delay = chunk / (kbps * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                for i in range(0, len(body), chunk):
+                    self.wfile.write(body[i:i + chunk])
+                    time.sleep(delay)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client stopped reading early
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run_full(url, fields):
+    started = time.perf_counter()
+    html = fetch_steam_store_html(url)
+    data = StoreHtmlDataSource._parse_game_details(BeautifulSoup(html, 'html.parser'))
+    data = {f: data[f] for f in fields if f in data}
+    return len(html.encode('utf-8')), time.perf_counter() - started, data
+
+
+def run_streaming(url, fields):
+    started = time.perf_counter()
+    tracker = StoreSectionTracker(fields)
+    streamed = stream_steam_store_html(url, tracker.feed_chunk)
+    data = StoreHtmlDataSource._parse_game_details(BeautifulSoup(streamed.text, 'html.parser'))
+    data = {f: data[f] for f in fields if f in data}
+    return streamed.bytes_read, time.perf_counter() - started, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming vs full store page fetches.')
+    parser.add_argument('--kbps', type=int, default=2000, help='Simulated server bandwidth in KiB/s.')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(FIXTURE, 'rb') as f:
+        body = f.read()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(body, args.kbps))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/app/1091500/"
+
+    print(f"page size: {len(body)} bytes, bandwidth: {args.kbps} KiB/s")
+    for fields in FIELD_SETS:
+        full = [run_full(url, fields) for _ in range(args.runs)]
+        streamed = [run_streaming(url, fields) for _ in range(args.runs)]
+        assert full[0][2] == streamed[0][2], f"Streaming output differs for {fields}"
+        full_ms = statistics.median(r[1] for r in full) * 1000
+        stream_ms = statistics.median(r[1] for r in streamed) * 1000
+        print(f"{','.join(fields):<45} full: {full[0][0]:>7}B {full_ms:7.1f}ms  "
+              f"stream: {streamed[0][0]:>7}B {stream_ms:7.1f}ms  "
+              f"bytes saved: {1 - streamed[0][0] / full[0][0]:.0%}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Store-page parse throughput against the number of threads.
+
+Pages are the two fixture pages plus synthetic pages with larger sections,
+held in memory so that only parsing is measured. One shared source parses
+them through ``get_many`` (the thread-pool bulk mode) with 1, 2, 4, ...
+workers. On a GIL build throughput stays flat; on a free-threaded (no-GIL)
+CPython build (e.g. ``python3.13t``) it should grow with the thread count
+up to the number of cores.
+
+Usage:
+    python benchmarks/bench_thread_scaling.py [--pages 200] [--max-workers 8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import TEST_DATA_DIR
+from synthetic_pages import synthetic_store_page
+from steamscraper.steam_data.base import SteamDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+
+
+class PageSource(SteamDataSource):
+    def __init__(self, pages):
+        self.pages = pages
+        self.parser = StoreHtmlDataSource()
+
+    def get_data(self, identifier, **kwargs):
+        return self.parser.parse_static_content(self.pages[identifier])
+
+
+def load_pages(count: int) -> list:
+    pages = []
+    for name in ('Cyberpunk_2077-1091500-schinese.html', 'ELDEN_RING-1245620-english.html'):
+        with open(os.path.join(TEST_DATA_DIR, name), encoding='utf-8') as f:
+            pages.append(f.read())
+    app_id = 1000
+    while len(pages) < count:
+        pages.append(synthetic_store_page(app_id, paragraphs=40, tags=20, videos=5, screenshots=20, dlcs=20,
+                                          languages=20, requirements=10, features=10))
+        app_id += 1
+    return pages[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--max-workers', type=int, default=8)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} CPUs, {args.pages} pages\n")
+    source = PageSource(load_pages(args.pages))
+    identifiers = list(range(args.pages))
+    for _ in source.get_many(identifiers[:10], max_workers=1):
+        pass  # Warm up
+
+    print(f"{'threads':>8}{'pages/s':>10}{'speedup':>9}")
+    workers, baseline = 1, None
+    while workers <= args.max_workers:
+        started = time.perf_counter()
+        parsed = sum(record is not None for _, record in source.get_many(identifiers, max_workers=workers))
+        rate = parsed / (time.perf_counter() - started)
+        baseline = baseline or rate
+        print(f"{workers:>8}{rate:>10.1f}{rate / baseline:>8.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Size and encode/decode throughput of the binary wire format against JSON.
+
+Records are the outputs for the test fixtures: the store-html records of the
+two fixture pages, the appdetails record and the combined record (served by
+the mock store). Each is measured on its own (a one-record stream, so the
+string table only holds what that record repeats) and zlib-compressed, as a
+transport would. Throughput is measured on a stream of ``--records``
+records cycling through the fixtures; repeating the same four records
+flatters the stream's string table, so its size is reported but the
+per-record sizes are the fair comparison.
+
+JSON is measured both as the CLI writes it (indent=2, which also disables
+the C encoder) and compact.
+
+Usage:
+    python benchmarks/bench_wire_format.py [--records 2000] [--repeat 5]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import MockSteamServer, TEST_DATA_DIR
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.wire_format import WireDecoder, WireEncoder, dumps
+
+
+def fixture_records():
+    records = {}
+    for name, page in (('store-html 1091500', 'Cyberpunk_2077-1091500-schinese.html'),
+                       ('store-html 1245620', 'ELDEN_RING-1245620-english.html')):
+        with open(os.path.join(TEST_DATA_DIR, page), encoding='utf-8') as f:
+            records[name] = StoreHtmlDataSource().parse_static_content(f.read())
+    with open(os.path.join(TEST_DATA_DIR, 'appdetails_1091500_english.json'), encoding='utf-8') as f:
+        records['appdetails 1091500'] = json.load(f)
+    with MockSteamServer() as server:
+        records['combined 1091500'] = CombinedSteamDataSource(store_url=server.url).get_data('1091500', lang='schinese')
+    return records
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=2000, help='Records in the throughput stream.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs; the best is reported.')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    records = fixture_records()
+    print(f"{'record':<20}{'json -i2':>10}{'json':>9}{'wire':>9}{'wire/json':>11}{'json.z':>9}{'wire.z':>9}")
+    for name, record in records.items():
+        indented = json.dumps(record, indent=2, ensure_ascii=False).encode('utf-8')
+        compact = json.dumps(record, ensure_ascii=False).encode('utf-8')
+        wire = dumps(record)
+        print(f"{name:<20}{len(indented):>10}{len(compact):>9}{len(wire):>9}{len(wire) / len(compact):>11.0%}"
+              f"{len(zlib.compress(compact)):>9}{len(zlib.compress(wire)):>9}")
+
+    stream = [list(records.values())[i % len(records)] for i in range(args.records)]
+    indented_lines = [json.dumps(record, indent=2, ensure_ascii=False) for record in stream]
+    compact_lines = [json.dumps(record, ensure_ascii=False) for record in stream]
+
+    def encode_wire():
+        buffer = io.BytesIO()
+        WireEncoder(buffer).write_all(stream)
+        return buffer.getvalue()
+
+    wire_stream = encode_wire()
+    total = {'json -i2': sum(len(line.encode('utf-8')) for line in indented_lines),
+             'json': sum(len(line.encode('utf-8')) + 1 for line in compact_lines),
+             'wire': len(wire_stream)}
+    encode = {'json -i2': best_of(args.repeat, lambda: [json.dumps(r, indent=2, ensure_ascii=False) for r in stream]),
+              'json': best_of(args.repeat, lambda: [json.dumps(r, ensure_ascii=False) for r in stream]),
+              'wire': best_of(args.repeat, encode_wire)}
+    decode = {'json -i2': best_of(args.repeat, lambda: [json.loads(line) for line in indented_lines]),
+              'json': best_of(args.repeat, lambda: [json.loads(line) for line in compact_lines]),
+              'wire': best_of(args.repeat, lambda: list(WireDecoder(io.BytesIO(wire_stream))))}
+    assert list(WireDecoder(io.BytesIO(wire_stream))) == stream
+
+    print(f"\nstream of {args.records} records")
+    print(f"{'format':<10}{'MiB':>8}{'encode rec/s':>14}{'decode rec/s':>14}")
+    for name in total:
+        print(f"{name:<10}{total[name] / 2 ** 20:>8.1f}{args.records / encode[name]:>14.0f}{args.records / decode[name]:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
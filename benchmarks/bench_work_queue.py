@@ -0,0 +1,92 @@
+"""
+Benchmarks the SQLite lease-based work queue.
+
+1. Raw queue throughput: enqueue rate, and dequeue+ack rate for several batch sizes.
+2. Worker scaling: N worker processes drain the same queue file, each running
+   jobs through a CombinedSteamDataSource pointed at the local mock server.
+
+Usage:
+    python benchmarks/bench_work_queue.py [--jobs 20000] [--crawl-jobs 200] [--workers 1 2 4 8] [--latency 0.05]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_crawl.work_queue import SQLiteJobQueue, run_worker
+
+
+def bench_queue_ops(jobs: int, batch_sizes):
+    print(f"Queue operations ({jobs} jobs)")
+    print(f"{'operation':<22}{'jobs/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'queue.sqlite')
+        queue = SQLiteJobQueue(path)
+        started = time.perf_counter()
+        for start in range(0, jobs, 1000):
+            queue.enqueue((app_id, 'english', None) for app_id in range(start, min(start + 1000, jobs)))
+        print(f"{'enqueue':<22}{jobs / (time.perf_counter() - started):>12.0f}")
+
+    for batch_size in batch_sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = SQLiteJobQueue(os.path.join(tmp, 'queue.sqlite'))
+            queue.enqueue((app_id, 'english', None) for app_id in range(jobs))
+            started = time.perf_counter()
+            while True:
+                batch = queue.dequeue('bench', batch_size)
+                if not batch:
+                    break
+                queue.ack('bench', [job.id for job in batch])
+            print(f"{f'dequeue+ack (b={batch_size})':<22}{jobs / (time.perf_counter() - started):>12.0f}")
+
+
+def _crawl_worker(path: str, store_url: str, worker_id: str):
+    from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+    source = CombinedSteamDataSource(store_url=store_url)
+    run_worker(SQLiteJobQueue(path), source, lambda job, data: None, worker_id=worker_id,
+               batch_size=5, retry_delay=0.0, poll_interval=0.05)
+
+
+def bench_worker_scaling(crawl_jobs: int, worker_counts, latency: float):
+    print(f"\nWorker scaling ({crawl_jobs} jobs, {latency * 1000:.0f} ms mock latency)")
+    print(f"{'workers':>8}{'seconds':>10}{'jobs/s':>10}{'done':>8}{'failed':>8}")
+    with MockSteamServer(latency=latency, any_app=True, seed=1) as server:
+        for workers in worker_counts:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'queue.sqlite')
+                queue = SQLiteJobQueue(path)
+                queue.enqueue((1000000 + n, 'english', None) for n in range(crawl_jobs))
+                started = time.perf_counter()
+                procs = [multiprocessing.Process(target=_crawl_worker, args=(path, server.url, f'w{i}'))
+                         for i in range(workers)]
+                for p in procs:
+                    p.start()
+                for p in procs:
+                    p.join()
+                elapsed = time.perf_counter() - started
+                stats = queue.stats()
+                print(f"{workers:>8}{elapsed:>10.2f}{crawl_jobs / elapsed:>10.1f}{stats['done']:>8}{stats['failed']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--crawl-jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args()
+
+    bench_queue_ops(args.jobs, args.batch_sizes)
+    bench_worker_scaling(args.crawl_jobs, args.workers, args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+End-to-end load test against the local mock Steam server.
+
+Starts ``tests/mock_steam_server.py`` in-process, drives a data source with a
+thread pool and reports throughput, latency percentiles and CPU time per
+record. Everything runs offline and is seeded, so runs are comparable.
+
+Usage:
+    python benchmarks/load_test.py --source combined --requests 500 --concurrency 16 \\
+        --latency 0.05 --jitter 0.05 --error-rate 0.01 --unique-apps 100
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'tests'))
+
+from mock_steam_server import MockSteamServer
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def build_source(name: str, store_url: str, cache_size: int):
+    from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+    from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+    from steamscraper.steam_data.store_html import StoreHtmlDataSource
+
+    if name == 'store-html':
+        return StoreHtmlDataSource(store_url=store_url)
+    if name == 'steampowered-api':
+        return SteamAppDetailsDataSource(store_url=store_url)
+    return CombinedSteamDataSource(store_url=store_url, cache_size=cache_size)
+
+
+def run_load(source, app_ids, concurrency: int, lang: str):
+    """
+    Fetches every id in ``app_ids`` through ``source`` using ``concurrency`` threads.
+    Returns (latencies in seconds, successful record count, wall seconds, cpu seconds).
+    """
+    def one(app_id):
+        started = time.perf_counter()
+        data = source.get_data(str(app_id), lang=lang)
+        return time.perf_counter() - started, data is not None
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, app_ids))
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    latencies = [latency for latency, _ in results]
+    ok = sum(1 for _, success in results if success)
+    return latencies, ok, wall, cpu
+
+
+def format_report(latencies, ok: int, total: int, wall: float, cpu: float) -> str:
+    ordered = sorted(latencies)
+    return "\n".join([
+        f"requests:       {total} ({ok} ok, {total - ok} failed)",
+        f"throughput:     {total / wall:.1f} req/s over {wall:.2f}s",
+        f"latency p50:    {percentile(ordered, 50) * 1000:.1f} ms",
+        f"latency p95:    {percentile(ordered, 95) * 1000:.1f} ms",
+        f"latency p99:    {percentile(ordered, 99) * 1000:.1f} ms",
+        f"latency mean:   {statistics.fmean(ordered) * 1000:.1f} ms" if ordered else "latency mean:   n/a",
+        f"cpu per record: {cpu / ok * 1000:.2f} ms" if ok else "cpu per record: n/a",
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the scraper against a local mock Steam server.')
+    parser.add_argument('--source', default='combined', choices=['store-html', 'steampowered-api', 'combined'])
+    parser.add_argument('--requests', type=int, default=200, help='Total number of lookups.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--unique-apps', type=int, default=50, help='Number of distinct App IDs to spread lookups over.')
+    parser.add_argument('--lang', default='english')
+    parser.add_argument('--cache-size', type=int, default=0, help='Result cache size for the combined source.')
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=int, help='Server body throughput in bytes per second.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    rng = random.Random(args.seed)
+    app_ids = [1000000 + rng.randrange(args.unique_apps) for _ in range(args.requests)]
+
+    with MockSteamServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         rate_limit_rate=args.rate_limit_rate, bandwidth=args.bandwidth,
+                         any_app=True, seed=args.seed) as server:
+        source = build_source(args.source, server.url, args.cache_size)
+        latencies, ok, wall, cpu = run_load(source, app_ids, args.concurrency, args.lang)
+        print(f"source: {args.source}, concurrency: {args.concurrency}, server: {server.url}")
+        print(format_report(latencies, ok, len(app_ids), wall, cpu))
+        print(f"server responses: {dict(server.stats)}")
+        if hasattr(source, 'cache_stats'):
+            print(f"cache: {source.cache_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,21 +2,37 @@
 Steam Scraper - Steam game data scraper and parser
 
 A Python package for scraping and parsing Steam game data.
+
+Public names are resolved lazily (PEP 562) so that ``import steamscraper``
+does not pull in ``requests``/``bs4`` until a data source is actually used.
 """
 
+from .steam_utils.lazy import lazy_exports
+
 __version__ = "0.1.0"
 
-# Import main classes and functions for easy access
-from .steam_data.combined_data import *
-from .steam_data.steam_app_details import *
-from .steam_data.store_html import *
-from .steam_utils import *
+from .steam_utils.constants import SUPPORTED_LANGUAGES
+
+# Maps each lazily exported name to the submodule that defines it
+_LAZY_EXPORTS = {
+    'CombinedSteamDataSource': '.steam_data.combined_data',
+    'SteamAppDetailsDataSource': '.steam_data.steam_app_details',
+    'StoreHtmlDataSource': '.steam_data.store_html',
+    'SteamReviewsDataSource': '.steam_data.steam_reviews',
+    'StoreSearchDataSource': '.steam_data.store_search',
+    'fetch_steam_store_html': '.steam_utils.web_utils',
+}
 
 # Make main classes available at package level
 __all__ = [
     'CombinedSteamDataSource',
-    'SteamAppDetailsDataSource', 
+    'SteamAppDetailsDataSource',
     'StoreHtmlDataSource',
+    'SteamReviewsDataSource',
+    'StoreSearchDataSource',
     'fetch_steam_store_html',
     'SUPPORTED_LANGUAGES',
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_EXPORTS)
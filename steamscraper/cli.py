@@ -1,40 +1,176 @@
 import argparse
+import importlib
 import json
 import sys
 import logging
 
 from .steam_utils.constants import SUPPORTED_LANGUAGES
-from .steam_data.store_html import StoreHtmlDataSource
-from .steam_data.steam_app_details import SteamAppAppDetailsDataSource
-from .steam_data.combined_data import CombinedSteamDataSource
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def main():
+# Source name -> (module, class). Only the selected source is imported, so a
+# store-html run never pays for the API source and vice versa.
+DATA_SOURCES = {
+    'store-html': ('.steam_data.store_html', 'StoreHtmlDataSource'),
+    'steampowered-api': ('.steam_data.steam_app_details', 'SteamAppDetailsDataSource'),
+    'combined': ('.steam_data.combined_data', 'CombinedSteamDataSource'),
+    'reviews': ('.steam_data.steam_reviews', 'SteamReviewsDataSource'),
+    'store-search': ('.steam_data.store_search', 'StoreSearchDataSource'),
+}
+
+
+# Sources that can serve single-app lookups in --serve mode
+SERVABLE_SOURCES = ('store-html', 'steampowered-api', 'combined')
+
+
+def load_data_source(name: str, **kwargs):
+    """
+    Imports and instantiates the data source registered under ``name``,
+    passing ``kwargs`` (e.g. ``store_url``, ``session``) to its constructor.
+    """
+    module_name, class_name = DATA_SOURCES[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)(**kwargs)
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Scrape Steam-related data from various sources.')
-    parser.add_argument('identifier', help='The identifier for the data (e.g., Steam store URL, App ID).')
-    parser.add_argument('-o', '--output', help='Path to the output JSON file.')
+    parser.add_argument('identifier', nargs='?', help='The identifier for the data (e.g., Steam store URL, App ID).')
+    parser.add_argument('-o', '--output', help='Path to the output JSON file (JSON lines in crawl mode).')
+    parser.add_argument('--format', default='json', choices=('json', 'wire'),
+                        help='Output format: indented JSON (JSON lines in crawl mode) or the compact binary wire format.')
     parser.add_argument('--lang', default='english', choices=SUPPORTED_LANGUAGES.keys(), help='Language for the store page (only for store-html source).')
-    parser.add_argument('--source', default='store-html', choices=['store-html', 'steampowered-api', 'combined'], help='Data source to use.')
-    args = parser.parse_args()
+    parser.add_argument('--source', default='store-html', choices=list(DATA_SOURCES), help='Data source to use.')
+    parser.add_argument('--ids-file', help='Crawl mode: file with one identifier per line; results are streamed to --output.')
+    parser.add_argument('--memory-limit', type=float, default=512, help='Crawl mode: memory ceiling in MiB before fetching is paused.')
+    parser.add_argument('--workers', type=int, default=8, help='Crawl and serve mode: number of concurrent fetches.')
+    parser.add_argument('--store-url', help='Base URL of the store (e.g. a local mirror) instead of store.steampowered.com.')
+    parser.add_argument('--serve', action='store_true', help='Run a long-lived HTTP server instead of a single lookup.')
+    parser.add_argument('--host', default='127.0.0.1', help='Serve mode: address to listen on.')
+    parser.add_argument('--port', type=int, default=8080, help='Serve mode: port to listen on.')
+    parser.add_argument('--cache-size', type=int, default=10000, help='Serve mode: records kept in the shared result cache.')
+    parser.add_argument('--cache-ttl', type=float, default=300, help='Serve mode: seconds a cached record stays valid.')
+    parser.add_argument('--rate', type=float, help='Serve mode: upstream requests per second shared by all clients (unlimited by default).')
+    parser.add_argument('--negative-ttl', type=float,
+                        help='Crawl and serve mode: seconds to skip apps that redirect to the store front or an age check, '
+                             'answer 404 or success: false (not remembered by default).')
+    parser.add_argument('--hedge', action='store_true', help='Serve mode: duplicate slow upstream requests (at most 5%% extra requests).')
+    parser.add_argument('--lanes', action='store_true',
+                        help='Serve mode: admit single-app lookups ahead of batch lookups (interactive and crawl fetch lanes).')
+    return parser
 
-    data_source = None
-    if args.source == 'store-html':
-        data_source = StoreHtmlDataSource()
-        data = data_source.get_data(args.identifier, lang=args.lang)
-    elif args.source == 'steampowered-api':
-        data_source = SteamAppDetailsDataSource()
-        data = data_source.get_data(args.identifier, lang=args.lang) # Pass lang to steampowered-api
-    elif args.source == 'combined':
-        data_source = CombinedSteamDataSource()
+
+def run_server(args) -> int:
+    """
+    Serves lookups over HTTP until interrupted. All clients share one session
+    (connection pool and rate limiter), one result cache and one worker pool.
+    """
+    from .server import ScraperService, SteamScraperServer
+    from .steam_utils.rate_limit import TokenBucket
+    from .steam_utils.web_utils import SharedSession
+
+    rate_limiter = TokenBucket(args.rate) if args.rate else None
+    lanes = None
+    if args.lanes:
+        from .steam_utils.priority_lanes import PriorityLanes
+        lanes = PriorityLanes(max_concurrency=max(10, args.workers * 2), rate_limiter=rate_limiter)
+    session = SharedSession(pool_size=max(10, args.workers * 2), rate_limiter=rate_limiter, lanes=lanes)
+    kwargs = {'session': session, 'store_url': args.store_url} if args.store_url else {'session': session}
+    hedger = None
+    if args.hedge and args.source == 'combined':
+        kwargs['hedging'] = True  # The combined source creates and closes its own hedgers
+    elif args.hedge:
+        from .steam_utils.hedging import Hedger
+        kwargs['hedger'] = hedger = Hedger()
+    if args.negative_ttl:
+        from .steam_utils.negative_cache import NegativeCache
+        kwargs['negative_cache'] = NegativeCache(ttl=args.negative_ttl)
+    source = load_data_source(args.source, **kwargs)
+    service = ScraperService(source, cache_size=args.cache_size, cache_ttl=args.cache_ttl, max_workers=args.workers,
+                             rate_limiter=rate_limiter, lanes=lanes)
+    server = SteamScraperServer(service, args.host, args.port)
+    logger.info(f"Serving {args.source} lookups on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+        if hedger is not None:
+            hedger.close()
+        session.close()
+    return 0
+
+
+def run_crawl(data_source, args) -> int:
+    """
+    Streams every identifier in ``args.ids_file`` through ``data_source`` into a
+    JSON-lines (or wire format) file with bounded memory, then closes the source.
+    Returns the process exit code.
+    """
+    from .steam_crawl.bounded_crawl import JsonLinesSink, MemoryBoundedCrawler, WireSink
+
+    def identifiers():
+        with open(args.ids_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield line.strip()
+
+    try:
+        with (WireSink if args.format == 'wire' else JsonLinesSink)(args.output) as sink:
+            crawler = MemoryBoundedCrawler(data_source, sink, memory_limit_mb=args.memory_limit,
+                                           max_workers=args.workers, source_kwargs={'lang': args.lang})
+            stats = crawler.run(identifiers())
+    finally:
+        if hasattr(data_source, 'close'):
+            data_source.close()
+    logger.info(f"Crawled {stats.processed} records ({stats.failed} failed) into {args.output}")
+    negative_cache = getattr(data_source, 'negative_cache', None)
+    if negative_cache is not None:
+        logger.info(f"Skipped known unavailable apps: {negative_cache.stats()}")
+    return 0 if stats.processed or not stats.failed else 1
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.ids_file and not args.output:
+        parser.error('--ids-file requires --output')
+    if args.serve and args.source not in SERVABLE_SOURCES:
+        parser.error(f"--serve supports the sources: {', '.join(SERVABLE_SOURCES)}")
+    if not args.serve and not args.ids_file and not args.identifier:
+        parser.error('an identifier, --ids-file or --serve is required')
+
+    # Configure logging only once we know there is work to do
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.serve:
+        sys.exit(run_server(args))
+
+    kwargs = {'store_url': args.store_url} if args.store_url else {}
+    if args.ids_file and args.negative_ttl and args.source in SERVABLE_SOURCES:
+        from .steam_utils.negative_cache import NegativeCache
+        kwargs['negative_cache'] = NegativeCache(ttl=args.negative_ttl)
+    data_source = load_data_source(args.source, **kwargs)
+    if args.ids_file:
+        sys.exit(run_crawl(data_source, args))
+
+    with data_source:
         data = data_source.get_data(args.identifier, lang=args.lang)
-    else:
-        logger.error(f"Unknown data source '{args.source}'.")
-        sys.exit(1)
 
-    if data:
+    if data and args.format == 'wire':
+        from .steam_utils.wire_format import dumps
+        try:
+            if args.output:
+                with open(args.output, 'wb') as f:
+                    f.write(dumps(data))
+                logger.info(f"Data successfully saved to {args.output}")
+            else:
+                sys.stdout.buffer.write(dumps(data))
+        except IOError as e:
+            logger.error(f"Error writing to file {args.output}: {e}")
+            sys.exit(1)
+    elif data:
         if args.output:
             try:
                 with open(args.output, 'w', encoding='utf-8') as f:
@@ -0,0 +1,331 @@
+"""
+Long-running HTTP server mode.
+
+Every client shares one data source, and with it one keep-alive connection
+pool, one rate limiter (see ``SharedSession``) and one result cache, so
+services that used to shell out to the CLI no longer pay cold-start cost or
+duplicate upstream calls.
+
+Routes:
+    GET  /app/<app_id>?lang=&fields=a,b     one record as JSON (404 if nothing was found)
+    GET  /apps?ids=1,2,3&lang=&fields=      batch lookup, streamed as JSON lines (format=wire: binary frames)
+    POST /apps                              the same, with a JSON body {"ids": [...], "lang": ..., "fields": [...], "format": ...}
+    GET  /stats                             cache, single-flight, rate-limit and request counters
+    GET  /health
+
+Batch responses use chunked transfer encoding and emit one
+``{"app_id": ..., "data": ...}`` line per app as soon as it is ready, so
+lines arrive in completion order rather than request order. With
+``format=wire`` the same objects are sent as one stream of the binary wire
+format (``steam_utils.wire_format``), one frame per app.
+
+Usage:
+    python -m steamscraper.cli --serve --port 8080 --source combined --rate 5
+"""
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .steam_utils.cache import SingleFlight, TTLCache
+from .steam_utils.constants import SUPPORTED_LANGUAGES
+from .steam_utils.priority_lanes import CRAWL, PriorityLanes, fetch_lane, submit_in_context
+from .steam_utils.rate_limit import TokenBucket
+from .steam_utils.wire_format import WireEncoder
+
+logger = logging.getLogger(__name__)
+
+WIRE_CONTENT_TYPE = 'application/x-steamscraper-wire'
+
+# Largest POST body accepted; a batch of App IDs is a few kB
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class ScraperService:
+    """
+    Shared lookup layer behind the HTTP server: a result cache and single-flight
+    in front of ``source``, and one worker pool for batch lookups.
+
+    Args:
+        source: Any SteamDataSource; usually built with a shared ``SharedSession``.
+        cache_size: Maximum number of records kept in memory. 0 disables the cache.
+        cache_ttl: Seconds a cached record stays valid.
+        max_workers: Upstream fetches running at once for batch lookups (all clients combined).
+        max_batch: Largest number of App IDs accepted in one batch request.
+        rate_limiter: The token bucket of the source's session, reported by ``stats``.
+        lanes: The priority lanes of the source's session, reported by ``stats``. Batch
+            lookups then run in the crawl lane, so single lookups are admitted ahead of them.
+    """
+    def __init__(self, source: Any, cache_size: int = 10000, cache_ttl: Optional[float] = 300.0,
+                 max_workers: int = 16, max_batch: int = 1000, rate_limiter: Optional[TokenBucket] = None,
+                 lanes: Optional[PriorityLanes] = None):
+        self.source = source
+        self.rate_limiter = rate_limiter
+        self.lanes = lanes
+        self.cache: Optional[TTLCache] = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+        self.max_workers = max_workers
+        self.max_batch = max_batch
+        self._single_flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='serve')
+        self._lock = threading.Lock()
+        self.counters = Counter()
+        self.started = time.time()
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def get(self, app_id: int, lang: str = 'english', fields: Optional[Tuple[str, ...]] = None) -> Optional[Dict[str, Any]]:
+        """Returns the record for ``app_id`` from the cache, or fetches it (once, however many clients ask)."""
+        key = (app_id, lang, fields)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        return self._single_flight.do(key, lambda: self._fetch(key))
+
+    def _fetch(self, key) -> Optional[Dict[str, Any]]:
+        app_id, lang, fields = key
+        self.count('upstream_lookups')
+        kwargs = {'lang': lang, 'fields': fields} if fields else {'lang': lang}
+        try:
+            data = self.source.get_data(str(app_id), **kwargs)
+        except Exception as e:
+            logger.error(f"Lookup of App ID {app_id} failed: {e}")
+            data = None
+        if data is not None and fields:
+            data = {field: data[field] for field in fields if field in data}
+        if data is not None and self.cache is not None:
+            self.cache.set(key, data)
+        return data
+
+    def get_many(self, app_ids: Iterable[int], lang: str = 'english',
+                 fields: Optional[Tuple[str, ...]] = None) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """
+        Yields ``(app_id, record)`` pairs in completion order. At most
+        ``2 * max_workers`` lookups of one batch are queued at a time, so a large
+        batch cannot crowd other clients out of the shared worker pool.
+        With ``lanes`` the upstream requests of a batch go through the crawl lane.
+        """
+        ids = iter(app_ids)
+        pending = {}
+
+        def fill():
+            while len(pending) < 2 * self.max_workers:
+                app_id = next(ids, None)
+                if app_id is None:
+                    return
+                if self.lanes is not None:
+                    with fetch_lane(CRAWL):
+                        pending[submit_in_context(self._executor, self.get, app_id, lang, fields)] = app_id
+                else:
+                    pending[self._executor.submit(self.get, app_id, lang, fields)] = app_id
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+            fill()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counters)
+        stats['uptime_seconds'] = time.time() - self.started
+        stats['cache'] = self.cache.stats() if self.cache is not None else None
+        stats['single_flight'] = self._single_flight.stats()
+        stats['rate_limit'] = self.rate_limiter.stats() if self.rate_limiter is not None else None
+        if self.lanes is not None:
+            stats['lanes'] = self.lanes.stats()
+        if hasattr(self.source, 'hedge_stats'):
+            stats['hedging'] = self.source.hedge_stats()
+        if getattr(self.source, 'negative_cache', None) is not None:
+            stats['negative_cache'] = self.source.negative_cache.stats()
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_lookup(query: Dict[str, list]) -> Tuple[str, Optional[Tuple[str, ...]]]:
+    """Returns (lang, fields) from query parameters (or a JSON body with the same keys)."""
+    lang = _first(query.get('lang')) or 'english'
+    if lang not in SUPPORTED_LANGUAGES:
+        raise BadRequest(f"unsupported language: {lang}")
+    fields = tuple(sorted(set(_split(query.get('fields'))))) or None
+    return lang, fields
+
+
+def parse_app_ids(values) -> list:
+    try:
+        return [int(value) for value in _split(values)]
+    except ValueError:
+        raise BadRequest("ids must be integers")
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) else value
+
+
+def _split(values) -> list:
+    """Flattens ``a,b`` strings and lists of them (query strings or JSON bodies) into a list of items."""
+    if not isinstance(values, list):
+        values = [] if values is None else [values]
+    return [item.strip() for value in values for item in str(value).split(',') if item.strip()]
+
+
+class SteamScraperServer:
+    """
+    Threaded HTTP front end for a ScraperService.
+
+    Usage:
+        with SteamScraperServer(ScraperService(source), port=8080) as server:
+            ...  # server.url
+    """
+    def __init__(self, service: ScraperService, host: str = '127.0.0.1', port: int = 8080):
+        self.service = service
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+            self.service.close()
+
+    def start(self) -> 'SteamScraperServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.service.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _make_handler(self):
+        service = self.service
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; without TCP_NODELAY every
+            # keep-alive response stalls on the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def _send_json(self, status: int, payload: Any):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream_batch(self, app_ids: list, lang: str, fields, wire: bool = False):
+                encoder = WireEncoder() if wire else None
+                self.send_response(200)
+                self.send_header('Content-Type', WIRE_CONTENT_TYPE if wire else 'application/x-ndjson; charset=utf-8')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                service.count('batch_requests')
+                service.count('batch_apps', len(app_ids))
+                try:
+                    for app_id, data in service.get_many(app_ids, lang, fields):
+                        if encoder is not None:
+                            line = encoder.encode({'app_id': app_id, 'data': data})
+                        else:
+                            line = json.dumps({'app_id': app_id, 'data': data}, ensure_ascii=False).encode('utf-8') + b'\n'
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                        self.wfile.flush()
+                    self.wfile.write(b'0\r\n\r\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    # Lookups already queued still finish and warm the cache
+                    logger.info("Client closed a batch stream early")
+                    self.close_connection = True
+
+            def _batch(self, query: Dict[str, Any]):
+                lang, fields = parse_lookup(query)
+                app_ids = parse_app_ids(query.get('ids'))
+                if not app_ids:
+                    raise BadRequest("ids is required")
+                if len(app_ids) > service.max_batch:
+                    raise BadRequest(f"at most {service.max_batch} ids per batch")
+                output_format = _first(query.get('format')) or 'json'
+                if output_format not in ('json', 'wire'):
+                    raise BadRequest(f"unsupported format: {output_format}")
+                self._stream_batch(app_ids, lang, fields, wire=output_format == 'wire')
+
+            def _handle(self, method: str):
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split('/') if part]
+                query = parse_qs(parsed.query)
+                try:
+                    if method == 'GET' and len(parts) == 2 and parts[0] == 'app':
+                        if not parts[1].isdigit():
+                            raise BadRequest("App ID must be an integer")
+                        lang, fields = parse_lookup(query)
+                        service.count('app_requests')
+                        data = service.get(int(parts[1]), lang, fields)
+                        if data is None:
+                            return self._send_json(404, {'error': f"no data for App ID {parts[1]}"})
+                        return self._send_json(200, data)
+                    if parts == ['apps'] and method == 'GET':
+                        return self._batch(query)
+                    if parts == ['apps'] and method == 'POST':
+                        try:
+                            length = int(self.headers.get('Content-Length') or 0)
+                        except ValueError:
+                            length = -1
+                        if length < 0 or length > MAX_BODY_BYTES:
+                            # The body is not read, so the connection cannot be reused
+                            self.close_connection = True
+                            if length < 0:
+                                raise BadRequest("invalid Content-Length")
+                            return self._send_json(413, {'error': f"body larger than {MAX_BODY_BYTES} bytes"})
+                        try:
+                            body = json.loads(self.rfile.read(length) or b'{}')
+                        except ValueError:
+                            raise BadRequest("body must be JSON")
+                        if not isinstance(body, dict):
+                            raise BadRequest("body must be a JSON object")
+                        return self._batch(body)
+                    if parts == ['stats'] and method == 'GET':
+                        return self._send_json(200, service.stats())
+                    if parts == ['health'] and method == 'GET':
+                        return self._send_json(200, {'status': 'ok'})
+                    return self._send_json(404, {'error': 'not found'})
+                except BadRequest as e:
+                    return self._send_json(400, {'error': str(e)})
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+        return Handler
@@ -0,0 +1,57 @@
+"""
+Steam Crawl - Bulk crawling pipelines built on top of the data sources
+
+Pipelines are imported on first access so that using one of them does not
+import the others (and their sqlite3, hashing and executor dependencies).
+"""
+
+from ..steam_utils.lazy import lazy_exports
+
+_LAZY_EXPORTS = {
+    'CrawlStats': '.bounded_crawl',
+    'JsonLinesSink': '.bounded_crawl',
+    'MemoryBoundedCrawler': '.bounded_crawl',
+    'WireSink': '.bounded_crawl',
+    'DlcGraphCrawler': '.dlc_graph',
+    'FranchiseGraph': '.dlc_graph',
+    'MediaDownloader': '.media',
+    'MediaReport': '.media',
+    'MediaStore': '.media',
+    'collect_media_urls': '.media',
+    'normalize_media_url': '.media',
+    'PriceHistory': '.price_history',
+    'PricePoint': '.price_history',
+    'PriceObservation': '.price_sweep',
+    'PriceSweeper': '.price_sweep',
+    'RefreshScheduler': '.refresh_scheduler',
+    'Job': '.work_queue',
+    'JobQueue': '.work_queue',
+    'SQLiteJobQueue': '.work_queue',
+    'run_worker': '.work_queue',
+}
+
+__all__ = [
+    'CrawlStats',
+    'JsonLinesSink',
+    'MemoryBoundedCrawler',
+    'WireSink',
+    'DlcGraphCrawler',
+    'FranchiseGraph',
+    'MediaDownloader',
+    'MediaReport',
+    'MediaStore',
+    'collect_media_urls',
+    'normalize_media_url',
+    'PriceHistory',
+    'PricePoint',
+    'PriceObservation',
+    'PriceSweeper',
+    'RefreshScheduler',
+    'Job',
+    'JobQueue',
+    'SQLiteJobQueue',
+    'run_worker',
+]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_EXPORTS)
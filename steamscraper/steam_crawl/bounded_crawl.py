@@ -0,0 +1,179 @@
+import gc
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from ..steam_utils.priority_lanes import CRAWL, fetch_lane
+from ..steam_utils.wire_format import WireEncoder
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss() -> int:
+    """
+    Returns the resident set size of this process in bytes. Reads
+    ``/proc/self/statm`` on Linux and falls back to the peak RSS from
+    ``resource`` elsewhere (which can only grow, so backpressure is conservative).
+    """
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class JsonLinesSink:
+    """
+    Appends each record as one JSON line and keeps nothing in memory.
+    Usable as a context manager; call ``close`` otherwise.
+    """
+    def __init__(self, path: str):
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, identifier, record: dict):
+        line = json.dumps({'id': identifier, 'data': record}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class WireSink(JsonLinesSink):
+    """
+    Appends each record as one frame of the binary wire format (see
+    ``steam_utils.wire_format``); read the file back with ``WireDecoder``.
+    Appending to an existing file starts a new stream, which decoders accept.
+    """
+    def __init__(self, path: str):
+        self._file = open(path, 'ab')
+        self._encoder = WireEncoder(self._file)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, identifier, record: dict):
+        # Frames depend on the string table built by the ones before, so encode under the lock
+        with self._lock:
+            self._encoder.write({'id': identifier, 'data': record})
+            self.count += 1
+
+
+class CrawlStats(NamedTuple):
+    processed: int
+    failed: int
+    backpressure_waits: int
+    backpressure_seconds: float
+    start_rss: int
+    peak_rss: int
+    end_rss: int
+
+
+class MemoryBoundedCrawler:
+    """
+    Runs ``source.get_data`` over a stream of identifiers with bounded memory.
+
+    Identifiers are pulled lazily from the input iterable, results are handed to
+    ``sink(identifier, record)`` as soon as they arrive and are not retained, and
+    at most ``max_in_flight`` fetches are outstanding. When RSS crosses
+    ``high_watermark * memory_limit`` the fetch stage stops submitting work,
+    collects garbage and waits for in-flight work to finish until RSS falls
+    below ``low_watermark * memory_limit`` (or nothing is left in flight).
+    """
+    def __init__(self, source: Any, sink: Callable[[Any, dict], None], memory_limit_mb: float = 512,
+                 max_workers: int = 8, max_in_flight: Optional[int] = None, high_watermark: float = 0.9,
+                 low_watermark: float = 0.75, check_every: int = 32, source_kwargs: Optional[dict] = None,
+                 rss: Callable[[], int] = current_rss):
+        self.source = source
+        self.sink = sink
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers * 2
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.check_every = check_every
+        self.source_kwargs = source_kwargs or {}
+        self._rss = rss
+
+    def _fetch(self, identifier) -> Optional[dict]:
+        try:
+            with fetch_lane(CRAWL):
+                return self.source.get_data(identifier, **self.source_kwargs)
+        except Exception as e:
+            logger.error(f"Error crawling {identifier}: {e}")
+            return None
+
+    def run(self, identifiers: Iterable) -> CrawlStats:
+        slots = threading.Semaphore(self.max_in_flight)
+        lock = threading.Lock()
+        counts = {'processed': 0, 'failed': 0, 'in_flight': 0}
+        high = self.high_watermark * self.memory_limit
+        low = self.low_watermark * self.memory_limit
+        waits = 0
+        waited = 0.0
+        start_rss = peak_rss = self._rss()
+
+        def done(identifier, future):
+            record = future.result()
+            try:
+                if record is None:
+                    with lock:
+                        counts['failed'] += 1
+                else:
+                    self.sink(identifier, record)
+                    with lock:
+                        counts['processed'] += 1
+            except Exception as e:
+                logger.error(f"Sink failed for {identifier}: {e}")
+                with lock:
+                    counts['failed'] += 1
+            finally:
+                with lock:
+                    counts['in_flight'] -= 1
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as executor:
+            for submitted, identifier in enumerate(identifiers):
+                if submitted % self.check_every == 0:
+                    rss = self._rss()
+                    peak_rss = max(peak_rss, rss)
+                    if rss >= high:
+                        waits += 1
+                        started = time.monotonic()
+                        logger.warning(f"RSS {rss >> 20} MiB is near the {self.memory_limit >> 20} MiB ceiling; pausing fetches")
+                        while True:
+                            gc.collect()
+                            rss = self._rss()
+                            with lock:
+                                in_flight = counts['in_flight']
+                            if rss < low or in_flight == 0:
+                                break
+                            time.sleep(0.05)
+                        waited += time.monotonic() - started
+                slots.acquire()
+                with lock:
+                    counts['in_flight'] += 1
+                future = executor.submit(self._fetch, identifier)
+                future.add_done_callback(lambda f, identifier=identifier: done(identifier, f))
+                del future
+
+        end_rss = self._rss()
+        stats = CrawlStats(counts['processed'], counts['failed'], waits, waited, start_rss, max(peak_rss, end_rss), end_rss)
+        logger.info(f"Crawl finished: {stats}")
+        return stats
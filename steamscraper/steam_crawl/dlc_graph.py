@@ -0,0 +1,159 @@
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..steam_data.steam_app_details import SteamAppDetailsDataSource
+from ..steam_utils.priority_lanes import CRAWL, fetch_lane, submit_in_context
+
+logger = logging.getLogger(__name__)
+
+# Attributes copied from appdetails / packagedetails onto graph nodes
+_APP_ATTRIBUTES = ('name', 'type', 'is_free', 'release_date', 'price_overview')
+_PACKAGE_ATTRIBUTES = ('name', 'price', 'release_date')
+
+
+def node_key(kind: str, node_id: int) -> str:
+    return f"{kind}:{node_id}"
+
+
+class FranchiseGraph:
+    """
+    Normalized graph of apps and packages. Every app or package appears once in
+    ``nodes`` (keyed ``app:<id>`` / ``package:<id>``); relationships are
+    ``(from, to, relation)`` edges where relation is one of ``dlc``,
+    ``package``, ``contains`` (package -> app) or ``fullgame`` (DLC -> base game).
+    Nodes that were referenced but not fetched (beyond the depth or node cap,
+    or failed) have ``fetched: False``.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self.nodes: Dict[str, dict] = {}
+        self.edges: List[Tuple[str, str, str]] = []
+        self._edge_set: Set[Tuple[str, str, str]] = set()
+        self.truncated = Counter()
+
+    def add_node(self, kind: str, node_id: int, depth: int, data: Optional[dict]):
+        attributes = _APP_ATTRIBUTES if kind == 'app' else _PACKAGE_ATTRIBUTES
+        node = {'kind': kind, 'id': node_id, 'depth': depth, 'fetched': data is not None}
+        if data is not None:
+            node.update({key: data[key] for key in attributes if key in data})
+        self.nodes[node_key(kind, node_id)] = node
+
+    def add_stub(self, kind: str, node_id: int, depth: int, name: Optional[str] = None):
+        key = node_key(kind, node_id)
+        if key not in self.nodes:
+            self.nodes[key] = {'kind': kind, 'id': node_id, 'depth': depth, 'fetched': False}
+            if name:
+                self.nodes[key]['name'] = name
+
+    def add_edge(self, source: str, target: str, relation: str):
+        edge = (source, target, relation)
+        if edge not in self._edge_set:
+            self._edge_set.add(edge)
+            self.edges.append(edge)
+
+    def to_dict(self) -> dict:
+        return {
+            'root': self.root,
+            'nodes': self.nodes,
+            'edges': [{'from': source, 'to': target, 'relation': relation} for source, target, relation in self.edges],
+            'truncated': dict(self.truncated),
+        }
+
+
+def _app_children(data: dict) -> List[Tuple[str, int, str, Optional[str]]]:
+    """Returns (kind, id, relation, name) references found in appdetails data."""
+    children = [('app', int(app_id), 'dlc', None) for app_id in data.get('dlc') or []]
+    package_ids = list(data.get('packages') or [])
+    for group in data.get('package_groups') or []:
+        package_ids.extend(sub['packageid'] for sub in group.get('subs') or [] if 'packageid' in sub)
+    children.extend(('package', int(package_id), 'package', None) for package_id in dict.fromkeys(package_ids))
+    fullgame = data.get('fullgame')
+    if isinstance(fullgame, dict) and fullgame.get('appid'):
+        children.append(('app', int(fullgame['appid']), 'fullgame', fullgame.get('name')))
+    return children
+
+
+def _package_children(data: dict) -> List[Tuple[str, int, str, Optional[str]]]:
+    return [('app', int(app['id']), 'contains', app.get('name')) for app in data.get('apps') or [] if 'id' in app]
+
+
+class DlcGraphCrawler:
+    """
+    Expands a base game into its DLCs and packages breadth-first.
+
+    Each BFS level is fetched as a batch: apps concurrently through
+    ``appdetails`` and packages with one ``packagedetails`` request per
+    ``package_batch_size`` ids. Nodes are fetched at most once. Expansion stops
+    at ``max_depth`` levels from the root, at ``max_fanout`` references per
+    node and at ``max_nodes`` fetched nodes; what was cut is counted in
+    ``graph.truncated``.
+    """
+    def __init__(self, source: Optional[SteamAppDetailsDataSource] = None, max_depth: int = 2, max_fanout: int = 50,
+                 max_nodes: int = 500, max_workers: int = 8, package_batch_size: int = 50):
+        self.source = source or SteamAppDetailsDataSource()
+        self.max_depth = max_depth
+        self.max_fanout = max_fanout
+        self.max_nodes = max_nodes
+        self.max_workers = max_workers
+        self.package_batch_size = package_batch_size
+
+    def _fetch_level(self, frontier: List[Tuple[str, int]], lang: str, cc: Optional[str]) -> Dict[Tuple[str, int], Optional[dict]]:
+        results: Dict[Tuple[str, int], Optional[dict]] = {}
+        app_ids = [node_id for kind, node_id in frontier if kind == 'app']
+        package_ids = [node_id for kind, node_id in frontier if kind == 'package']
+        kwargs = {'lang': lang, 'cc': cc} if cc else {'lang': lang}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='dlc-graph') as executor, fetch_lane(CRAWL):
+            app_futures = {app_id: submit_in_context(executor, self.source.get_data, str(app_id), **kwargs) for app_id in app_ids}
+            package_futures = [
+                submit_in_context(executor, self.source.get_package_details, package_ids[i:i + self.package_batch_size], cc=cc, lang=lang)
+                for i in range(0, len(package_ids), self.package_batch_size)
+            ]
+            for app_id, future in app_futures.items():
+                results[('app', app_id)] = future.result()
+            packages: Dict[int, dict] = {}
+            for future in package_futures:
+                packages.update(future.result() or {})
+        for package_id in package_ids:
+            results[('package', package_id)] = packages.get(package_id)
+        return results
+
+    def crawl(self, app_id, lang: str = 'english', cc: Optional[str] = None) -> FranchiseGraph:
+        root = ('app', int(app_id))
+        graph = FranchiseGraph(node_key(*root))
+        seen = {root}
+        frontier = [root]
+        depth = 0
+        while frontier:
+            logger.info(f"Fetching DLC graph level {depth}: {len(frontier)} nodes")
+            fetched = self._fetch_level(frontier, lang, cc)
+            next_frontier = []
+            for kind, node_id in frontier:
+                data = fetched[(kind, node_id)]
+                graph.add_node(kind, node_id, depth, data)
+                if data is None:
+                    graph.truncated['failed'] += 1
+                    continue
+                children = _app_children(data) if kind == 'app' else _package_children(data)
+                if len(children) > self.max_fanout:
+                    graph.truncated['fanout'] += len(children) - self.max_fanout
+                    children = children[:self.max_fanout]
+                for child_kind, child_id, relation, name in children:
+                    child = (child_kind, child_id)
+                    graph.add_edge(node_key(kind, node_id), node_key(*child), relation)
+                    if child in seen:
+                        continue
+                    if depth + 1 > self.max_depth:
+                        graph.truncated['depth'] += 1
+                    elif len(seen) >= self.max_nodes:
+                        graph.truncated['nodes'] += 1
+                    else:
+                        seen.add(child)
+                        next_frontier.append(child)
+                        continue
+                    seen.add(child)
+                    graph.add_stub(child_kind, child_id, depth + 1, name)
+            frontier = next_frontier
+            depth += 1
+        return graph
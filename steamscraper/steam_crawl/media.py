@@ -0,0 +1,287 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from ..steam_utils.proxy_pool import NoProxyAvailableError, ProxyPool
+from ..steam_utils.web_utils import get_proxies_from_env
+
+logger = logging.getLogger(__name__)
+
+# Steam serves the same asset paths from several CDN hostnames
+_STEAM_CDN_HOSTS = {
+    'shared.fastly.steamstatic.com',
+    'shared.akamai.steamstatic.com',
+    'shared.cloudflare.steamstatic.com',
+    'cdn.akamai.steamstatic.com',
+    'cdn.cloudflare.steamstatic.com',
+    'cdn.fastly.steamstatic.com',
+    'video.fastly.steamstatic.com',
+    'video.akamai.steamstatic.com',
+    'video.cloudflare.steamstatic.com',
+}
+
+
+def normalize_media_url(url: str) -> str:
+    """
+    Returns a canonical key for a media URL so that the same asset fetched via a
+    different Steam CDN host maps to the same key. The query is kept: Steam
+    bumps the ``t`` parameter when it replaces an asset under the same path,
+    so a new ``t`` has to be fetched again.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host in _STEAM_CDN_HOSTS:
+        host = 'steamstatic'
+    return urlunsplit(('https' if parts.scheme in ('http', 'https') else parts.scheme, host, parts.path, parts.query, ''))
+
+
+def collect_media_urls(record: dict) -> List[str]:
+    """
+    Collects downloadable media URLs from a store-html or combined record:
+    header image, screenshots, video thumbnails and webm/mp4 sources.
+    """
+    urls = []
+    if record.get('header_image'):
+        urls.append(record['header_image'])
+    media = record.get('media') or {}
+    urls.extend(media.get('screenshots') or [])
+    for video in media.get('videos') or []:
+        for key in ('thumbnail', 'webm_source', 'mp4_source'):
+            if video.get(key):
+                urls.append(video[key])
+    return urls
+
+
+def _content_range(value: Optional[str]) -> tuple:
+    """
+    Parses a ``Content-Range`` header ("bytes 100-299/300" or "bytes */300")
+    into (first byte, complete length); unknown parts are None.
+    """
+    if not value or not value.startswith('bytes '):
+        return None, None
+    span, _, length = value[len('bytes '):].partition('/')
+    first = span.partition('-')[0]
+    return (int(first) if first.isdigit() else None), (int(length) if length.isdigit() else None)
+
+
+def _write_validator(path: str, headers) -> None:
+    """Records the ETag (or Last-Modified) a download started under; weak ETags cannot be used in If-Range."""
+    etag = headers.get('ETag')
+    validator = etag if etag and not etag.startswith('W/') else headers.get('Last-Modified')
+    if validator:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(validator)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+class MediaReport(NamedTuple):
+    downloaded: int
+    skipped_known: int
+    duplicate_content: int
+    failed: int
+    bytes_downloaded: int
+    bytes_resumed: int
+    bandwidth_saved: int
+    storage_saved: int
+
+
+class MediaStore:
+    """
+    Content-addressed file store: each file lives at ``objects/<sha256[:2]>/<sha256>``
+    and ``index.jsonl`` maps normalized URLs to the content hash and size.
+    Partial downloads are kept under ``partial/`` so they can be resumed, next
+    to the ETag or Last-Modified value they were downloaded under.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.partial_dir = os.path.join(root, 'partial')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.partial_dir, exist_ok=True)
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index[entry['key']] = entry
+
+    def lookup(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._index.get(key)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def partial_path(self, key: str) -> str:
+        return os.path.join(self.partial_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.part')
+
+    def validator_path(self, key: str) -> str:
+        return self.partial_path(key)[:-len('.part')] + '.validator'
+
+    def discard_partial(self, key: str):
+        for path in (self.partial_path(key), self.validator_path(key)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def commit(self, key: str, url: str, partial: str, digest: str, size: int) -> bool:
+        """
+        Moves a finished download into the store. Returns False if identical
+        content was already stored (the partial file is discarded).
+        """
+        target = self.object_path(digest)
+        with self._lock:
+            duplicate = os.path.exists(target)
+            if duplicate:
+                os.remove(partial)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(partial, target)
+            if os.path.exists(self.validator_path(key)):
+                os.remove(self.validator_path(key))
+            entry = {'key': key, 'url': url, 'sha256': digest, 'size': size}
+            self._index[key] = entry
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        return not duplicate
+
+
+class MediaDownloader:
+    """
+    Downloads media into a MediaStore with bounded concurrency.
+
+    URLs are deduplicated before download by their normalized form (within the
+    batch and against the store index) and after download by content hash.
+    Interrupted downloads resume with an HTTP Range request guarded by
+    ``If-Range``, so an asset that changed in between is downloaded again
+    from the start instead of being spliced onto the old bytes.
+    """
+    def __init__(self, store: MediaStore, max_workers: int = 8, chunk_size: int = 256 * 1024,
+                 proxy_pool: Optional[ProxyPool] = None, timeout: float = 30):
+        self.store = store
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.proxy_pool = proxy_pool
+        self.timeout = timeout
+
+    def _download(self, key: str, url: str) -> dict:
+        partial = self.store.partial_path(key)
+        validator_path = self.store.validator_path(key)
+        hasher = hashlib.sha256()
+        offset = 0
+        validator = None
+        if os.path.exists(validator_path):
+            with open(validator_path, 'r', encoding='utf-8') as f:
+                validator = f.read().strip() or None
+        if validator is None:
+            # Without a validator a resumed download cannot be checked against the current asset
+            self.store.discard_partial(key)
+        elif os.path.exists(partial):
+            with open(partial, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(block)
+                    offset += len(block)
+
+        lease = None
+        if self.proxy_pool is not None:
+            try:
+                lease = self.proxy_pool.acquire()
+            except NoProxyAvailableError as e:
+                logger.error(f"Error downloading {url}: {e}")
+                return {'status': 'failed'}
+            proxies = lease.proxies
+        else:
+            proxies = get_proxies_from_env()
+
+        headers = {'Range': f'bytes={offset}-', 'If-Range': validator} if offset else {}
+        downloaded = 0
+        success = False
+        stale = False
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=self.timeout, proxies=proxies) as response:
+                content_range = _content_range(response.headers.get('Content-Range'))
+                if response.status_code == 416 and offset:
+                    # The partial file is complete only if it has the size the server reports
+                    stale = content_range[1] != offset
+                elif response.status_code == 206 and content_range[0] != offset:
+                    stale = True
+                else:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # The asset changed (If-Range failed) or the server ignored the range; start over
+                        hasher = hashlib.sha256()
+                        offset = 0
+                    if not offset:
+                        _write_validator(validator_path, response.headers)
+                    with open(partial, 'ab' if offset else 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            downloaded += len(chunk)
+            success = True
+        except (requests.exceptions.RequestException, OSError) as e:
+            logger.error(f"Error downloading {url}: {e}")
+            return {'status': 'failed', 'downloaded': downloaded}
+        finally:
+            if lease:
+                lease.release(success=success)
+
+        if stale:
+            logger.info(f"Partial download of {url} does not match the asset, starting over")
+            self.store.discard_partial(key)
+            return self._download(key, url)
+        size = offset + downloaded
+        stored = self.store.commit(key, url, partial, hasher.hexdigest(), size)
+        return {'status': 'stored' if stored else 'duplicate', 'downloaded': downloaded, 'resumed': offset, 'size': size}
+
+    def download_all(self, urls: Iterable[str]) -> MediaReport:
+        """
+        Downloads every URL not already in the store and returns a report of what
+        was fetched and how many bytes deduplication saved.
+        """
+        pending: Dict[str, str] = {}
+        repeats: Dict[str, int] = {}
+        skipped = bandwidth_saved = 0
+        for url in urls:
+            key = normalize_media_url(url)
+            if key in pending:
+                skipped += 1
+                repeats[key] = repeats.get(key, 0) + 1
+                continue
+            known = self.store.lookup(key)
+            if known is not None:
+                skipped += 1
+                bandwidth_saved += known['size']
+                continue
+            pending[key] = url
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='media') as executor:
+            results = list(executor.map(lambda item: self._download(*item), pending.items()))
+        for key, result in zip(pending, results):
+            # Repeats of the same URL within the batch were never fetched
+            bandwidth_saved += repeats.get(key, 0) * result.get('size', 0)
+
+        stored = sum(1 for r in results if r['status'] == 'stored')
+        duplicates = [r for r in results if r['status'] == 'duplicate']
+        report = MediaReport(
+            downloaded=stored + len(duplicates),
+            skipped_known=skipped,
+            duplicate_content=len(duplicates),
+            failed=sum(1 for r in results if r['status'] == 'failed'),
+            bytes_downloaded=sum(r.get('downloaded', 0) for r in results),
+            bytes_resumed=sum(r.get('resumed', 0) for r in results),
+            bandwidth_saved=bandwidth_saved + sum(r.get('resumed', 0) for r in results),
+            storage_saved=sum(r['size'] for r in duplicates),
+        )
+        logger.info(f"Media download: {report}")
+        return report
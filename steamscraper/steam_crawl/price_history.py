@@ -0,0 +1,203 @@
+import bisect
+import threading
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+_MAGIC = b'SPH1'
+
+
+class PricePoint(NamedTuple):
+    """A price that took effect at ``timestamp`` (Unix seconds). Amounts are in minor currency units."""
+    timestamp: int
+    initial: int
+    final: int
+    discount_percent: int
+
+
+class _Series:
+    __slots__ = ('currency', 'timestamps', 'initial', 'final', 'discount', 'last_seen')
+
+    def __init__(self, currency: str):
+        self.currency = currency
+        self.timestamps = array('q')
+        self.initial = array('q')
+        self.final = array('q')
+        self.discount = array('b')
+        self.last_seen = 0
+
+    def point(self, i: int) -> PricePoint:
+        return PricePoint(self.timestamps[i], self.initial[i], self.final[i], self.discount[i])
+
+
+def _write_varint(out: bytearray, value: int):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+class PriceHistory:
+    """
+    Change-only price time series per (app_id, region).
+
+    An observation is stored only when the price differs from the last stored
+    one, so a price that stays the same for months costs one entry. Each series
+    keeps timestamps and amounts in packed arrays so range queries are a binary
+    search. ``save``/``load`` write a compact file where timestamps and amounts
+    are delta-encoded as varints.
+    """
+    def __init__(self):
+        self._series: Dict[Tuple[int, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._series)
+
+    def record(self, app_id: int, region: str, timestamp: int, price_overview: dict) -> bool:
+        """
+        Records an observation from an appdetails ``price_overview`` (an empty dict means free).
+        Observations must arrive in timestamp order per series.
+
+        Returns:
+            True if the price changed and a new point was stored.
+        """
+        initial = int(price_overview.get('initial', price_overview.get('final', 0)))
+        final = int(price_overview.get('final', 0))
+        discount = int(price_overview.get('discount_percent', 0))
+        key = (int(app_id), region.lower())
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(price_overview.get('currency', ''))
+            if series.timestamps and timestamp < series.timestamps[-1]:
+                raise ValueError("Observations must be recorded in timestamp order.")
+            series.last_seen = max(series.last_seen, timestamp)
+            if series.timestamps and (series.initial[-1], series.final[-1], series.discount[-1]) == (initial, final, discount):
+                return False
+            series.timestamps.append(timestamp)
+            series.initial.append(initial)
+            series.final.append(final)
+            series.discount.append(discount)
+            if price_overview.get('currency'):
+                series.currency = price_overview['currency']
+            return True
+
+    def history(self, app_id: int, region: str, start: Optional[int] = None, end: Optional[int] = None) -> List[PricePoint]:
+        """
+        Returns the price changes for an app in a region between ``start`` and ``end``
+        (inclusive). The point in effect at ``start`` is included even if it changed earlier.
+        """
+        with self._lock:
+            series = self._series.get((int(app_id), region.lower()))
+            if series is None:
+                return []
+            lo = 0 if start is None else max(0, bisect.bisect_right(series.timestamps, start) - 1)
+            hi = len(series.timestamps) if end is None else bisect.bisect_right(series.timestamps, end)
+            return [series.point(i) for i in range(lo, hi)]
+
+    def price_at(self, app_id: int, region: str, timestamp: int) -> Optional[PricePoint]:
+        with self._lock:
+            series = self._series.get((int(app_id), region.lower()))
+            if series is None:
+                return None
+            i = bisect.bisect_right(series.timestamps, timestamp) - 1
+            return series.point(i) if i >= 0 else None
+
+    def currency(self, app_id: int, region: str) -> Optional[str]:
+        series = self._series.get((int(app_id), region.lower()))
+        return series.currency if series else None
+
+    def series_keys(self) -> Iterator[Tuple[int, str]]:
+        with self._lock:
+            return iter(list(self._series))
+
+    def point_count(self) -> int:
+        with self._lock:
+            return sum(len(s.timestamps) for s in self._series.values())
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_MAGIC)
+        with self._lock:
+            _write_varint(out, len(self._series))
+            for (app_id, region), series in sorted(self._series.items()):
+                _write_varint(out, app_id)
+                for text in (region, series.currency):
+                    encoded = text.encode('utf-8')
+                    _write_varint(out, len(encoded))
+                    out += encoded
+                _write_varint(out, series.last_seen)
+                _write_varint(out, len(series.timestamps))
+                prev = (0, 0, 0, 0)
+                for i in range(len(series.timestamps)):
+                    current = (series.timestamps[i], series.initial[i], series.final[i], series.discount[i])
+                    _write_varint(out, current[0] - prev[0])  # timestamps only ever increase
+                    for j in (1, 2, 3):
+                        _write_varint(out, _zigzag(current[j] - prev[j]))
+                    prev = current
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> 'PriceHistory':
+        if buf[:4] != _MAGIC:
+            raise ValueError("Not a price history file.")
+        history = cls()
+        pos = 4
+        count, pos = _read_varint(buf, pos)
+        for _ in range(count):
+            app_id, pos = _read_varint(buf, pos)
+            texts = []
+            for _ in range(2):
+                length, pos = _read_varint(buf, pos)
+                texts.append(buf[pos:pos + length].decode('utf-8'))
+                pos += length
+            series = _Series(texts[1])
+            series.last_seen, pos = _read_varint(buf, pos)
+            points, pos = _read_varint(buf, pos)
+            ts = initial = final = discount = 0
+            for _ in range(points):
+                delta, pos = _read_varint(buf, pos)
+                ts += delta
+                value, pos = _read_varint(buf, pos)
+                initial += _unzigzag(value)
+                value, pos = _read_varint(buf, pos)
+                final += _unzigzag(value)
+                value, pos = _read_varint(buf, pos)
+                discount += _unzigzag(value)
+                series.timestamps.append(ts)
+                series.initial.append(initial)
+                series.final.append(final)
+                series.discount.append(discount)
+            history._series[(app_id, texts[0])] = series
+        return history
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'PriceHistory':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
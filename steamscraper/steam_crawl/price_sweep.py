@@ -0,0 +1,77 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from ..steam_data.steam_app_details import SteamAppDetailsDataSource
+from ..steam_utils.constants import STORE_BASE_URL
+from ..steam_utils.priority_lanes import CRAWL, fetch_lane, submit_in_context
+from ..steam_utils.proxy_pool import ProxyPool
+from .price_history import PriceHistory
+
+logger = logging.getLogger(__name__)
+
+
+class PriceObservation(NamedTuple):
+    app_id: int
+    region: str
+    timestamp: int
+    price_overview: dict  # Empty for free apps
+
+
+class PriceSweeper:
+    """
+    Sweeps ``price_overview`` for many apps across many regions.
+
+    Apps are grouped into batches of ``batch_size`` per request (the appdetails
+    endpoint accepts several App IDs with ``filters=price_overview``) and the
+    (region, batch) requests run concurrently on ``max_workers`` threads.
+    """
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, store_url: str = STORE_BASE_URL,
+                 batch_size: int = 100, max_workers: int = 8):
+        self.source = SteamAppDetailsDataSource(proxy_pool=proxy_pool, store_url=store_url)
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.failed_batches = 0
+
+    def sweep(self, app_ids: Iterable[int], regions: Iterable[str], timestamp: Optional[int] = None) -> Iterator[PriceObservation]:
+        """
+        Yields one observation per (app, region) that is available in the region.
+        Batches that fail are logged and counted in ``failed_batches``.
+        """
+        app_ids = [int(app_id) for app_id in app_ids]
+        regions = [region.lower() for region in regions]
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        self.failed_batches = 0
+        batches: List[List[int]] = [app_ids[i:i + self.batch_size] for i in range(0, len(app_ids), self.batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='price-sweep') as executor:
+            with fetch_lane(CRAWL):
+                futures = {
+                    submit_in_context(executor, self.source.get_price_overviews, batch, region): region
+                    for region in regions for batch in batches
+                }
+            for future in as_completed(futures):
+                region = futures[future]
+                prices = future.result()
+                if prices is None:
+                    self.failed_batches += 1
+                    continue
+                for app_id, price_overview in prices.items():
+                    yield PriceObservation(app_id, region, timestamp, price_overview)
+
+    def sweep_into(self, history: PriceHistory, app_ids: Iterable[int], regions: Iterable[str],
+                   timestamp: Optional[int] = None) -> Dict[str, int]:
+        """
+        Runs a sweep and records it into ``history``.
+
+        Returns:
+            Counters for observations seen and price changes stored.
+        """
+        observations = changes = 0
+        for observation in self.sweep(app_ids, regions, timestamp=timestamp):
+            observations += 1
+            if history.record(observation.app_id, observation.region, observation.timestamp, observation.price_overview):
+                changes += 1
+        logger.info(f"Price sweep: {observations} observations, {changes} changes, {self.failed_batches} failed batches")
+        return {'observations': observations, 'changes': changes, 'failed_batches': self.failed_batches}
@@ -0,0 +1,311 @@
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..steam_utils.priority_lanes import CRAWL, fetch_lane
+from ..steam_utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Fields compared between fetches to decide whether an app changed. Review
+# counts are left out: they move constantly and feed the popularity weight instead.
+DEFAULT_FINGERPRINT_FIELDS = ('title', 'price', 'price_overview', 'release_date', 'tags', 'dlcs', 'dlc',
+                              'short_description', 'header_image')
+
+# "91% of the 7,689 user reviews in the last 30 days are positive." / "过去 30 天内的 9,329 篇用户评测中有 95% 为好评。"
+_REVIEW_COUNT_RE = re.compile(r'(\d[\d,.\s]*)\s*(?:user reviews|篇用户评测)')
+
+
+def review_count(record: dict) -> int:
+    """
+    Returns the largest review count found in a record: the review tooltips
+    of a store page or ``recommendations.total`` of an appdetails record.
+    """
+    counts = [0]
+    reviews = record.get('reviews')
+    if isinstance(reviews, dict):
+        for row in reviews.values():
+            tooltip = row.get('tooltip') if isinstance(row, dict) else None
+            for match in _REVIEW_COUNT_RE.finditer(tooltip or ''):
+                digits = re.sub(r'\D', '', match.group(1))
+                if digits:
+                    counts.append(int(digits))
+    recommendations = record.get('recommendations')
+    if isinstance(recommendations, dict) and isinstance(recommendations.get('total'), int):
+        counts.append(recommendations['total'])
+    return max(counts)
+
+
+def is_discounted(record: dict) -> bool:
+    """True when the store page shows a discount block or the API reports a discount."""
+    if isinstance(record.get('price'), dict):
+        return True
+    overview = record.get('price_overview')
+    return isinstance(overview, dict) and (overview.get('discount_percent') or 0) > 0
+
+
+def fingerprint(record: dict, fields: Iterable[str] = DEFAULT_FINGERPRINT_FIELDS) -> str:
+    subset = {field: record.get(field) for field in fields if field in record}
+    return hashlib.sha1(json.dumps(subset, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+class AppState:
+    __slots__ = ('app_id', 'next_due', 'change_rate', 'reviews', 'discounted', 'fingerprint', 'last_fetched',
+                 'fetches', 'comparisons', 'unchanged', 'observed', 'changes', 'failures', 'version')
+
+    def __init__(self, app_id: int, next_due: float, change_rate: float):
+        self.app_id = app_id
+        self.next_due = next_due
+        self.change_rate = change_rate  # Estimated changes per second
+        self.reviews = 0
+        self.discounted = False
+        self.fingerprint: Optional[str] = None
+        self.last_fetched: Optional[float] = None
+        self.fetches = 0
+        self.comparisons = 0   # Fetches that could be compared with a previous one
+        self.unchanged = 0     # ... of which found no change
+        self.observed = 0.0    # Total seconds between compared fetches
+        self.changes = 0
+        self.failures = 0
+        self.version = 0
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'version'}
+
+
+class RefreshScheduler:
+    """
+    Adaptive refresh scheduler for a set of apps.
+
+    Every fetch is compared with the previous one (by a fingerprint of
+    ``fingerprint_fields``) to estimate the app's change rate, treating
+    changes as a Poisson process (the estimator corrects for several changes
+    between two fetches looking like one). Popularity signals extracted from
+    the record - review count and an active discount - give the app a weight.
+
+    The probability that the stored copy is stale is ``1 - exp(-rate * age)``.
+    An app becomes due when its weighted staleness probability reaches
+    ``target_staleness`` (bounded by ``min_interval``/``max_interval``), and
+    due apps are served from a priority queue ordered by the expected
+    weighted freshness gained per request (see ``priority``). An app's
+    priority is computed when it becomes due, and the priorities of apps
+    still waiting are recomputed at most once per ``min_interval``. The number of
+    requests is capped by a global token-bucket budget. Apps that
+    keep failing (delisted, region-locked) back off exponentially.
+    """
+    def __init__(self, requests_per_hour: float = 3600, burst: Optional[float] = None,
+                 base_interval: float = 86400, min_interval: float = 3600, max_interval: float = 30 * 86400,
+                 target_staleness: float = 0.5, fingerprint_fields: Iterable[str] = DEFAULT_FINGERPRINT_FIELDS,
+                 clock: Callable[[], float] = time.time):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_staleness = target_staleness
+        self.fingerprint_fields = tuple(fingerprint_fields)
+        self._clock = clock
+        self.budget = TokenBucket(requests_per_hour / 3600, burst if burst is not None else max(1.0, requests_per_hour / 60), clock=clock)
+        self._apps: Dict[int, AppState] = {}
+        self._heap: List[Tuple[float, int, int]] = []  # (next_due, app_id, version)
+        # Due apps as a max-heap of (-priority, app_id, version); entries whose
+        # version is outdated (refetched or removed apps) are dropped when met
+        self._ready: List[Tuple[float, int, int]] = []
+        self._ready_at = -math.inf
+        self._versions = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._apps)
+
+    def __contains__(self, app_id) -> bool:
+        return int(app_id) in self._apps
+
+    def state(self, app_id) -> Optional[AppState]:
+        return self._apps.get(int(app_id))
+
+    def _push(self, state: AppState):
+        state.version = next(self._versions)
+        heapq.heappush(self._heap, (state.next_due, state.app_id, state.version))
+
+    def add(self, app_ids: Iterable, due: Optional[float] = None) -> int:
+        """Registers apps (due immediately unless ``due`` is given). Returns how many were new."""
+        now = self._clock() if due is None else due
+        added = 0
+        for app_id in app_ids:
+            app_id = int(app_id)
+            if app_id not in self._apps:
+                state = self._apps[app_id] = AppState(app_id, now, 1 / self.base_interval)
+                self._push(state)
+                added += 1
+        return added
+
+    def remove(self, app_id) -> bool:
+        return self._apps.pop(int(app_id), None) is not None
+
+    def weight(self, state: AppState) -> float:
+        """Popularity weight: 1 for an app without reviews, ~3.5 at 100k reviews, doubled while discounted."""
+        weight = 1 + math.log10(1 + state.reviews) / 2
+        return weight * 2 if state.discounted else weight
+
+    def staleness(self, state: AppState, now: float) -> float:
+        """Probability that the app changed since it was last fetched (1 if it never was)."""
+        if state.last_fetched is None:
+            return 1.0
+        return 1 - math.exp(-state.change_rate * max(0.0, now - state.last_fetched))
+
+    def priority(self, state: AppState, now: float) -> float:
+        """
+        Expected (weighted) freshness gained by fetching now: the chance the copy
+        is stale times the share of the next ``base_interval`` that the new copy
+        is expected to stay fresh. Apps that change faster than they can be
+        followed gain little from each request and rank lower.
+        """
+        horizon = state.change_rate * self.base_interval
+        fresh_share = (1 - math.exp(-horizon)) / horizon if horizon > 0 else 1.0
+        return self.weight(state) * self.staleness(state, now) * fresh_share
+
+    def _estimate_rate(self, state: AppState) -> float:
+        # Poisson change-rate estimator for periodic checks that only reveal
+        # "changed or not": -ln((unchanged + 0.5) / (n + 0.5)) / mean interval,
+        # with one pseudo-observation of a change per base_interval as a prior
+        n = state.comparisons + 1
+        mean_interval = (state.observed + self.base_interval) / n
+        return -math.log((state.unchanged + 0.5) / (n + 0.5)) / mean_interval
+
+    def record_fetch(self, app_id, record: Optional[dict], now: Optional[float] = None) -> bool:
+        """
+        Updates an app after a fetch (``record`` None for a failed or empty
+        fetch) and schedules its next refresh. Returns True if the app changed.
+        """
+        now = self._clock() if now is None else now
+        state = self._apps.get(int(app_id))
+        if state is None:
+            self.add([app_id], due=now)
+            state = self._apps[int(app_id)]
+        state.fetches += 1
+
+        changed = False
+        if record is None:
+            state.failures += 1
+            interval = self.base_interval * 2 ** min(state.failures, 16)
+        else:
+            state.failures = 0
+            new_fingerprint = fingerprint(record, self.fingerprint_fields)
+            if state.fingerprint is not None and state.last_fetched is not None:
+                changed = new_fingerprint != state.fingerprint
+                state.comparisons += 1
+                state.unchanged += 0 if changed else 1
+                state.observed += now - state.last_fetched
+                state.changes += 1 if changed else 0
+            state.fingerprint = new_fingerprint
+            state.last_fetched = now
+            state.reviews = review_count(record)
+            state.discounted = is_discounted(record)
+            state.change_rate = self._estimate_rate(state)
+            # Time until weight * P(stale) reaches the target
+            interval = -math.log(1 - self.target_staleness) / (state.change_rate * self.weight(state))
+        state.next_due = now + min(self.max_interval, max(self.min_interval, interval))
+        self._push(state)
+        return changed
+
+    def _current(self, app_id: int, version: int) -> Optional[AppState]:
+        state = self._apps.get(app_id)
+        return state if state is not None and state.version == version else None
+
+    def due(self, limit: Optional[int] = None, now: Optional[float] = None) -> List[int]:
+        """
+        Returns up to ``limit`` due App IDs, highest priority first, without
+        spending budget. Returned apps stay due until ``record_fetch``.
+        Each app is moved to the due set once, so a call costs
+        O((newly due + limit) log n) rather than a sort of every due app.
+        """
+        now = self._clock() if now is None else now
+        if now - self._ready_at >= self.min_interval:
+            self._ready = [(-self.priority(state, now), app_id, version) for _, app_id, version in self._ready
+                           if (state := self._current(app_id, version)) is not None]
+            heapq.heapify(self._ready)
+            self._ready_at = now
+        while self._heap and self._heap[0][0] <= now:
+            _, app_id, version = heapq.heappop(self._heap)
+            state = self._current(app_id, version)
+            if state is not None:
+                heapq.heappush(self._ready, (-self.priority(state, now), app_id, version))
+
+        selected = []
+        while self._ready and (limit is None or len(selected) < limit):
+            entry = heapq.heappop(self._ready)
+            if self._current(entry[1], entry[2]) is not None:
+                selected.append(entry)
+        for entry in selected:
+            heapq.heappush(self._ready, entry)
+        return [app_id for _, app_id, _ in selected]
+
+    def next_batch(self, max_size: int = 50, now: Optional[float] = None) -> List[int]:
+        """Returns the highest-priority due apps that the request budget allows right now, spending one token each."""
+        batch = []
+        for app_id in self.due(max_size, now):
+            if not self.budget.try_acquire():
+                break
+            batch.append(app_id)
+        return batch
+
+    def run_once(self, source: Any, max_size: int = 50, max_workers: int = 8, **source_kwargs) -> Dict[str, int]:
+        """
+        Fetches one budgeted batch through ``source.get_data`` and records the
+        results. Returns counts of fetched, changed and failed apps.
+        """
+        batch = self.next_batch(max_size)
+        counts = {'fetched': len(batch), 'changed': 0, 'failed': 0}
+        if not batch:
+            return counts
+
+        def fetch(app_id):
+            try:
+                with fetch_lane(CRAWL):
+                    return source.get_data(str(app_id), **source_kwargs)
+            except Exception as e:
+                logger.error(f"Refresh of App ID {app_id} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refresh') as executor:
+            records = list(executor.map(fetch, batch))
+        for app_id, record in zip(batch, records):
+            if record is None:
+                counts['failed'] += 1
+            if self.record_fetch(app_id, record):
+                counts['changed'] += 1
+        logger.info(f"Refresh batch: {counts}")
+        return counts
+
+    def stats(self) -> Dict[str, float]:
+        now = self._clock()
+        states = list(self._apps.values())
+        fetches = sum(s.fetches for s in states)
+        changes = sum(s.changes for s in states)
+        return {
+            'apps': len(states),
+            'due': sum(1 for s in states if s.next_due <= now),
+            'fetches': fetches,
+            'changes': changes,
+            'changes_per_fetch': changes / fetches if fetches else 0.0,
+            'budget_tokens': self.budget.available(),
+        }
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([state.to_dict() for state in self._apps.values()], f)
+
+    def load(self, path: str):
+        """Restores app states written by ``save`` (replacing existing ones)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                state = AppState(entry['app_id'], entry['next_due'], entry['change_rate'])
+                for key, value in entry.items():
+                    setattr(state, key, value)
+                self._apps[state.app_id] = state
+                self._push(state)
@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..steam_utils.priority_lanes import CRAWL, fetch_lane
+
+logger = logging.getLogger(__name__)
+
+
+class Job(NamedTuple):
+    id: int
+    app_id: int
+    lang: str
+    fields: Optional[Tuple[str, ...]]
+    attempts: int
+
+
+class JobQueue(ABC):
+    """
+    Interface for a durable, lease-based queue of (app_id, lang, fields) jobs.
+
+    Workers ``dequeue`` a batch, which leases the jobs to them until the lease
+    expires. Jobs are then ``ack``-ed (done) or ``nack``-ed (retried later, or
+    failed after too many attempts). Jobs whose lease expires are handed out
+    again, so a crashed worker never loses work; a job that is still unacked
+    when the lease of its last attempt expires fails, so it cannot keep
+    taking down workers.
+    """
+    # Attempts after which a nacked or expired job fails instead of being retried
+    max_attempts: int = 5
+
+    @abstractmethod
+    def enqueue(self, jobs: Iterable[Tuple[int, str, Optional[Sequence[str]]]]) -> int:
+        """Adds jobs, ignoring duplicates of jobs already queued. Returns the number added."""
+
+    @abstractmethod
+    def dequeue(self, worker_id: str, batch_size: int = 10) -> List[Job]:
+        """Leases up to ``batch_size`` runnable jobs to ``worker_id``."""
+
+    @abstractmethod
+    def extend_lease(self, worker_id: str, job_ids: Iterable[int]) -> int:
+        """Renews the lease on jobs still held by ``worker_id``. Returns the number renewed."""
+
+    @abstractmethod
+    def ack(self, worker_id: str, job_ids: Iterable[int]) -> int:
+        """Marks leased jobs as done. Returns the number acknowledged."""
+
+    @abstractmethod
+    def nack(self, worker_id: str, job_ids: Iterable[int], error: str = '', retry_delay: float = 0.0) -> int:
+        """Returns leased jobs to the queue (or fails them after ``max_attempts``)."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of jobs in each state."""
+
+    @abstractmethod
+    def is_drained(self) -> bool:
+        """True when no job is pending or leased."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    JobQueue backed by a local SQLite database in WAL mode, safe to share
+    between processes on one host. Each process (and thread) gets its own
+    connection; lease handout runs in an IMMEDIATE transaction so two workers
+    never receive the same job.
+    """
+    def __init__(self, path: str, lease_seconds: float = 300.0, max_attempts: int = 5,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self._local = threading.local()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                app_id INTEGER NOT NULL,
+                lang TEXT NOT NULL,
+                fields TEXT NOT NULL DEFAULT '',
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                UNIQUE (app_id, lang, fields)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_runnable ON jobs (state, available_at);
+            CREATE INDEX IF NOT EXISTS jobs_leases ON jobs (state, lease_expires);
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _connect(self) -> '_Transaction':
+        return _Transaction(self._connection())
+
+    @staticmethod
+    def _encode_fields(fields: Optional[Sequence[str]]) -> str:
+        return json.dumps(sorted(fields)) if fields else ''
+
+    def enqueue(self, jobs: Iterable[Tuple[int, str, Optional[Sequence[str]]]]) -> int:
+        rows = [(int(app_id), lang, self._encode_fields(fields)) for app_id, lang, fields in jobs]
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO jobs (app_id, lang, fields) VALUES (?, ?, ?)", rows)
+            return conn.total_changes - before
+
+    def dequeue(self, worker_id: str, batch_size: int = 10) -> List[Job]:
+        now = self._clock()
+        with self._connect() as conn:
+            # A job whose lease expired after its last attempt most likely killed its
+            # worker (crash, OOM, hang) without a nack; fail it instead of handing it out again
+            before = conn.total_changes
+            conn.execute("""
+                UPDATE jobs SET state = 'failed', lease_owner = NULL, lease_expires = NULL,
+                    last_error = 'lease expired after ' || attempts || ' attempts'
+                WHERE state = 'leased' AND lease_expires <= ? AND attempts >= ?
+            """, (now, self.max_attempts))
+            if conn.total_changes > before:
+                logger.warning(f"Failed {conn.total_changes - before} jobs whose lease expired on their last attempt")
+            rows = conn.execute("""
+                SELECT id, app_id, lang, fields, attempts FROM jobs
+                WHERE (state = 'pending' AND available_at <= ?)
+                   OR (state = 'leased' AND lease_expires <= ?)
+                ORDER BY id LIMIT ?
+            """, (now, now, batch_size)).fetchall()
+            if not rows:
+                return []
+            reclaimed = conn.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE state = 'leased' AND id IN ({','.join('?' * len(rows))})",
+                [row[0] for row in rows]).fetchone()[0]
+            if reclaimed:
+                logger.warning(f"Reclaiming {reclaimed} jobs with expired leases for {worker_id}")
+            conn.executemany("""
+                UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE id = ?
+            """, [(worker_id, now + self.lease_seconds, row[0]) for row in rows])
+        return [Job(row[0], row[1], row[2], tuple(json.loads(row[3])) if row[3] else None, row[4] + 1) for row in rows]
+
+    def extend_lease(self, worker_id: str, job_ids: Iterable[int]) -> int:
+        expires = self._clock() + self.lease_seconds
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                [(expires, job_id, worker_id) for job_id in job_ids])
+            return conn.total_changes - before
+
+    def ack(self, worker_id: str, job_ids: Iterable[int]) -> int:
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                UPDATE jobs SET state = 'done', lease_owner = NULL, lease_expires = NULL
+                WHERE id = ? AND state = 'leased' AND lease_owner = ?
+            """, [(job_id, worker_id) for job_id in job_ids])
+            return conn.total_changes - before
+
+    def nack(self, worker_id: str, job_ids: Iterable[int], error: str = '', retry_delay: float = 0.0) -> int:
+        available_at = self._clock() + retry_delay
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                UPDATE jobs SET
+                    state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    available_at = ?, lease_owner = NULL, lease_expires = NULL, last_error = ?
+                WHERE id = ? AND state = 'leased' AND lease_owner = ?
+            """, [(self.max_attempts, available_at, error, job_id, worker_id) for job_id in job_ids])
+            return conn.total_changes - before
+
+    def stats(self) -> Dict[str, int]:
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        with self._connect() as conn:
+            for state, count in conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+                counts[state] = count
+        return counts
+
+    def is_drained(self) -> bool:
+        stats = self.stats()
+        return stats['pending'] == 0 and stats['leased'] == 0
+
+
+class _Transaction:
+    """Runs a block in a BEGIN IMMEDIATE transaction on an autocommit connection."""
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def run_worker(queue: JobQueue, source: Any, handle_result: Callable[[Job, dict], None], worker_id: Optional[str] = None,
+               batch_size: int = 10, retry_delay: float = 30.0, poll_interval: float = 1.0,
+               stop: Optional[threading.Event] = None, renew_interval: float = 30.0) -> Dict[str, int]:
+    """
+    Pulls batches from ``queue`` and runs each job through ``source.get_data``
+    (typically a CombinedSteamDataSource). Successful records are passed to
+    ``handle_result`` and acked one by one; a job whose lookup or
+    ``handle_result`` fails is nacked on its own. The lease on the rest of the
+    batch is renewed between jobs once ``renew_interval`` seconds (keep it well
+    below the queue's lease time) have passed since the last renewal.
+
+    Returns once the queue is drained or ``stop`` is set, with the number of
+    jobs done, retried later and failed for good.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    counts = {'done': 0, 'retried': 0, 'failed': 0}
+    while not (stop and stop.is_set()):
+        jobs = queue.dequeue(worker_id, batch_size)
+        if not jobs:
+            if queue.is_drained():
+                break
+            time.sleep(poll_interval)  # Other workers hold the remaining leases
+            continue
+        renewed = time.monotonic()
+        for i, job in enumerate(jobs):
+            if time.monotonic() - renewed >= renew_interval:
+                queue.extend_lease(worker_id, [pending.id for pending in jobs[i:]])
+                renewed = time.monotonic()
+            error = 'no data'
+            try:
+                with fetch_lane(CRAWL):
+                    data = source.get_data(job.app_id, lang=job.lang, fields=job.fields)
+                if data:
+                    handle_result(job, data)
+            except Exception as e:
+                logger.error(f"Job {job.id} (App ID {job.app_id}) raised: {e}")
+                data, error = None, f"{type(e).__name__}: {e}"
+            if data:
+                counts['done'] += queue.ack(worker_id, [job.id])
+            elif queue.nack(worker_id, [job.id], error=error, retry_delay=retry_delay):
+                counts['failed' if job.attempts >= queue.max_attempts else 'retried'] += 1
+    logger.info(f"Worker {worker_id} finished: {counts}")
+    return counts
@@ -1,15 +1,30 @@
 """
 Steam Data - Data sources and parsers for Steam game information
+
+Source classes are imported on first access so that selecting one source
+does not import the others.
 """
 
-from .combined_data import CombinedSteamDataSource
-from .steam_app_details import SteamAppDetailsDataSource
-from .store_html import StoreHtmlDataSource
+from ..steam_utils.lazy import lazy_exports
+
 from .base import SteamDataSource
 
+_LAZY_EXPORTS = {
+    'CombinedSteamDataSource': '.combined_data',
+    'SteamAppDetailsDataSource': '.steam_app_details',
+    'StoreHtmlDataSource': '.store_html',
+    'SteamReviewsDataSource': '.steam_reviews',
+    'StoreSearchDataSource': '.store_search',
+}
+
 __all__ = [
     'CombinedSteamDataSource',
     'SteamAppDetailsDataSource',
-    'StoreHtmlDataSource', 
+    'StoreHtmlDataSource',
+    'SteamReviewsDataSource', 
+    'StoreSearchDataSource',
     'SteamDataSource',
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_EXPORTS)
@@ -1,15 +1,29 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+import logging
+
+from ..steam_utils.priority_lanes import submit_in_context
+
+logger = logging.getLogger(__name__)
 
 class SteamDataSource(ABC):
     """
     Abstract base class for all Steam data sources.
     Defines the interface for fetching and parsing Steam-related data.
+
+    Sources are safe to share between threads: ``get_data`` keeps no per-call
+    state on the instance, and the caches, pools and limiters they use lock
+    internally. ``get_many`` runs lookups on a thread pool. Sources that keep
+    threads of their own release them in ``close`` (or at the end of a
+    ``with`` block).
     """
     @abstractmethod
     def get_data(self, identifier: str | int, **kwargs):
         """
         Abstract method to fetch and parse data from a specific source.
-        
+
         Args:
             identifier: The primary identifier for the data (e.g., game URL, AppID, API method name).
             **kwargs: Additional keyword arguments specific to the data source (e.g., language).
@@ -19,5 +33,46 @@ class SteamDataSource(ABC):
         """
         pass
 
+    def get_many(self, identifiers: Iterable, max_workers: int = 8, **kwargs) -> Iterator[Tuple[Any, Optional[dict]]]:
+        """
+        Bulk mode: runs ``get_data(identifier, **kwargs)`` for every identifier on
+        ``max_workers`` threads and yields ``(identifier, record)`` pairs in
+        completion order. Identifiers are pulled lazily and at most
+        ``2 * max_workers`` lookups are queued, so the input may be a generator
+        over a whole catalog. Lookups that raise are logged and yield None.
+        """
+        def get(identifier):
+            try:
+                return self.get_data(identifier, **kwargs)
+            except Exception as e:
+                logger.error(f"Lookup of {identifier} failed: {e}")
+                return None
+
+        identifiers = iter(identifiers)
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='get-many') as executor:
+            def fill():
+                for identifier in identifiers:
+                    pending[submit_in_context(executor, get, identifier)] = identifier
+                    if len(pending) >= 2 * max_workers:
+                        return
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+                fill()
+
     def parse_static_content(self, content: str, **kwargs):
         raise NotImplementedError("This data source does not support parsing HTML content directly.")
+
+    def close(self):
+        """Releases threads the source started. Sources that start none have nothing to release."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
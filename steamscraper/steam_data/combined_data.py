@@ -1,45 +1,149 @@
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional
 
 from .base import SteamDataSource
 from .store_html import StoreHtmlDataSource
 from .steam_app_details import SteamAppDetailsDataSource
 from ..steam_utils.utils import extract_app_id_from_url
+from ..steam_utils.proxy_pool import ProxyPool
+from ..steam_utils.cache import SingleFlight, TTLCache
+from ..steam_utils.hedging import Hedger
+from ..steam_utils.shared_cache import SharedCache
+from ..steam_utils.negative_cache import NegativeCache
+from ..steam_utils.priority_lanes import submit_in_context
+from ..steam_utils.constants import STORE_BASE_URL
 
 logger = logging.getLogger(__name__)
 
+# Key added to records returned incomplete because a ``deadline`` passed
+PARTIAL_KEY = '_partial'
+
+# Leg names used in partial-result metadata, in merge order (HTML data wins)
+LEGS = ('store_html', 'appdetails')
+
+
+class _Legs:
+    """The two in-flight leg fetches of one deadline-bounded lookup."""
+    def __init__(self, futures: Dict[str, Future]):
+        self.futures = futures
+        self.discard = False  # Set when late results must not be cached
 
-class CombinedSteamDataSource(SteamDataSource):
-    def __init__(self):
-        self.store_html_source = StoreHtmlDataSource()
-        self.steampowered_api_source = SteamAppDetailsDataSource()
 
-    def get_data(self, identifier, **kwargs) -> Optional[Dict[str, Any]]:
+class CombinedSteamDataSource(SteamDataSource):
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, cache_size: int = 0, cache_ttl: Optional[float] = 300.0,
+                 stream_html: bool = False, store_url: str = STORE_BASE_URL, session=None, hedging: bool = False,
+                 background_completion: bool = True, stale_ttl: Optional[float] = 3600.0, max_workers: int = 16,
+                 shared_cache: Optional[SharedCache] = None, cache_raw_responses: bool = False,
+                 negative_cache: Optional[NegativeCache] = None):
         """
-        Fetches game data by combining results from StoreHtmlDataSource and SteamAppDetailsDataSource.
-        Prioritizes data from StoreHtmlDataSource.
+        Args:
+            proxy_pool: Optional proxy pool shared by both underlying sources.
+            cache_size: Maximum number of combined records kept in the in-memory LRU. 0 disables the cache.
+            cache_ttl: Seconds a cached record stays valid. None keeps records until evicted.
+            stream_html: Stream store pages and stop downloading once the requested ``fields`` are parsed.
+            store_url: Base URL for both sources, e.g. a local mock server for load tests.
+            session: Optional ``requests.Session`` (e.g. a SharedSession) used by both sources.
+            hedging: Hedge slow store page and appdetails requests. Each endpoint gets its own
+                Hedger (default 95th-percentile trigger, at most 5% extra requests).
+            background_completion: With ``deadline``, legs that miss it keep running and the complete
+                record is written to the result cache when they finish. If False, late results are dropped.
+            stale_ttl: With ``deadline``, how long the last successful result of each leg may stand in
+                (marked stale) for a leg that missed the deadline. None disables stale fallbacks.
+            max_workers: Threads running legs of deadline-bounded lookups.
+            shared_cache: Optional cross-process cache for combined records, consulted after the
+                in-memory cache. A lookup with ``fields`` can also be served from a cached full record.
+            cache_raw_responses: Also keep raw store pages and appdetails responses in ``shared_cache``.
+            negative_cache: Optional NegativeCache shared by both sources; apps that redirect to the
+                store front or an age check, answer 404 or ``success: false`` are then skipped per source.
         """
-        combined_data: Dict[str, Any] = {}
-        app_id: Optional[int] = None
+        raw_cache = shared_cache if cache_raw_responses else None
+        # Created here, so closed by ``close``
+        self._hedgers = [Hedger(), Hedger()] if hedging else [None, None]
+        self.store_html_source = StoreHtmlDataSource(proxy_pool=proxy_pool, stream=stream_html, store_url=store_url, session=session,
+                                                     hedger=self._hedgers[0], shared_cache=raw_cache,
+                                                     negative_cache=negative_cache)
+        self.steampowered_api_source = SteamAppDetailsDataSource(proxy_pool=proxy_pool, store_url=store_url, session=session,
+                                                                 hedger=self._hedgers[1], shared_cache=raw_cache,
+                                                                 negative_cache=negative_cache)
+        self.shared_cache = shared_cache
+        self.negative_cache = negative_cache
+        self.result_cache: Optional[TTLCache] = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+        self._single_flight = SingleFlight()
+        self.background_completion = background_completion
+        self._last_good: Optional[TTLCache] = TTLCache(maxsize=max(cache_size, 1024), ttl=stale_ttl) if stale_ttl else None
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[tuple, _Legs] = {}
+        self._lock = threading.Lock()
 
-        # Determine app_id from identifier up front
+    @staticmethod
+    def _resolve_app_id(identifier) -> Optional[int]:
         if isinstance(identifier, str):
             if identifier.isdigit():
-                app_id = int(identifier)
-            else:
-                app_id = extract_app_id_from_url(identifier)
-                if not app_id:
-                    logger.warning(f"Invalid identifier: {identifier}")
-                    return None
+                return int(identifier)
+            app_id = extract_app_id_from_url(identifier)
+            return int(app_id) if app_id else None
         elif isinstance(identifier, int):
-            app_id = identifier
-        else:
+            return identifier
+        return None
+
+    def get_data(self, identifier, fields: Optional[Iterable[str]] = None, deadline: Optional[float] = None,
+                 **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Fetches game data by combining results from StoreHtmlDataSource and SteamAppDetailsDataSource.
+        Prioritizes data from StoreHtmlDataSource.
+
+        Concurrent calls for the same (app_id, lang, fields) share a single fetch, and
+        successful results are served from the in-memory cache when it is enabled.
+        Returned records may be shared between callers and should not be mutated.
+
+        With ``deadline`` both sources are queried concurrently and the call returns
+        after at most ``deadline`` seconds with whatever has been merged by then.
+        An incomplete record carries a ``_partial`` entry, e.g.
+        ``{'pending': ['appdetails'], 'stale': [], 'failed': [], 'missing_fields': ['price_overview']}``:
+        ``pending`` legs missed the deadline, ``stale`` ones were filled in from
+        their last successful result, ``failed`` ones returned nothing. Late legs
+        may finish in the background and warm the cache (``background_completion``).
+
+        Args:
+            identifier: App ID or Steam store URL.
+            fields: Optional iterable of top-level keys to keep in the result.
+            deadline: Optional latency budget in seconds for this call.
+        """
+        app_id = self._resolve_app_id(identifier)
+        if not app_id:
             logger.warning(f"Invalid identifier: {identifier}")
             return None
 
+        fields_key = tuple(sorted(fields)) if fields else None
+        key = (app_id, kwargs.get('lang', 'english'), fields_key)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.info(f"Serving App ID {app_id} from result cache")
+            return cached
+
+        if deadline is not None:
+            return self._get_with_deadline(key, identifier, app_id, fields_key, deadline, **kwargs)
+        return self._single_flight.do(key, lambda: self._fetch_and_cache(key, identifier, app_id, fields_key, **kwargs))
+
+    def _fetch_and_cache(self, key, identifier, app_id, fields, **kwargs) -> Optional[Dict[str, Any]]:
+        combined_data = self._fetch_combined(identifier, app_id, fields=fields, **kwargs)
+        if combined_data is not None and fields:
+            combined_data = {field: combined_data[field] for field in fields if field in combined_data}
+        if combined_data is not None:
+            self._cache_set(key, combined_data)
+        return combined_data
+
+    def _fetch_combined(self, identifier, app_id: int, fields=None, **kwargs) -> Optional[Dict[str, Any]]:
+        combined_data: Dict[str, Any] = {}
+
         # 1. Try to get data from StoreHtmlDataSource
         logger.info(f"Attempting to fetch data from StoreHtmlDataSource for {identifier}")
-        html_data = self.store_html_source.get_data(identifier, **kwargs)
+        html_data = self.store_html_source.get_data(identifier, fields=fields, **kwargs)
 
         if html_data:
             logger.info("Successfully retrieved data from StoreHtmlDataSource.")
@@ -47,26 +151,192 @@ class CombinedSteamDataSource(SteamDataSource):
         else:
             logger.warning("StoreHtmlDataSource failed to retrieve data.")
 
-        # 2. Try to get data from SteamAppDetailsDataSource if app_id is available
-        if app_id:
-            logger.info(f"Attempting to fetch data from SteamAppDetailsDataSource for App ID: {app_id}")
-            api_data = self.steampowered_api_source.get_data(app_id, **kwargs)
-            if api_data:
-                logger.info("Successfully retrieved data from SteamAppDetailsDataSource.")
-                # Merge API data, prioritizing existing HTML data
-                # This is a simple merge, more sophisticated merging might be needed based on specific fields
-                for key, value in api_data.items():
-                    if key not in combined_data or \
-                            not combined_data.get(key) or \
-                            (isinstance(combined_data.get(key), str) and isinstance(value, dict)):
-                        combined_data[key] = value
-            else:
-                logger.warning(f"SteamAppDetailsDataSource failed to retrieve data for App ID: {app_id}.")
+        # 2. Try to get data from SteamAppDetailsDataSource
+        logger.info(f"Attempting to fetch data from SteamAppDetailsDataSource for App ID: {app_id}")
+        api_data = self.steampowered_api_source.get_data(app_id, **kwargs)
+        if api_data:
+            logger.info("Successfully retrieved data from SteamAppDetailsDataSource.")
+            self.merge_api_data(combined_data, api_data)
         else:
-            logger.warning("Could not determine App ID for SteamAppDetailsDataSource.")
+            logger.warning(f"SteamAppDetailsDataSource failed to retrieve data for App ID: {app_id}.")
 
         if not combined_data:
             logger.error(f"Failed to retrieve any data for identifier: {identifier}")
             return None
 
         return combined_data
+
+    @staticmethod
+    def _shared_key(key) -> str:
+        app_id, lang, fields = key
+        return f"combined:{app_id}:{lang}:{','.join(fields) if fields else '*'}"
+
+    def _cache_get(self, key) -> Optional[Dict[str, Any]]:
+        if self.result_cache is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.shared_cache is None:
+            return None
+        cached = self.shared_cache.get(self._shared_key(key))
+        if cached is None and key[2]:
+            # Project the requested fields out of a cached full record
+            cached = self.shared_cache.get(self._shared_key(key[:2] + (None,)), fields=key[2])
+        if cached is not None and self.result_cache is not None:
+            self.result_cache.set(key, cached)
+        return cached
+
+    def _cache_set(self, key, combined_data: Dict[str, Any]):
+        if self.result_cache is not None:
+            self.result_cache.set(key, combined_data)
+        if self.shared_cache is not None:
+            try:
+                self.shared_cache.set(self._shared_key(key), combined_data)
+            except Exception as e:
+                logger.error(f"Could not write App ID {key[0]} to the shared cache: {e}")
+
+    def _start_legs(self, key, identifier, app_id: int, fields, **kwargs) -> _Legs:
+        """Starts both legs for ``key`` unless they are already running (e.g. for an earlier caller that timed out)."""
+        with self._lock:
+            legs = self._in_flight.get(key)
+            if legs is not None:
+                return legs
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='combined')
+            legs = _Legs({
+                'store_html': submit_in_context(self._executor, self.store_html_source.get_data, identifier, fields=fields, **kwargs),
+                'appdetails': submit_in_context(self._executor, self.steampowered_api_source.get_data, app_id, **kwargs),
+            })
+            self._in_flight[key] = legs
+        remaining = len(LEGS)
+        count_lock = threading.Lock()
+
+        def leg_done(_):
+            nonlocal remaining
+            with count_lock:
+                remaining -= 1
+                if remaining:
+                    return
+            self._finish_legs(key, legs)
+
+        for future in legs.futures.values():
+            future.add_done_callback(leg_done)
+        return legs
+
+    def _finish_legs(self, key, legs: _Legs):
+        """Runs once both legs are done: remembers each leg's result and caches the merged record."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if legs.discard:
+            return
+        results = {name: self._leg_result(future) for name, future in legs.futures.items()}
+        if self._last_good is not None:
+            for name, result in results.items():
+                if result:
+                    self._last_good.set((name,) + key, result)
+        combined_data = self._merge(results, key[2])
+        if combined_data is not None:
+            self._cache_set(key, combined_data)
+
+    @staticmethod
+    def _leg_result(future: Future) -> Optional[Dict[str, Any]]:
+        if future.cancelled():
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Combined lookup leg failed: {e}")
+            return None
+
+    def _merge(self, results: Dict[str, Optional[Dict[str, Any]]], fields) -> Optional[Dict[str, Any]]:
+        combined_data: Dict[str, Any] = dict(results.get('store_html') or {})
+        if results.get('appdetails'):
+            self.merge_api_data(combined_data, results['appdetails'])
+        if not combined_data:
+            return None
+        if fields:
+            combined_data = {field: combined_data[field] for field in fields if field in combined_data}
+        return combined_data
+
+    def _get_with_deadline(self, key, identifier, app_id: int, fields, deadline: float, **kwargs) -> Optional[Dict[str, Any]]:
+        started = time.monotonic()
+        legs = self._start_legs(key, identifier, app_id, fields, **kwargs)
+        wait(list(legs.futures.values()), timeout=max(0.0, deadline - (time.monotonic() - started)))
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        partial = {'pending': [], 'stale': [], 'failed': []}
+        for name in LEGS:
+            future = legs.futures[name]
+            if future.done():
+                results[name] = self._leg_result(future)
+                if not results[name]:
+                    partial['failed'].append(name)
+                continue
+            partial['pending'].append(name)
+            stale = self._last_good.get((name,) + key) if self._last_good is not None else None
+            if stale:
+                results[name] = stale
+                partial['stale'].append(name)
+
+        if partial['pending'] and not self.background_completion:
+            legs.discard = True
+            for name in partial['pending']:
+                legs.futures[name].cancel()  # Only stops legs that have not started yet
+
+        combined_data = self._merge(results, fields)
+        if combined_data is None:
+            logger.error(f"Failed to retrieve any data for identifier {identifier} within {deadline}s")
+            return None
+        if partial['pending'] or partial['failed']:
+            partial['missing_fields'] = [field for field in fields or () if field not in combined_data]
+            combined_data[PARTIAL_KEY] = partial
+            logger.info(f"Returning partial data for App ID {app_id} after {time.monotonic() - started:.3f}s: {partial}")
+        # Complete records are cached by _finish_legs
+        return combined_data
+
+    @staticmethod
+    def merge_api_data(combined_data: Dict[str, Any], api_data: Dict[str, Any]):
+        """
+        Merges API data into ``combined_data`` in place, prioritizing existing HTML data.
+        """
+        # This is a simple merge, more sophisticated merging might be needed based on specific fields
+        for key, value in api_data.items():
+            if key not in combined_data or \
+                    not combined_data.get(key) or \
+                    (isinstance(combined_data.get(key), str) and isinstance(value, dict)):
+                combined_data[key] = value
+
+    def cache_stats(self) -> Dict[str, float]:
+        """
+        Returns result-cache counters (hits, misses, hit_rate, size, evictions),
+        single-flight counters (calls, coalesced, in_flight), under ``shared`` the
+        shared cache's per-process and all-process counters and, under ``negative``,
+        the negative cache's recorded and skipped lookups.
+        """
+        stats: Dict[str, float] = dict(self.result_cache.stats()) if self.result_cache is not None else {}
+        stats.update(self._single_flight.stats())
+        if self.shared_cache is not None:
+            stats['shared'] = self.shared_cache.stats()
+        if self.negative_cache is not None:
+            stats['negative'] = self.negative_cache.stats()
+        return stats
+
+    def close(self):
+        """
+        Shuts down the worker threads of deadline-bounded lookups and the hedgers
+        created for ``hedging``. Legs that are already running are not waited for.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for hedger in self._hedgers:
+            if hedger is not None:
+                hedger.close()
+
+    def hedge_stats(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Returns Hedger counters (hedge rate, wins, seconds saved) per underlying source, None where hedging is off."""
+        return {
+            'store_html': self.store_html_source.hedger.stats() if self.store_html_source.hedger else None,
+            'appdetails': self.steampowered_api_source.hedger.stats() if self.steampowered_api_source.hedger else None,
+        }
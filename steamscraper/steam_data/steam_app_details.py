@@ -1,19 +1,42 @@
-from typing import Optional
+from typing import Dict, Optional
 
 import requests
-import sys
-import os
+import threading
 import json
 import logging
 
 from .base import SteamDataSource
 from ..steam_utils.utils import extract_app_id_from_url
-from ..steam_utils.web_utils import get_proxies_from_env # Import the new function
+from ..steam_utils.web_utils import get_proxies_from_env, read_cancellable
+from ..steam_utils.hedging import Hedger
+from ..steam_utils.shared_cache import SharedCache
+from ..steam_utils.negative_cache import NegativeCache, UNSUCCESSFUL
+from ..steam_utils.proxy_pool import NoProxyAvailableError, ProxyPool
+from ..steam_utils.constants import STORE_BASE_URL
 
 logger = logging.getLogger(__name__)
 
 class SteamAppDetailsDataSource(SteamDataSource):
-    BASE_URL = "https://store.steampowered.com/api/appdetails"
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, store_url: str = STORE_BASE_URL,
+                 session: Optional[requests.Session] = None, hedger: Optional[Hedger] = None,
+                 shared_cache: Optional[SharedCache] = None, negative_cache: Optional[NegativeCache] = None):
+        """
+        Args:
+            proxy_pool: Optional proxy pool to route API requests through.
+            store_url: Base URL of the store (e.g. a local mock server).
+            session: Optional session shared with other sources (connection pool, rate limit).
+            hedger: Optional Hedger; slow ``get_data`` requests are then duplicated (within its budget).
+            shared_cache: Optional cross-process cache for appdetails responses of ``get_data``.
+            negative_cache: Optional NegativeCache. Apps answered with ``success: false`` are recorded
+                there (per ``cc``) and skipped without a request.
+        """
+        self.proxy_pool = proxy_pool
+        self.session = session
+        self.hedger = hedger
+        self.shared_cache = shared_cache
+        self.negative_cache = negative_cache
+        self.api_url = f"{store_url.rstrip('/')}/api/appdetails"
+        self.package_url = f"{store_url.rstrip('/')}/api/packagedetails"
 
     def get_data(self, identifier, **kwargs):
         """
@@ -32,29 +55,123 @@ class SteamAppDetailsDataSource(SteamDataSource):
 
         lang = kwargs.get('lang', 'english')
         params = {'appids': app_id, 'l': lang}
+        if kwargs.get('cc'):
+            params['cc'] = kwargs['cc']
+
+        if self.negative_cache is not None:
+            reason = self.negative_cache.check('appdetails', app_id, region=params.get('cc', ''))
+            if reason is not None:
+                logger.info(f"Skipping appdetails of App ID {app_id} (known {reason})")
+                return None
 
-        # Get proxies from environment variables
-        proxies = get_proxies_from_env()
+        cache_key = f"appdetails:{lang}:{params.get('cc', '')}:{app_id}"
+        if self.shared_cache is not None:
+            cached = self.shared_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Serving appdetails of App ID {app_id} from the shared cache")
+                return cached
 
         logger.info(f"Fetching from Steam Storefront API for App ID: {app_id}")
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10, proxies=proxies)
-            response.raise_for_status()
-            data = response.json()
-
-            if data and app_id in data and data[app_id]['success']:
-                game_data = data[app_id]['data']
-                return game_data
-            else:
-                logger.error(f"Could not retrieve data for App ID {app_id} or API call was unsuccessful.")
+        if self.hedger is not None:
+            data = self.hedger.call(lambda cancel: self._request(params, cancel=cancel))
+        else:
+            data = self._request(params)
+        if data and app_id in data and data[app_id]['success']:
+            game_data = data[app_id]['data']
+            if self.shared_cache is not None:
+                self.shared_cache.set(cache_key, game_data)
+            return game_data
+        elif data is not None:
+            logger.error(f"Could not retrieve data for App ID {app_id} or API call was unsuccessful.")
+            if self.negative_cache is not None and isinstance(data.get(app_id), dict) and data[app_id].get('success') is False:
+                self.negative_cache.record('appdetails', app_id, UNSUCCESSFUL, region=params.get('cc', ''))
+        return None
+
+    def get_price_overviews(self, app_ids, cc: str, lang: str = 'english') -> Optional[Dict[int, dict]]:
+        """
+        Fetches ``price_overview`` for many apps in one region with a single request
+        (the endpoint accepts several App IDs when ``filters=price_overview``).
+
+        Returns:
+            {app_id: price_overview} where free apps map to an empty dict and apps that are
+            unavailable in the region are omitted, or None if the request failed.
+        """
+        app_ids = [str(app_id) for app_id in app_ids]
+        params = {'appids': ','.join(app_ids), 'cc': cc, 'l': lang, 'filters': 'price_overview'}
+
+        logger.info(f"Fetching price_overview for {len(app_ids)} apps in region {cc}")
+        data = self._request(params)
+        if data is None:
+            return None
+
+        prices: Dict[int, dict] = {}
+        for app_id in app_ids:
+            entry = data.get(app_id)
+            if not entry or not entry.get('success'):
+                continue
+            # Free apps come back with an empty list instead of an object
+            details = entry.get('data') or {}
+            prices[int(app_id)] = details.get('price_overview') or {}
+        return prices
+
+    def get_package_details(self, package_ids, cc: Optional[str] = None, lang: str = 'english') -> Optional[Dict[int, dict]]:
+        """
+        Fetches packagedetails for several packages (subs) with a single request.
+
+        Returns:
+            {package_id: data} for every package the store knows, or None if the request failed.
+        """
+        package_ids = [str(package_id) for package_id in package_ids]
+        params = {'packageids': ','.join(package_ids), 'l': lang}
+        if cc:
+            params['cc'] = cc
+
+        logger.info(f"Fetching packagedetails for {len(package_ids)} packages")
+        data = self._request(params, url=self.package_url)
+        if data is None:
+            return None
+        return {int(package_id): data[package_id]['data'] for package_id in package_ids
+                if (data.get(package_id) or {}).get('success') and data[package_id].get('data')}
+
+    def _request(self, params: dict, url: Optional[str] = None, cancel: Optional[threading.Event] = None) -> Optional[dict]:
+        """
+        Performs one Storefront API request (appdetails unless ``url`` is given) and
+        returns the decoded JSON, or None on error or once ``cancel`` is set.
+        """
+        lease = None
+        if self.proxy_pool is not None:
+            try:
+                lease = self.proxy_pool.acquire()
+            except NoProxyAvailableError as e:
+                logger.error(f"Error fetching from Steam Storefront API: {e}")
                 return None
+            proxies = lease.proxies
+        else:
+            # Get proxies from environment variables
+            proxies = get_proxies_from_env()
 
+        success = False
+        try:
+            if cancel is None:
+                response = (self.session or requests).get(url or self.api_url, params=params, timeout=10, proxies=proxies)
+                response.raise_for_status()
+                success = True
+                return response.json()
+            with (self.session or requests).get(url or self.api_url, params=params, timeout=10, proxies=proxies,
+                                                stream=True) as response:
+                response.raise_for_status()
+                body = read_cancellable(response, cancel)
+            success = True
+            return json.loads(body) if body is not None else None
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching from Steam Storefront API: {e}")
             return None
         except json.JSONDecodeError as e:
             logger.error(f"Error decoding JSON response from Steam Storefront API: {e}")
             return None
+        finally:
+            if lease:
+                lease.release(success=success)
 
     def parse_static_content(self, content: str, **kwargs):
         raise NotImplementedError("SteamAppDetailsDataSource does not support processing HTML content directly.")
@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+import requests
+import json
+import logging
+
+from .base import SteamDataSource
+from ..steam_utils.utils import extract_app_id_from_url
+from ..steam_utils.web_utils import get_proxies_from_env
+from ..steam_utils.proxy_pool import NoProxyAvailableError, ProxyPool
+from ..steam_utils.constants import STORE_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewPage(NamedTuple):
+    """One page of the appreviews endpoint. Resume a crawl by passing ``next_cursor`` back in."""
+    cursor: str
+    next_cursor: Optional[str]
+    reviews: List[Dict[str, Any]]
+    query_summary: Dict[str, Any]
+
+
+class SteamReviewsDataSource(SteamDataSource):
+    """
+    Streams user reviews from the Storefront ``appreviews`` endpoint.
+
+    Pages are fetched by cursor; while the caller consumes one page the next
+    one is already being fetched in the background. At most two pages are held
+    in memory at any time, so apps with millions of reviews can be streamed.
+    """
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, store_url: str = STORE_BASE_URL,
+                 num_per_page: int = 100, prefetch: bool = True):
+        self.proxy_pool = proxy_pool
+        self.api_url = f"{store_url.rstrip('/')}/appreviews"
+        self.num_per_page = num_per_page
+        self.prefetch = prefetch
+
+    @staticmethod
+    def _resolve_app_id(identifier) -> Optional[str]:
+        if isinstance(identifier, int) or identifier.isdigit():
+            return str(identifier)
+        return extract_app_id_from_url(identifier)
+
+    def _fetch_page(self, app_id: str, cursor: str, lang: str, review_filter: str) -> Optional[Dict[str, Any]]:
+        params = {
+            'json': 1,
+            'cursor': cursor,
+            'num_per_page': self.num_per_page,
+            'filter': review_filter,
+            'language': lang,
+            'review_type': 'all',
+            'purchase_type': 'all',
+        }
+
+        lease = None
+        if self.proxy_pool is not None:
+            try:
+                lease = self.proxy_pool.acquire()
+            except NoProxyAvailableError as e:
+                logger.error(f"Error fetching reviews for App ID {app_id}: {e}")
+                return None
+            proxies = lease.proxies
+        else:
+            proxies = get_proxies_from_env()
+
+        logger.info(f"Fetching reviews for App ID {app_id} (cursor {cursor})")
+        success = False
+        try:
+            response = requests.get(f"{self.api_url}/{app_id}", params=params, timeout=10, proxies=proxies)
+            response.raise_for_status()
+            success = True
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching reviews for App ID {app_id}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding reviews response for App ID {app_id}: {e}")
+            return None
+        finally:
+            if lease:
+                lease.release(success=success)
+
+        if not data or data.get('success') != 1:
+            logger.error(f"Reviews API call was unsuccessful for App ID {app_id}.")
+            return None
+        return data
+
+    def iter_pages(self, identifier, cursor: str = '*', lang: str = 'all', review_filter: str = 'recent') -> Iterator[ReviewPage]:
+        """
+        Yields review pages starting at ``cursor`` ('*' for the first page).
+        Iteration stops at the last page or on a request error; in the latter case
+        the crawl can be resumed from the last page's ``next_cursor``.
+        """
+        app_id = self._resolve_app_id(identifier)
+        if not app_id:
+            logger.error("Invalid App ID or Steam store URL provided.")
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reviews-prefetch')
+        first_page = True
+        try:
+            future = executor.submit(self._fetch_page, app_id, cursor, lang, review_filter)
+            while True:
+                data = future.result()
+                if data is None:
+                    return
+                reviews = data.get('reviews') or []
+                next_cursor = data.get('cursor')
+                last_page = not reviews or not next_cursor or next_cursor == cursor
+                if not last_page and self.prefetch:
+                    future = executor.submit(self._fetch_page, app_id, next_cursor, lang, review_filter)
+
+                # The endpoint ends with an empty page; only surface it if it is the only one
+                if reviews or first_page:
+                    yield ReviewPage(cursor, None if last_page else next_cursor, reviews, data.get('query_summary') or {})
+                first_page = False
+
+                if last_page:
+                    return
+                if not self.prefetch:
+                    future = executor.submit(self._fetch_page, app_id, next_cursor, lang, review_filter)
+                cursor = next_cursor
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_reviews(self, identifier, cursor: str = '*', max_reviews: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Yields individual reviews, stopping after ``max_reviews`` if given.
+        Accepts the same keyword arguments as ``iter_pages``.
+        """
+        count = 0
+        pages = self.iter_pages(identifier, cursor=cursor, **kwargs)
+        try:
+            for page in pages:
+                for review in page.reviews:
+                    if max_reviews is not None and count >= max_reviews:
+                        return
+                    count += 1
+                    yield review
+        finally:
+            pages.close()
+
+    def get_data(self, identifier, **kwargs):
+        """
+        Fetches up to ``max_reviews`` (default 100) reviews plus the query summary.
+        The returned ``cursor`` resumes after the returned reviews (at-least-once if the
+        last page was cut short). Use ``iter_reviews``/``iter_pages`` to stream larger volumes.
+        """
+        max_reviews = kwargs.get('max_reviews', 100)
+        lang = kwargs.get('lang', 'all')
+        review_filter = kwargs.get('review_filter', 'recent')
+
+        query_summary = None
+        reviews = []
+        cursor = None
+        pages = self.iter_pages(identifier, cursor=kwargs.get('cursor', '*'), lang=lang, review_filter=review_filter)
+        try:
+            for page in pages:
+                if query_summary is None:
+                    query_summary = page.query_summary
+                remaining = max_reviews - len(reviews)
+                reviews.extend(page.reviews[:remaining])
+                cursor = page.next_cursor if remaining >= len(page.reviews) else page.cursor
+                if len(reviews) >= max_reviews:
+                    break
+        finally:
+            pages.close()
+
+        if query_summary is None:
+            return None
+        return {'query_summary': query_summary, 'reviews': reviews, 'cursor': cursor}
+
+    def parse_static_content(self, content: str, **kwargs):
+        raise NotImplementedError("SteamReviewsDataSource does not support processing HTML content directly.")
@@ -0,0 +1,394 @@
+import inspect
+from collections import Counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+try:
+    from bs4.builder._htmlparser import BeautifulSoupHTMLParser, HTMLParserTreeBuilder
+except ImportError:  # Private module; see _CUSTOM_PARSER_SUPPORTED
+    BeautifulSoupHTMLParser = HTMLParserTreeBuilder = None
+
+
+class _PendingEndTags(Counter):
+    """
+    Multiset with the list interface html.parser's tree builder uses for
+    empty-element tags whose (optional) end tag may still follow.
+    """
+    def append(self, name: str):
+        self[name] += 1
+
+    def remove(self, name: str):
+        self[name] -= 1
+        if not self[name]:
+            del self[name]
+
+
+# The parser override below relies on bs4 internals: the private html.parser
+# builder module and the ``_parser_class`` hook of its ``feed``. Without them
+# the stock builder is used (correct, only slower on large pages).
+_CUSTOM_PARSER_SUPPORTED = (HTMLParserTreeBuilder is not None
+                            and '_parser_class' in inspect.signature(HTMLParserTreeBuilder.feed).parameters)
+
+if _CUSTOM_PARSER_SUPPORTED:
+    class _StoreHTMLParser(BeautifulSoupHTMLParser):
+        """
+        bs4's html.parser tree builder records every ``<br>``, ``<img>`` and
+        ``<input>`` in a list and checks each end tag against it; the entries are
+        only removed by explicit ``</br>`` tags, which never come, so building the
+        tree is O(end tags x void tags). Store descriptions and requirements are
+        full of ``<br>``, so keep the entries in a multiset instead.
+        """
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Only swap the container while it is still the list this works around
+            if isinstance(getattr(self, 'already_closed_empty_element', None), list):
+                self.already_closed_empty_element = _PendingEndTags()
+
+    class _StoreHTMLTreeBuilder(HTMLParserTreeBuilder):
+        def feed(self, markup):
+            super().feed(markup, _parser_class=_StoreHTMLParser)
+
+
+def parse_store_html(html: str) -> BeautifulSoup:
+    """Parses a store page with html.parser in time linear in the page size."""
+    if not _CUSTOM_PARSER_SUPPORTED:
+        return BeautifulSoup(html, 'html.parser')
+    return BeautifulSoup(html, builder=_StoreHTMLTreeBuilder())
+
+
+class Selector(NamedTuple):
+    """
+    A simple selector: tag name (None for any), classes that must all be present,
+    and an exact ``id`` or an ``id_prefix``.
+    """
+    tag: Optional[str] = None
+    classes: Tuple[str, ...] = ()
+    id: Optional[str] = None
+    id_prefix: Optional[str] = None
+
+    def matches(self, tag: Tag, classes) -> bool:
+        if self.tag is not None and tag.name != self.tag:
+            return False
+        if self.classes and not all(c in classes for c in self.classes):
+            return False
+        if self.id is not None and tag.get('id') != self.id:
+            return False
+        if self.id_prefix is not None and not (tag.get('id') or '').startswith(self.id_prefix):
+            return False
+        return True
+
+
+class Rule(NamedTuple):
+    """
+    Collects the elements matching ``target`` (inside an element matching
+    ``scope``, if given - the CSS descendant combinator) during the traversal.
+    ``first`` keeps ``soup.find`` semantics, otherwise every match is kept in
+    document order like ``soup.select``.
+    """
+    name: str
+    target: Selector
+    scope: Optional[Selector] = None
+    first: bool = False
+
+
+class Field(NamedTuple):
+    """
+    An output field (or group of fields): the rules it reads and an extractor
+    called as ``extract(matches, game_data)``, where ``matches`` maps each rule
+    name to the first match (``first`` rules, or None) or a list of matches.
+    """
+    rules: Tuple[Rule, ...]
+    extract: Callable[[Dict[str, Any], dict], None]
+
+
+class ExtractionEngine:
+    """
+    Compiles field declarations into one dispatch table keyed by tag name and
+    class token, then fills every field from a single depth-first traversal of
+    the parse tree. Extractors only look at the elements they matched (and
+    their subtrees), never at the document root.
+    """
+    def __init__(self, fields: List[Field]):
+        self.fields = fields
+        self.rules: List[Rule] = [rule for field in fields for rule in field.rules]
+        scopes = sorted({rule.scope for rule in self.rules if rule.scope is not None}, key=repr)
+        self._scope_index = {scope: i for i, scope in enumerate(scopes)}
+
+        # Every selector (rule target or scope) is registered under its tag name,
+        # or under its first class when it matches any tag
+        self._by_tag: Dict[str, List[Tuple[str, Any]]] = {}
+        self._by_class: Dict[str, List[Tuple[str, Any]]] = {}
+        self._any: List[Tuple[str, Any]] = []
+        for rule in self.rules:
+            self._register(rule.target, ('rule', rule))
+        for scope, i in self._scope_index.items():
+            self._register(scope, ('scope', i))
+
+    def _register(self, selector: Selector, entry):
+        if selector.tag is not None:
+            self._by_tag.setdefault(selector.tag, []).append((selector, entry))
+        elif selector.classes:
+            self._by_class.setdefault(selector.classes[0], []).append((selector, entry))
+        else:
+            self._any.append((selector, entry))
+
+    def collect(self, soup: BeautifulSoup) -> Dict[str, list]:
+        """Walks the tree once and returns {rule name: [matching elements in document order]}."""
+        found: Dict[str, list] = {rule.name: [] for rule in self.rules}
+        open_scopes = [0] * len(self._scope_index)
+        by_tag, by_class, anywhere = self._by_tag, self._by_class, self._any
+        # (node, scopes opened by node) pairs; a None node marks where to close them
+        stack: List[Tuple[Any, Tuple[int, ...]]] = [(child, ()) for child in reversed(soup.contents)]
+        while stack:
+            node, closing = stack.pop()
+            if node is None:
+                for i in closing:
+                    open_scopes[i] -= 1
+                continue
+            if not isinstance(node, Tag):
+                continue
+
+            classes = node.get('class') or ()
+            candidates = by_tag.get(node.name, [])
+            for cls in (dict.fromkeys(classes) if len(classes) > 1 else classes):
+                candidates = candidates + by_class.get(cls, [])
+            if anywhere:
+                candidates = candidates + anywhere
+
+            opened = []
+            for selector, (kind, value) in candidates:
+                if not selector.matches(node, classes):
+                    continue
+                if kind == 'scope':
+                    opened.append(value)
+                elif value.scope is None or open_scopes[self._scope_index[value.scope]] > 0:
+                    found[value.name].append(node)
+            if opened:
+                # Scopes apply to descendants only, so open them after matching this node
+                opened = tuple(set(opened))
+                for i in opened:
+                    open_scopes[i] += 1
+                stack.append((None, opened))
+            stack.extend((child, ()) for child in reversed(node.contents))
+        return found
+
+    def extract(self, soup: BeautifulSoup) -> dict:
+        found = self.collect(soup)
+        game_data: dict = {}
+        for field in self.fields:
+            matches: Dict[str, Any] = {}
+            for rule in field.rules:
+                # Earlier extractors may have decomposed part of the tree
+                live = [el for el in found[rule.name] if not el.decomposed]
+                matches[rule.name] = (live[0] if live else None) if rule.first else live
+            field.extract(matches, game_data)
+        return game_data
+
+
+# --- Store page field declarations ---
+# Each extractor mirrors the corresponding block of the original root-level
+# find/select implementation so that the output is identical.
+
+def _text_or_none(element):
+    return element.get_text(strip=True) if element else None
+
+
+def _basic_info(m, game_data):
+    game_data['title'] = _text_or_none(m['title'])
+    game_data['header_image'] = m['header_image']['src'] if m['header_image'] else None
+    game_data['short_description'] = _text_or_none(m['short_description'])
+
+
+def _full_description(m, game_data):
+    element = m['full_description']
+    if element:
+        for child in element.select('.game_area_description_section_title, .responsive_button'):
+            child.decompose()
+        full_desc_text = element.get_text(strip=True)
+        reward_cutoff = full_desc_text.find("领取专属道具")
+        if reward_cutoff != -1:
+            full_desc_text = full_desc_text[:reward_cutoff]
+        game_data['full_description'] = full_desc_text.strip()
+    else:
+        game_data['full_description'] = None
+
+
+def _glance_details(m, game_data):
+    details_block = m['glance_ctn']
+    if not details_block:
+        return
+    for row in details_block.find_all('div', class_='dev_row'):
+        subtitle_div = row.find('div', class_='subtitle')
+        if not subtitle_div:
+            continue
+        subtitle = subtitle_div.get_text(strip=True)
+        summary = row.find('div', class_='summary')
+        if summary:
+            link = summary.find('a')
+            text = link.get_text(strip=True) if link else summary.get_text(strip=True)
+            url = link['href'] if link else None
+            if 'Developer' in subtitle or '开发者' in subtitle:
+                game_data['developer'] = {'name': text, 'link': url}
+            elif 'Publisher' in subtitle or '发行商' in subtitle:
+                game_data['publisher'] = {'name': text, 'link': url}
+
+    release_date_row = details_block.find('div', class_='release_date')
+    if release_date_row:
+        date_str = release_date_row.find('div', class_='date')
+        game_data['release_date'] = date_str.get_text(strip=True) if date_str else None
+
+
+def _media(m, game_data):
+    # One id -> element map instead of a root-level find per video
+    thumbs = {}
+    for thumb in m['video_thumbs']:
+        thumbs.setdefault(thumb['id'], thumb)
+    videos = []
+    for video in m['videos']:
+        video_id = video['id'].replace('highlight_movie_', '')
+        thumb_element = thumbs.get(f'thumb_movie_{video_id}')
+        thumb_img = thumb_element.find('img') if thumb_element else None
+        videos.append({
+            'title': video.get('data-video-title', ''),
+            'thumbnail': thumb_img['src'] if thumb_img else None,
+            'webm_source': video.get('data-webm-source', ''),
+            'mp4_source': video.get('data-mp4-source', '')
+        })
+    screenshots = [screenshot['href'] for screenshot in m['screenshots']]
+    game_data['media'] = {'videos': videos, 'screenshots': screenshots}
+
+
+def _price(m, game_data):
+    price_block = m['price_block']
+    if not price_block:
+        game_data['price'] = 'N/A'
+        return
+    price_element = price_block.find('div', class_='game_purchase_price')
+    if price_element:
+        game_data['price'] = price_element.get_text(strip=True)
+        return
+    discount_block = price_block.find('div', class_='discount_block')
+    if discount_block:
+        final_price = discount_block.find('div', class_='discount_final_price')
+        original_price = discount_block.find('div', class_='discount_original_price')
+        game_data['price'] = {
+            'discount_price': _text_or_none(final_price),
+            'original_price': _text_or_none(original_price),
+        }
+    else:
+        game_data['price'] = 'Free to Play'
+
+
+def _tags(m, game_data):
+    game_data['tags'] = [tag.get_text(strip=True) for tag in m['tags']]
+
+
+def _reviews(m, game_data):
+    reviews = {}
+    for row in m['review_rows']:
+        subtitle_div = row.find('div', class_='subtitle')
+        if not subtitle_div:
+            continue
+        subtitle = subtitle_div.get_text(strip=True)
+        summary_span = row.find('span', class_='game_review_summary')
+        review_key = 'recent' if 'Recent' in subtitle or '最近' in subtitle else 'all'
+        reviews[review_key] = {
+            'summary': _text_or_none(summary_span),
+            'tooltip': row.get('data-tooltip-html', '')
+        }
+    game_data['reviews'] = reviews
+
+
+def _system_requirements(m, game_data):
+    requirements = {}
+    for content in m['sys_req']:
+        os_name = content.get('data-os', 'other').lower()
+        reqs = {}
+        for li in content.select('ul.bb_ul li'):
+            strong = li.find('strong')
+            if strong:
+                key = strong.get_text(strip=True).lower().replace(':', '')
+                reqs[key] = li.get_text().replace(strong.get_text(), '').strip()
+        if reqs:
+            requirements[os_name] = reqs
+    game_data['system_requirements'] = requirements
+
+
+def _has_check(cell) -> bool:
+    text = cell.get_text()
+    return '✔' in text or '✓' in text
+
+
+def _language_support(m, game_data):
+    languages = []
+    lang_table = m['language_table']
+    if lang_table:
+        for row in lang_table.find_all('tr')[1:]:  # Skip header
+            cols = row.find_all('td')
+            if len(cols) == 4:
+                languages.append({
+                    'language': cols[0].get_text(strip=True),
+                    'interface': _has_check(cols[1]),
+                    'full_audio': _has_check(cols[2]),
+                    'subtitles': _has_check(cols[3])
+                })
+    game_data['language_support'] = languages
+
+
+def _metacritic(m, game_data):
+    metacritic_block = m['metacritic']
+    if metacritic_block:
+        score = metacritic_block.find('div', class_='score')
+        link = metacritic_block.find('a')
+        game_data['metacritic'] = {
+            'score': int(score.get_text(strip=True)) if score else None,
+            'url': link['href'] if link else None
+        }
+    else:
+        game_data['metacritic'] = None
+
+
+def _dlcs(m, game_data):
+    dlcs = []
+    for row in m['dlc_rows']:
+        name_element = row.find(class_='game_area_dlc_name')
+        price_div = row.find('div', class_='game_purchase_price') or row.find('div', class_='discount_final_price')
+        dlcs.append({
+            'name': _text_or_none(name_element),
+            'price': price_div.get_text(strip=True) if price_div else 'N/A'
+        })
+    game_data['dlcs'] = dlcs
+
+
+def _features(m, game_data):
+    game_data['features'] = [feature.get_text(strip=True) for feature in m['features']]
+
+
+def _content_descriptors(m, game_data):
+    descriptors = m['content_descriptors']
+    game_data['content_descriptors'] = list(descriptors.stripped_strings) if descriptors else []
+
+
+# Declared in output key order
+STORE_FIELDS: List[Field] = [
+    Field((Rule('title', Selector('div', ('apphub_AppName',)), first=True),
+           Rule('header_image', Selector('img', ('game_header_image_full',)), first=True),
+           Rule('short_description', Selector('div', ('game_description_snippet',)), first=True)), _basic_info),
+    Field((Rule('full_description', Selector('div', id='game_area_description'), first=True),), _full_description),
+    Field((Rule('glance_ctn', Selector('div', ('glance_ctn',)), first=True),), _glance_details),
+    Field((Rule('videos', Selector(classes=('highlight_player_item', 'highlight_movie'))),
+           Rule('video_thumbs', Selector('div', id_prefix='thumb_movie_')),
+           Rule('screenshots', Selector('a', ('highlight_screenshot_link',)))), _media),
+    Field((Rule('price_block', Selector('div', ('game_purchase_action',)), first=True),), _price),
+    Field((Rule('tags', Selector('a', ('app_tag',)), scope=Selector(classes=('glance_tags', 'popular_tags'))),), _tags),
+    Field((Rule('review_rows', Selector(classes=('user_reviews_summary_row',))),), _reviews),
+    Field((Rule('sys_req', Selector(classes=('game_area_sys_req',))),), _system_requirements),
+    Field((Rule('language_table', Selector('table', ('game_language_options',)), first=True),), _language_support),
+    Field((Rule('metacritic', Selector('div', id='game_area_metascore'), first=True),), _metacritic),
+    Field((Rule('dlc_rows', Selector(classes=('game_area_dlc_row',))),), _dlcs),
+    Field((Rule('features', Selector(classes=('label',)), scope=Selector(classes=('game_area_details_specs_ctn',))),), _features),
+    Field((Rule('content_descriptors', Selector('div', ('game_rating_descriptors',)), first=True),), _content_descriptors),
+]
+
+STORE_EXTRACTOR = ExtractionEngine(STORE_FIELDS)
@@ -0,0 +1,98 @@
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class SectionSpec(NamedTuple):
+    """
+    Identifies the element that contains everything ``_parse_game_details``
+    reads for a field. ``classes`` must all be present on the element.
+    """
+    tag: str
+    classes: Tuple[str, ...] = ()
+    id: Optional[str] = None
+
+
+# Output field -> the first element on the page that fully contains it
+STORE_SECTIONS: Dict[str, SectionSpec] = {
+    'title': SectionSpec('div', ('apphub_AppName',)),
+    'header_image': SectionSpec('img', ('game_header_image_full',)),
+    'short_description': SectionSpec('div', ('game_description_snippet',)),
+    'full_description': SectionSpec('div', id='game_area_description'),
+    'developer': SectionSpec('div', ('glance_ctn',)),
+    'publisher': SectionSpec('div', ('glance_ctn',)),
+    'release_date': SectionSpec('div', ('glance_ctn',)),
+    'media': SectionSpec('div', ('highlight_ctn',)),
+    'price': SectionSpec('div', ('game_purchase_action',)),
+    'tags': SectionSpec('div', ('glance_tags', 'popular_tags')),
+    'reviews': SectionSpec('div', ('glance_ctn',)),
+    'system_requirements': SectionSpec('div', ('game_page_autocollapse', 'sys_req')),
+    'language_support': SectionSpec('table', ('game_language_options',)),
+    'metacritic': SectionSpec('div', id='game_area_metascore'),
+    'dlcs': SectionSpec('div', id='gameAreaDLCSection'),
+    'features': SectionSpec('div', id='category_block'),
+    'content_descriptors': SectionSpec('div', ('game_rating_descriptors',)),
+}
+
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class StoreSectionTracker(HTMLParser):
+    """
+    Incrementally watches a store page as it arrives and reports when every
+    section needed for ``fields`` has been closed. Fields that are not store
+    page fields are ignored. A section that never appears keeps the tracker
+    incomplete, so the caller falls back to reading the whole page.
+    """
+    def __init__(self, fields: Iterable[str]):
+        super().__init__(convert_charrefs=False)
+        self.pending = {STORE_SECTIONS[field] for field in fields if field in STORE_SECTIONS}
+        self._open: List[list] = []  # [spec, depth of nested same-name tags]
+
+    @property
+    def complete(self) -> bool:
+        return not self.pending and not self._open
+
+    def _match(self, tag: str, attrs) -> Optional[SectionSpec]:
+        if not self.pending:
+            return None
+        attr_map = dict(attrs)
+        classes = set((attr_map.get('class') or '').split())
+        for spec in self.pending:
+            if spec.tag != tag:
+                continue
+            if spec.id is not None and attr_map.get('id') != spec.id:
+                continue
+            if not classes.issuperset(spec.classes):
+                continue
+            return spec
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        for entry in self._open:
+            if entry[0].tag == tag:
+                entry[1] += 1
+        spec = self._match(tag, attrs)
+        if spec is not None:
+            self.pending.discard(spec)
+            if tag not in _VOID_TAGS:
+                self._open.append([spec, 1])
+
+    def handle_startendtag(self, tag, attrs):
+        spec = self._match(tag, attrs)
+        if spec is not None:
+            self.pending.discard(spec)
+
+    def handle_endtag(self, tag):
+        if not self._open:
+            return
+        for entry in self._open:
+            if entry[0].tag == tag:
+                entry[1] -= 1
+        self._open = [entry for entry in self._open if entry[1] > 0]
+
+    def feed_chunk(self, text: str) -> bool:
+        """Feeds the next piece of the page and returns True once all sections are complete."""
+        if self.complete:
+            return True
+        self.feed(text)
+        return self.complete
@@ -0,0 +1,306 @@
+"""
+Store search listings as a cheap bulk refresh path.
+
+One ``/search/results`` request returns up to 100 listing rows, and each row
+already carries the title, release date, price, discount, review summary and
+tag IDs of one app. Rows are parsed by a small ``html.parser`` state machine
+(no tree is built) into records that use the store-html field names:
+
+    app_id            int, or None for bundle and package rows
+    item_key          the row's item key ("App_1245620", "Bundle_28631", ...)
+    title             str
+    release_date      str, as displayed ("24 Feb, 2022", "Coming soon")
+    price             "S$59.90" / "Free", {'discount_price', 'original_price'} when discounted, or 'N/A'
+    discount_percent  int (0 when not discounted)
+    reviews           {'all': {'summary', 'tooltip'}}, or {} for apps without reviews
+    tag_ids           the store tag IDs of the row (the app's top tags)
+    tags              tag names, only when the source is given a ``tag_names`` mapping
+"""
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional
+
+import requests
+import json
+import logging
+
+from .base import SteamDataSource
+from ..steam_utils.web_utils import DEFAULT_COOKIES, DEFAULT_HEADERS, get_proxies_from_env
+from ..steam_utils.proxy_pool import NoProxyAvailableError, ProxyPool
+from ..steam_utils.constants import STORE_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+# Steam caps ``count`` at 100 rows per request
+MAX_PAGE_SIZE = 100
+
+# Row elements whose text is captured, by class: tag name and record key
+_TEXT_FIELDS = {
+    'title': ('span', 'title'),
+    'search_released': ('div', 'release_date'),
+    'discount_original_price': ('div', 'original_price'),
+    'discount_final_price': ('div', 'final_price'),
+}
+
+
+class SearchPage(NamedTuple):
+    """One page of search results. Resume a listing by passing ``next_start`` back in."""
+    start: int
+    next_start: Optional[int]
+    total_count: int
+    rows: List[Dict[str, Any]]
+
+
+class _SearchRowParser(HTMLParser):
+    """
+    Collects the fields of ``a.search_result_row`` elements. The captured
+    elements hold plain text only, so a capture ends at the next end tag of
+    the same name.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[dict] = []
+        self._row: Optional[dict] = None
+        self._capture: Optional[tuple] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        if self._row is None:
+            if tag == 'a' and 'search_result_row' in classes:
+                self._start_row(attrs)
+            return
+        if tag == 'span' and 'search_review_summary' in classes:
+            summary, _, tooltip = (attrs.get('data-tooltip-html') or '').partition('<br>')
+            self._row['reviews'] = {'summary': summary.strip(), 'tooltip': tooltip.strip()}
+        elif tag == 'div' and 'discount_block' in classes:
+            self._row['discount_percent'] = _int(attrs.get('data-discount'))
+        for cls in classes:
+            field = _TEXT_FIELDS.get(cls)
+            if field and field[0] == tag:
+                self._capture, self._text = field, []
+                return
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if self._row is None:
+            return
+        if self._capture is not None and tag == self._capture[0]:
+            self._row[self._capture[1]] = ' '.join(''.join(self._text).split())
+            self._capture = None
+        elif tag == 'a':
+            self.rows.append(_to_record(self._row))
+            self._row = None
+
+    def _start_row(self, attrs: dict):
+        is_app = 'data-ds-bundleid' not in attrs and 'data-ds-packageid' not in attrs
+        try:
+            tag_ids = [int(tag_id) for tag_id in json.loads(attrs.get('data-ds-tagids') or '[]')]
+        except (ValueError, TypeError):
+            tag_ids = []
+        self._row = {
+            'app_id': _int(attrs.get('data-ds-appid'), None) if is_app else None,
+            'item_key': attrs.get('data-ds-itemkey'),
+            'tag_ids': tag_ids,
+        }
+
+
+def _int(value, default: Optional[int] = 0) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_record(row: dict) -> dict:
+    final_price = row.get('final_price')
+    original_price = row.get('original_price')
+    if original_price:
+        price = {'discount_price': final_price or None, 'original_price': original_price}
+    else:
+        price = final_price or 'N/A'
+    return {
+        'app_id': row['app_id'],
+        'item_key': row['item_key'],
+        'title': row.get('title'),
+        'release_date': row.get('release_date') or None,
+        'price': price,
+        'discount_percent': row.get('discount_percent', 0),
+        'reviews': {'all': row['reviews']} if row.get('reviews') else {},
+        'tag_ids': row['tag_ids'],
+    }
+
+
+def parse_search_rows(html: str, tag_names: Optional[Mapping[int, str]] = None) -> List[dict]:
+    """
+    Parses the ``results_html`` of a search response into one record per row,
+    bundles and packages included (their ``app_id`` is None). With
+    ``tag_names`` ({tag_id: name}), records also get ``tags``.
+    """
+    parser = _SearchRowParser()
+    parser.feed(html)
+    parser.close()
+    if tag_names is not None:
+        for record in parser.rows:
+            record['tags'] = [tag_names[tag_id] for tag_id in record['tag_ids'] if tag_id in tag_names]
+    return parser.rows
+
+
+class StoreSearchDataSource(SteamDataSource):
+    """
+    Pages through the store search listing (the ``infinite=1`` JSON endpoint
+    behind the search page's infinite scroll).
+
+    Refreshing the price and review summary of an app from its store page
+    costs one page download and a full parse; a listing page refreshes up to
+    100 apps with one request. Pages are yielded as they arrive, and while the
+    caller consumes one page the next is already being fetched.
+    """
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, store_url: str = STORE_BASE_URL,
+                 session: Optional[requests.Session] = None, page_size: int = 50, prefetch: bool = True,
+                 tag_names: Optional[Mapping[int, str]] = None):
+        """
+        Args:
+            proxy_pool: Optional proxy pool to route listing requests through.
+            store_url: Base URL of the store (e.g. a local mock server).
+            session: Optional session shared with other sources (connection pool, rate limit).
+            page_size: Rows requested per page (at most 100).
+            prefetch: Fetch the next page while the caller consumes the current one.
+            tag_names: Optional {tag_id: name} mapping used to fill in ``tags``.
+        """
+        self.proxy_pool = proxy_pool
+        self.session = session
+        self.search_url = f"{store_url.rstrip('/')}/search/results/"
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.prefetch = prefetch
+        self.tag_names = tag_names
+
+    def _fetch_page(self, term: str, start: int, lang: str, cc: Optional[str], filters: dict) -> Optional[Dict[str, Any]]:
+        params = {'term': term, 'start': start, 'count': self.page_size, 'infinite': 1, 'l': lang, **filters}
+        if cc:
+            params['cc'] = cc
+
+        lease = None
+        if self.proxy_pool is not None:
+            try:
+                lease = self.proxy_pool.acquire()
+            except NoProxyAvailableError as e:
+                logger.error(f"Error fetching search results (start {start}): {e}")
+                return None
+            proxies = lease.proxies
+        else:
+            proxies = get_proxies_from_env()
+
+        logger.info(f"Fetching search results for '{term}' (start {start})")
+        success = False
+        try:
+            response = (self.session or requests).get(self.search_url, params=params, headers=dict(DEFAULT_HEADERS),
+                                                      cookies=dict(DEFAULT_COOKIES), timeout=10, proxies=proxies)
+            response.raise_for_status()
+            success = True
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching search results (start {start}): {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding search results (start {start}): {e}")
+            return None
+        finally:
+            if lease:
+                lease.release(success=success)
+
+        if not data or data.get('success') != 1:
+            logger.error(f"Search request was unsuccessful (start {start}).")
+            return None
+        return data
+
+    def iter_pages(self, term: str = '', start: int = 0, lang: str = 'english', cc: Optional[str] = None,
+                   **filters) -> Iterator[SearchPage]:
+        """
+        Yields listing pages from offset ``start`` until the end of the results
+        or a request error; in the latter case the listing can be resumed from
+        the last page's ``next_start``. An empty ``term`` lists the whole
+        catalog. Extra keyword arguments are passed on as search filters
+        (e.g. ``category1='998'`` for games only, ``specials=1``).
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='search-prefetch')
+        try:
+            future = executor.submit(self._fetch_page, term, start, lang, cc, filters)
+            while True:
+                data = future.result()
+                if data is None:
+                    return
+                rows = parse_search_rows(data.get('results_html') or '', self.tag_names)
+                total_count = _int(data.get('total_count'))
+                next_start = start + len(rows)
+                last_page = not rows or next_start >= total_count
+                if not last_page and self.prefetch:
+                    future = executor.submit(self._fetch_page, term, next_start, lang, cc, filters)
+                yield SearchPage(start, None if last_page else next_start, total_count, rows)
+                if last_page:
+                    return
+                if not self.prefetch:
+                    future = executor.submit(self._fetch_page, term, next_start, lang, cc, filters)
+                start = next_start
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_apps(self, term: str = '', max_results: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the app rows of the listing (bundles and packages are skipped),
+        stopping after ``max_results`` if given. Accepts the same keyword
+        arguments as ``iter_pages``.
+        """
+        count = 0
+        pages = self.iter_pages(term, **kwargs)
+        try:
+            for page in pages:
+                for record in page.rows:
+                    if record['app_id'] is None:
+                        continue
+                    if max_results is not None and count >= max_results:
+                        return
+                    count += 1
+                    yield record
+        finally:
+            pages.close()
+
+    def get_data(self, identifier, **kwargs):
+        """
+        Lists up to ``max_results`` (default 100) apps matching the search term
+        ``identifier``. Returns {'total_count', 'apps', 'next_start'}, where
+        ``next_start`` resumes after the returned apps (None at the end of the
+        results). Use ``iter_apps`` or ``iter_pages`` to stream the whole catalog.
+        """
+        max_results = kwargs.pop('max_results', 100)
+        kwargs.pop('fields', None)
+        apps = []
+        total_count = None
+        next_start = None
+        pages = self.iter_pages(str(identifier), **kwargs)
+        try:
+            for page in pages:
+                total_count = page.total_count
+                next_start = page.next_start
+                for i, record in enumerate(page.rows):
+                    if len(apps) >= max_results:
+                        next_start = page.start + i
+                        break
+                    if record['app_id'] is not None:
+                        apps.append(record)
+                if len(apps) >= max_results:
+                    break
+        finally:
+            pages.close()
+
+        if total_count is None:
+            return None
+        return {'total_count': total_count, 'apps': apps, 'next_start': next_start}
+
+    def parse_static_content(self, content: str, **kwargs):
+        """Parses the ``results_html`` of a search response (see ``parse_search_rows``)."""
+        return parse_search_rows(content, self.tag_names)
@@ -0,0 +1,17 @@
+"""
+Steam Index - In-memory inverted index and query engine over scraped records
+"""
+
+from .game_index import And, GameIndex, Not, Or, Query, Range, Term, parse_price, parse_release_date
+
+__all__ = [
+    'GameIndex',
+    'Query',
+    'Term',
+    'Range',
+    'And',
+    'Or',
+    'Not',
+    'parse_price',
+    'parse_release_date',
+]
@@ -0,0 +1,408 @@
+import bisect
+import functools
+import json
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Facets with one posting list per distinct value
+FACETS = (
+    'tag',
+    'feature',
+    'developer',
+    'publisher',
+    'language',            # any support (interface, audio or subtitles)
+    'interface_language',
+    'audio_language',
+    'subtitle_language',
+    'recent_reviews',      # review summary text, e.g. "Mostly Positive"
+    'all_reviews',
+)
+
+# Sorted numeric columns usable in Range queries and for sorting
+COLUMNS = ('price', 'release_date')
+
+_PRICE_NUMBER = re.compile(r'\d[\d,.\s]*')
+_DATE_FORMATS = ('%d %b, %Y', '%b %d, %Y', '%d %B, %Y', '%B %d, %Y', '%Y-%m-%d', '%Y 年 %m 月 %d 日', '%Y年%m月%d日')
+
+
+@functools.lru_cache(maxsize=65536)  # Tag/language/review values repeat across records
+def _norm(value: str) -> str:
+    return ' '.join(value.split()).casefold()
+
+
+def parse_price(record: dict) -> Optional[float]:
+    """
+    Returns the current price of a record in currency units, 0.0 for free games,
+    or None if it is unknown. Prefers the API's ``price_overview`` (in cents)
+    over the store page's display string.
+    """
+    overview = record.get('price_overview')
+    if isinstance(overview, dict) and isinstance(overview.get('final'), int):
+        return overview['final'] / 100
+    if record.get('is_free'):
+        return 0.0
+    price = record.get('price')
+    if isinstance(price, dict):
+        price = price.get('discount_price') or price.get('original_price')
+    if not isinstance(price, str):
+        return None
+    match = _PRICE_NUMBER.search(price)
+    if not match:
+        return 0.0 if 'free' in price.casefold() or '免费' in price else None
+    number = re.sub(r'\s', '', match.group()).rstrip('.,')
+    # "1.234,56" and "1,234.56" both mean 1234.56; a lone separator followed by
+    # exactly two digits is a decimal point
+    if ',' in number and '.' in number:
+        decimal = max(number.rfind(','), number.rfind('.'))
+        number = re.sub(r'[.,]', '', number[:decimal]) + '.' + number[decimal + 1:]
+    elif ',' in number:
+        head, _, tail = number.rpartition(',')
+        number = head.replace(',', '') + ('.' if len(tail) == 2 else '') + tail
+    elif number.count('.') > 1 or (number.count('.') == 1 and len(number.rpartition('.')[2]) == 3):
+        number = number.replace('.', '')
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def parse_release_date(record: dict) -> Optional[int]:
+    """Returns the release date as a proleptic ordinal (``date.toordinal``), or None."""
+    value = record.get('release_date')
+    if isinstance(value, dict):  # API shape: {'coming_soon': bool, 'date': str}
+        value = value.get('date')
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def _names(value: Any) -> List[str]:
+    """Developer/publisher may be {'name': ...} (store page) or a list of names (API)."""
+    if isinstance(value, dict):
+        value = value.get('name')
+    if isinstance(value, str):
+        return [value] if value else []
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str) and v]
+    return []
+
+
+def extract_terms(record: dict) -> Set[Tuple[str, str]]:
+    """Returns the (facet, normalized value) pairs a record is indexed under."""
+    terms = set()
+    for tag in record.get('tags') or []:
+        if isinstance(tag, str):
+            terms.add(('tag', _norm(tag)))
+    for feature in record.get('features') or []:
+        if isinstance(feature, str):
+            terms.add(('feature', _norm(feature)))
+    for facet in ('developer', 'publisher'):
+        # Store pages give {'name': ...}; the API gives a 'developers'/'publishers' list
+        for name in _names(record.get(facet)) + _names(record.get(facet + 's')):
+            terms.add((facet, _norm(name)))
+    for entry in record.get('language_support') or []:
+        if not isinstance(entry, dict) or not entry.get('language'):
+            continue
+        name = _norm(entry['language'])
+        for key, facet in (('interface', 'interface_language'), ('full_audio', 'audio_language'), ('subtitles', 'subtitle_language')):
+            if entry.get(key):
+                terms.add((facet, name))
+                terms.add(('language', name))
+    reviews = record.get('reviews') or {}
+    for key, facet in (('recent', 'recent_reviews'), ('all', 'all_reviews')):
+        summary = (reviews.get(key) or {}).get('summary') if isinstance(reviews, dict) else None
+        if summary:
+            terms.add((facet, _norm(summary)))
+    return terms
+
+
+def _bitmap(docs: Iterable[int]) -> int:
+    """Builds an int bitmap from doc ids in O(max doc id / 8) bytes of work."""
+    docs = list(docs)
+    if not docs:
+        return 0
+    buf = bytearray(max(docs) // 8 + 1)
+    for doc in docs:
+        buf[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _iter_bits(bitmap: int) -> Iterator[int]:
+    """Yields the set bit positions of ``bitmap`` in ascending order."""
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(raw):
+        while byte:
+            low = byte & -byte
+            yield (byte_index << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class _Posting:
+    """A posting list: the set of doc ids plus a lazily built bitmap of it."""
+    __slots__ = ('docs', 'bitmap')
+
+    def __init__(self):
+        self.docs: Set[int] = set()
+        self.bitmap: Optional[int] = None
+
+    def add(self, doc: int):
+        self.docs.add(doc)
+        if self.bitmap is not None:
+            self.bitmap |= 1 << doc
+
+    def discard(self, doc: int):
+        self.docs.discard(doc)
+        if self.bitmap is not None:
+            self.bitmap &= ~(1 << doc)
+
+    def as_bitmap(self) -> int:
+        if self.bitmap is None:
+            self.bitmap = _bitmap(self.docs)
+        return self.bitmap
+
+
+class Query:
+    """Base class of query expressions; combine with ``&``, ``|`` and ``~``."""
+    def __and__(self, other: 'Query') -> 'Query':
+        return And(self, other)
+
+    def __or__(self, other: 'Query') -> 'Query':
+        return Or(self, other)
+
+    def __invert__(self) -> 'Query':
+        return Not(self)
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        raise NotImplementedError
+
+
+class Term(Query):
+    """Matches records indexed under ``facet`` = ``value`` (case-insensitive)."""
+    def __init__(self, facet: str, value: str):
+        if facet not in FACETS:
+            raise ValueError(f"Unknown facet '{facet}'. Expected one of {FACETS}")
+        self.facet = facet
+        self.value = _norm(value)
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        posting = index._postings.get((self.facet, self.value))
+        return posting.as_bitmap() if posting else 0
+
+    def __repr__(self):
+        return f"Term({self.facet!r}, {self.value!r})"
+
+
+class Range(Query):
+    """
+    Matches records whose ``column`` value lies in [low, high]; either bound may
+    be None. ``release_date`` bounds may be given as ``datetime.date``.
+    """
+    def __init__(self, column: str, low: Any = None, high: Any = None):
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column '{column}'. Expected one of {COLUMNS}")
+        self.column = column
+        self.low = low.toordinal() if isinstance(low, date) else low
+        self.high = high.toordinal() if isinstance(high, date) else high
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        return index._columns[self.column].range_bitmap(self.low, self.high)
+
+    def __repr__(self):
+        return f"Range({self.column!r}, {self.low!r}, {self.high!r})"
+
+
+class And(Query):
+    def __init__(self, *parts: Query):
+        self.parts = parts
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        result = None
+        for part in self.parts:
+            bitmap = part.evaluate(index)
+            result = bitmap if result is None else result & bitmap
+            if not result:
+                break
+        return result or 0
+
+
+class Or(Query):
+    def __init__(self, *parts: Query):
+        self.parts = parts
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        result = 0
+        for part in self.parts:
+            result |= part.evaluate(index)
+        return result
+
+
+class Not(Query):
+    def __init__(self, part: Query):
+        self.part = part
+
+    def evaluate(self, index: 'GameIndex') -> int:
+        return index._alive.as_bitmap() & ~self.part.evaluate(index)
+
+
+class _SortedColumn:
+    """
+    A numeric column kept as a sorted list of (value, doc) pairs. The list is
+    built on first use, so bulk loading does not pay for repeated inserts, and
+    kept sorted incrementally afterwards.
+    """
+    def __init__(self):
+        self.values: Dict[int, float] = {}
+        self._entries: Optional[List[Tuple[float, int]]] = None
+        self._cache: Dict[Tuple[Any, Any], int] = {}
+
+    @property
+    def entries(self) -> List[Tuple[float, int]]:
+        if self._entries is None:
+            self._entries = sorted((value, doc) for doc, value in self.values.items())
+        return self._entries
+
+    def set(self, doc: int, value: Optional[float]):
+        self.remove(doc)
+        if value is not None:
+            self.values[doc] = value
+            if self._entries is not None:
+                bisect.insort(self._entries, (value, doc))
+            self._cache.clear()
+
+    def remove(self, doc: int):
+        old = self.values.pop(doc, None)
+        if old is not None:
+            if self._entries is not None:
+                del self._entries[bisect.bisect_left(self._entries, (old, doc))]
+            self._cache.clear()
+
+    def range_bitmap(self, low, high) -> int:
+        key = (low, high)
+        if key not in self._cache:
+            entries = self.entries
+            start = 0 if low is None else bisect.bisect_left(entries, (low, -1))
+            end = len(entries) if high is None else bisect.bisect_right(entries, (high, float('inf')))
+            if len(self._cache) >= 256:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = _bitmap(doc for _, doc in entries[start:end])
+        return self._cache[key]
+
+
+class GameIndex:
+    """
+    In-memory inverted index over scraper records (store-html, API or combined).
+
+    Every record gets a dense doc id. Each (facet, value) pair - tag, feature,
+    developer, publisher, language capability, review summary - has a posting
+    list that is materialised as an int bitmap on first use, so boolean queries
+    are a handful of big-int AND/OR operations. Price and release date are kept
+    as sorted columns for range queries and ordering.
+
+    Records can be added, replaced and removed at any time; only the affected
+    postings are updated.
+
+    Example:
+        index.search(Term('tag', 'Roguelike') & Term('audio_language', 'Japanese')
+                     & Term('recent_reviews', 'Mostly Positive') & Range('price', high=20))
+    """
+    def __init__(self):
+        self._doc_of: Dict[int, int] = {}
+        self._app_of: List[Optional[int]] = []
+        self._terms_of: List[Set[Tuple[str, str]]] = []
+        self._postings: Dict[Tuple[str, str], _Posting] = {}
+        self._columns = {column: _SortedColumn() for column in COLUMNS}
+        self._alive = _Posting()
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def __contains__(self, app_id) -> bool:
+        return int(app_id) in self._doc_of
+
+    def add(self, app_id, record: dict):
+        """Indexes ``record`` under ``app_id``, replacing any earlier version."""
+        app_id = int(app_id)
+        terms = extract_terms(record)
+        doc = self._doc_of.get(app_id)
+        if doc is None:
+            doc = len(self._app_of)
+            self._doc_of[app_id] = doc
+            self._app_of.append(app_id)
+            self._terms_of.append(set())
+            self._alive.add(doc)
+        old_terms = self._terms_of[doc]
+        for term in old_terms - terms:
+            self._postings[term].discard(doc)
+        for term in terms - old_terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = _Posting()
+            posting.add(doc)
+        self._terms_of[doc] = terms
+        self._columns['price'].set(doc, parse_price(record))
+        self._columns['release_date'].set(doc, parse_release_date(record))
+
+    def add_many(self, items: Iterable[Tuple[Any, dict]]) -> int:
+        count = 0
+        for app_id, record in items:
+            self.add(app_id, record)
+            count += 1
+        return count
+
+    def remove(self, app_id) -> bool:
+        """Removes a record from the index. Its doc id is not reused."""
+        doc = self._doc_of.pop(int(app_id), None)
+        if doc is None:
+            return False
+        for term in self._terms_of[doc]:
+            self._postings[term].discard(doc)
+        self._terms_of[doc] = set()
+        self._app_of[doc] = None
+        self._alive.discard(doc)
+        for column in self._columns.values():
+            column.remove(doc)
+        return True
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> 'GameIndex':
+        """Builds an index from a JSON-lines file of ``{"id": ..., "data": {...}}`` objects (JsonLinesSink output)."""
+        index = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            index.add_many((entry['id'], entry['data']) for entry in map(json.loads, f) if entry.get('data'))
+        return index
+
+    def values(self, facet: str) -> Dict[str, int]:
+        """Returns {normalized value: record count} for a facet."""
+        return {value: len(posting.docs) for (f, value), posting in self._postings.items() if f == facet and posting.docs}
+
+    def count(self, query: Query) -> int:
+        return query.evaluate(self).bit_count()
+
+    def search(self, query: Query, sort_by: Optional[str] = None, descending: bool = False,
+               limit: Optional[int] = None) -> List[int]:
+        """
+        Returns the App IDs matching ``query``, in insertion order or ordered by
+        a column (records without a value for that column sort last).
+        """
+        bitmap = query.evaluate(self)
+        if sort_by is None:
+            app_ids = []
+            for doc in _iter_bits(bitmap):
+                app_ids.append(self._app_of[doc])
+                if limit is not None and len(app_ids) >= limit:
+                    break
+            return app_ids
+
+        column = self._columns[sort_by]
+        matched = set(_iter_bits(bitmap))
+        ordered = reversed(column.entries) if descending else column.entries
+        app_ids = [self._app_of[doc] for _, doc in ordered if doc in matched]
+        app_ids.extend(self._app_of[doc] for doc in sorted(matched - column.values.keys()))
+        return app_ids if limit is None else app_ids[:limit]
@@ -2,11 +2,37 @@
 Steam Utils - Utility functions and constants for Steam scraping
 """
 
+from .lazy import lazy_exports
+
 from .constants import *
 from .utils import *
-from .web_utils import *
+
+# web_utils pulls in ``requests``; its names are resolved on first access instead
+_LAZY_MODULES = {
+    'web_utils': '.web_utils',
+}
+_LAZY_EXPORTS = {
+    'DEFAULT_USER_AGENT': '.web_utils',
+    'DEFAULT_COOKIES': '.web_utils',
+    'DEFAULT_HEADERS': '.web_utils',
+    'get_proxies_from_env': '.web_utils',
+    'fetch_steam_store_html': '.web_utils',
+    'stream_steam_store_html': '.web_utils',
+    'StreamedHtml': '.web_utils',
+    'SharedSession': '.web_utils',
+    'TokenBucket': '.rate_limit',
+    'SharedCache': '.shared_cache',
+    'NegativeCache': '.negative_cache',
+    'PriorityLanes': '.priority_lanes',
+    'fetch_lane': '.priority_lanes',
+    'WireEncoder': '.wire_format',
+    'WireDecoder': '.wire_format',
+}
 
 __all__ = [
     # 这里可以根据实际的函数和类来添加
     # 例如：'get_steam_url', 'parse_steam_data', 等等
 ]
+
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_EXPORTS, _LAZY_MODULES)
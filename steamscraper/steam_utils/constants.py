@@ -1,3 +1,5 @@
+STORE_BASE_URL = "https://store.steampowered.com"
+
 # This file contains the languages supported by Steam, as documented at:
 # https://partner.steamgames.com/doc/store/localization/languages
 
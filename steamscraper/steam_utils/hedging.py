@@ -0,0 +1,165 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """Keeps the last ``window`` latencies (seconds) in a ring buffer and answers percentile queries."""
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=window)
+        self._sorted: Optional[list] = None
+
+    def record(self, latency: float):
+        with self._lock:
+            self._recent.append(latency)
+            self._sorted = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._recent)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self._recent:
+                return None
+            if self._sorted is None:
+                self._sorted = sorted(self._recent)
+            index = min(len(self._sorted) - 1, max(0, round(pct / 100 * len(self._sorted)) - 1))
+            return self._sorted[index]
+
+
+class Hedger:
+    """
+    Hedged requests: if an attempt has not finished after the ``percentile``-th
+    latency of recent attempts, a second attempt is started and whichever
+    succeeds first wins. The loser is told to stop through the ``cancel`` event
+    passed to every attempt (an attempt returns ``None`` when it fails).
+
+    Hedges are paid for from a budget: every call earns ``budget`` tokens and a
+    hedge spends one, so at most ``budget`` of all calls are hedged (5% by
+    default). Until ``min_samples`` latencies have been seen nothing is hedged.
+    ``min_delay`` keeps very fast endpoints from being hedged on noise.
+
+    Each Hedger runs attempts on its own thread pool; whoever creates one
+    closes it (or uses it as a context manager).
+
+    Usage:
+        with Hedger() as hedger:
+            html = hedger.call(lambda cancel: fetch_steam_store_html(url, cancel=cancel))
+    """
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05, window: int = 1000, min_samples: int = 20,
+                 min_delay: float = 0.01, max_workers: int = 64, clock: Callable[[], float] = time.perf_counter):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window)
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+        self._lock = threading.Lock()
+        # Start with enough tokens for one hedge so a cold process can still hedge its first outlier
+        self._tokens = 1.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.saved_seconds = 0.0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a call is hedged, or None while there are too few samples."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def _try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedged += 1
+                return True
+            return False
+
+    def _start(self, fn: Callable[[threading.Event], Any], is_hedge: bool = False):
+        cancel = threading.Event()
+        started = self._clock()
+
+        def attempt():
+            result = fn(cancel)
+            # A cancelled primary was slow (its time is a lower bound, still worth
+            # recording); a cancelled hedge was merely late and would skew the tracker low
+            if not (is_hedge and cancel.is_set()):
+                self.latencies.record(self._clock() - started)
+            return result, self._clock()
+
+        # Run in the caller's context so the attempt stays in its fetch lane
+        return self._executor.submit(contextvars.copy_context().run, attempt), cancel
+
+    def call(self, fn: Callable[[threading.Event], Any]) -> Any:
+        """
+        Runs ``fn(cancel)`` and, if it is slow, a hedged copy of it. Returns the
+        first non-None result (None if every attempt failed).
+        """
+        with self._lock:
+            self.calls += 1
+            self._tokens = min(10.0, self._tokens + self.budget)
+        delay = self.hedge_delay()
+        primary, primary_cancel = self._start(fn)
+        if delay is None or wait([primary], timeout=delay).done or not self._try_spend():
+            return primary.result()[0]
+
+        hedge, hedge_cancel = self._start(fn, is_hedge=True)
+        attempts: Dict[Future, threading.Event] = {primary: primary_cancel, hedge: hedge_cancel}
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                result, finished = future.result()
+                if result is None:
+                    continue
+                for loser in pending:
+                    attempts[loser].set()
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                    # The primary stops at its next chunk; until then it is still
+                    # "in flight", so this is a lower bound of the time saved
+                    primary.add_done_callback(lambda f, won_at=finished: self._add_saving(f, won_at))
+                return result
+        if error is not None:
+            raise error
+        return None
+
+    def _add_saving(self, primary: Future, won_at: float):
+        if primary.exception() is None:
+            with self._lock:
+                self.saved_seconds += max(0.0, primary.result()[1] - won_at)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedge_rate': self.hedged / self.calls if self.calls else 0.0,
+                'hedge_wins': self.hedge_wins,
+                'saved_seconds': self.saved_seconds,
+            }
+        stats['hedge_delay'] = self.hedge_delay()
+        return stats
+
+    def close(self):
+        """Shuts down the attempt threads; attempts still running are not waited for."""
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,35 @@
+import importlib
+import sys
+from typing import Callable, Mapping, Optional, Tuple
+
+
+def lazy_exports(package: str, mapping: Mapping[str, str],
+                 modules: Optional[Mapping[str, str]] = None) -> Tuple[Callable[[str], object], Callable[[], list]]:
+    """
+    Builds the module-level ``__getattr__`` and ``__dir__`` (PEP 562) of the
+    package named ``package``. ``mapping`` maps each lazily exported name to
+    the module that defines it (relative to the package); ``modules`` maps
+    names of submodules that are only imported on first access.
+
+    A resolved name is stored in the package namespace, so ``__getattr__``
+    runs once per name.
+
+    Usage (in a package ``__init__``):
+        __getattr__, __dir__ = lazy_exports(__name__, {'SharedCache': '.shared_cache'})
+    """
+    modules = modules or {}
+
+    def __getattr__(name):
+        if name in modules:
+            return importlib.import_module(modules[name], package)
+        module_name = mapping.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(mapping) | set(modules))
+
+    return __getattr__, __dir__
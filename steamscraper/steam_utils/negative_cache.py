@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from .cache import TTLCache
+
+# Why an app could not be fetched; these outcomes repeat on every request until the app changes
+REDIRECT_HOME = 'redirect_home'    # Store page redirects to the store front (delisted or region-locked)
+AGE_CHECK = 'agecheck'             # Store page is an age gate the default cookies do not pass
+NOT_FOUND = 'not_found'            # Store page answers 404
+UNSUCCESSFUL = 'unsuccessful'      # appdetails answers ``success: false``
+
+REASONS = (REDIRECT_HOME, AGE_CHECK, NOT_FOUND, UNSUCCESSFUL)
+
+# Marks an age gate served in place of the store page (without a redirect)
+_AGECHECK_MARKERS = ('id="app_agegate"', "id='app_agegate'", 'agecheck_form')
+
+
+def classify_store_response(response) -> Optional[str]:
+    """
+    Classifies the final response (after redirects) of a store page request as
+    one of the dead-app reasons, or returns None for an ordinary page.
+    """
+    if response.status_code == 404:
+        return NOT_FOUND
+    if not response.history:
+        return None
+    path = urlparse(response.url).path
+    if path.startswith('/agecheck'):
+        return AGE_CHECK
+    if path in ('', '/'):
+        return REDIRECT_HOME
+    return None
+
+
+def is_agecheck_page(html: str) -> bool:
+    return any(marker in html for marker in _AGECHECK_MARKERS)
+
+
+class NegativeCache:
+    """
+    Remembers apps that a source could not fetch for a known, repeatable reason
+    (see ``REASONS``) so that lookups for them are skipped without a request
+    until ``ttl`` (or the per-reason TTL in ``ttls``) has passed.
+
+    Entries are kept per source (``'store_html'``, ``'appdetails'``) and
+    region, since an age-gated page usually still has appdetails and a
+    region-locked app may be available with another ``cc``. With
+    ``shared_cache`` (a SharedCache) entries are also shared between processes.
+    """
+    def __init__(self, maxsize: int = 100000, ttl: Optional[float] = 86400.0, ttls: Optional[Dict[str, float]] = None,
+                 shared_cache=None, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.shared_cache = shared_cache
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl, clock=clock)
+        self._lock = threading.Lock()
+        self.recorded: Counter = Counter()
+        self.skipped: Counter = Counter()
+
+    @staticmethod
+    def _key(source: str, app_id, region: str) -> str:
+        return f"negative:{source}:{region.lower()}:{app_id}"
+
+    def check(self, source: str, app_id, region: str = '') -> Optional[str]:
+        """Returns the reason ``app_id`` is known to be unavailable from ``source`` (and counts a skip), else None."""
+        key = self._key(source, app_id, region)
+        reason = self._entries.get(key)
+        if reason is None and self.shared_cache is not None:
+            reason = self.shared_cache.get(key)
+            if reason is not None:
+                self._entries.set(key, reason)
+        if reason is not None:
+            with self._lock:
+                self.skipped[(source, reason)] += 1
+        return reason
+
+    def record(self, source: str, app_id, reason: str, region: str = ''):
+        key = self._key(source, app_id, region)
+        ttl = self.ttls.get(reason, self.ttl)
+        self._entries.set(key, reason, ttl=ttl)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, reason, ttl=ttl)
+        with self._lock:
+            self.recorded[reason] += 1
+
+    def forget(self, source: str, app_id, region: str = ''):
+        key = self._key(source, app_id, region)
+        self._entries.pop(key)
+        if self.shared_cache is not None:
+            self.shared_cache.delete(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            skipped = dict(self.skipped)
+            recorded = dict(self.recorded)
+        by_reason: Counter = Counter()
+        by_source: Counter = Counter()
+        for (source, reason), count in skipped.items():
+            by_reason[reason] += count
+            by_source[source] += count
+        return {
+            'entries': len(self._entries),
+            'recorded': recorded,
+            'skipped': sum(skipped.values()),
+            'skipped_by_reason': dict(by_reason),
+            'skipped_by_source': dict(by_source),
+        }
@@ -0,0 +1,183 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+
+from .hedging import LatencyTracker
+from .rate_limit import TokenBucket
+
+INTERACTIVE = 'interactive'
+CRAWL = 'crawl'
+
+
+class LaneConfig(NamedTuple):
+    """``weight``: share of the rate limit while lanes compete; ``reserved``: slots no other lane may use."""
+    weight: float = 1.0
+    reserved: int = 0
+
+
+# Interactive lookups get 8 of every 9 grants while a crawl is backlogged and two slots of their own
+DEFAULT_LANES: Dict[str, LaneConfig] = {
+    INTERACTIVE: LaneConfig(weight=8.0, reserved=2),
+    CRAWL: LaneConfig(weight=1.0),
+}
+
+_current_lane: contextvars.ContextVar = contextvars.ContextVar('steamscraper_fetch_lane', default=None)
+
+
+@contextmanager
+def fetch_lane(name: str) -> Iterator[None]:
+    """
+    Runs the enclosed fetches in lane ``name``. The lane follows the context,
+    so it applies to every request made by this thread (and by work it hands to
+    executors that copy the context, like Hedger and CombinedSteamDataSource).
+    """
+    token = _current_lane.set(name)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane() -> Optional[str]:
+    return _current_lane.get()
+
+
+def submit_in_context(executor, fn: Callable, *args, **kwargs):
+    """``executor.submit`` that runs ``fn`` in a copy of the caller's context (and so in its fetch lane)."""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class _Lane:
+    def __init__(self, name: str, config: LaneConfig, wait_window: int):
+        self.name = name
+        self.weight = config.weight
+        self.reserved = config.reserved
+        self.queue: deque = deque()
+        self.in_flight = 0
+        self.vtime = 0.0
+        self.granted = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+        self.waits = LatencyTracker(wait_window)
+
+
+class PriorityLanes:
+    """
+    Admission control for outgoing requests with one queue per priority lane.
+
+    Every request waits in its lane's queue for a concurrency slot and, with
+    ``rate_limiter``, a token. When several lanes are waiting, the next grant
+    goes to the lane with the lowest virtual time (start-time fair queuing):
+    each grant advances a lane by ``1 / weight``, so backlogged lanes share the
+    rate limit and the slots in proportion to their weights, and a lane that
+    was idle rejoins at the current virtual time instead of spending saved-up
+    credit. A lane's ``reserved`` slots can only be used by that lane, so an
+    interactive lookup never waits for a crawl to free a connection.
+
+    Usage:
+        lanes = PriorityLanes(max_concurrency=16, rate_limiter=TokenBucket(5))
+        session = SharedSession(lanes=lanes)
+        with fetch_lane(CRAWL):
+            ...  # background fetches through ``session``
+    """
+    def __init__(self, lanes: Optional[Dict[str, LaneConfig]] = None, max_concurrency: int = 16,
+                 rate_limiter: Optional[TokenBucket] = None, default_lane: str = INTERACTIVE, wait_window: int = 1000):
+        lanes = dict(DEFAULT_LANES if lanes is None else lanes)
+        if default_lane not in lanes:
+            raise ValueError(f"default lane {default_lane!r} is not configured")
+        if any(config.weight <= 0 for config in lanes.values()):
+            raise ValueError("lane weights must be positive")
+        if sum(config.reserved for config in lanes.values()) > max_concurrency:
+            raise ValueError("reserved slots exceed max_concurrency")
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.default_lane = default_lane
+        self._lanes = {name: _Lane(name, config, wait_window) for name, config in lanes.items()}
+        self._shared_slots = max_concurrency - sum(config.reserved for config in lanes.values())
+        self._vclock = 0.0
+        self._tickets = 0
+        self._cond = threading.Condition()
+
+    def _lane(self, name: Optional[str]) -> _Lane:
+        lane = self._lanes.get(name or current_lane() or self.default_lane)
+        if lane is None:
+            raise ValueError(f"unknown fetch lane: {name or current_lane()!r}")
+        return lane
+
+    def _can_start(self, lane: _Lane) -> bool:
+        if lane.in_flight < lane.reserved:
+            return True
+        shared_used = sum(max(0, other.in_flight - other.reserved) for other in self._lanes.values())
+        return shared_used < self._shared_slots
+
+    def _next_lane(self) -> Optional[_Lane]:
+        ready = [lane for lane in self._lanes.values() if lane.queue and self._can_start(lane)]
+        return min(ready, key=lambda lane: (lane.vtime, -lane.weight)) if ready else None
+
+    def acquire(self, lane: Optional[str] = None) -> float:
+        """Waits for a slot (and token) in ``lane`` (default: the current fetch lane) and returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            entry = self._lane(lane)
+            if not entry.queue and not entry.in_flight:
+                # Rejoin at the current virtual time
+                entry.vtime = max(entry.vtime, self._vclock)
+            self._tickets += 1
+            ticket = self._tickets
+            entry.queue.append(ticket)
+            while True:
+                if self._next_lane() is entry and entry.queue[0] == ticket:
+                    if self.rate_limiter is None or self.rate_limiter.try_acquire():
+                        break
+                    # Only the head of the chosen lane waits for the next token
+                    self._cond.wait(max(0.001, (1 - self.rate_limiter.available()) / self.rate_limiter.rate))
+                else:
+                    self._cond.wait()
+            entry.queue.popleft()
+            entry.in_flight += 1
+            self._vclock = entry.vtime
+            entry.vtime += 1 / entry.weight
+            waited = time.monotonic() - started
+            entry.granted += 1
+            entry.waited += waited
+            entry.max_wait = max(entry.max_wait, waited)
+            self._cond.notify_all()
+        entry.waits.record(waited)
+        return waited
+
+    def release(self, lane: Optional[str] = None):
+        with self._cond:
+            self._lane(lane).in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, lane: Optional[str] = None) -> Iterator[float]:
+        """Holds a slot in ``lane`` for the enclosed request; yields the seconds waited."""
+        name = self._lane(lane).name
+        waited = self.acquire(name)
+        try:
+            yield waited
+        finally:
+            self.release(name)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            lanes = {
+                lane.name: {
+                    'weight': lane.weight,
+                    'reserved': lane.reserved,
+                    'queued': len(lane.queue),
+                    'in_flight': lane.in_flight,
+                    'granted': lane.granted,
+                    'wait_seconds': lane.waited,
+                    'mean_wait': lane.waited / lane.granted if lane.granted else 0.0,
+                    'max_wait': lane.max_wait,
+                }
+                for lane in self._lanes.values()
+            }
+        for name, stats in lanes.items():
+            stats['p95_wait'] = self._lanes[name].waits.percentile(95) or 0.0
+        return {'max_concurrency': self.max_concurrency, 'lanes': lanes}
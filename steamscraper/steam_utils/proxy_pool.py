@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class NoProxyAvailableError(RuntimeError):
+    """Raised when no healthy proxy slot becomes free before the acquire timeout."""
+
+
+class _ProxyState:
+    def __init__(self, url: str, window: int):
+        self.url = url
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.recent = deque(maxlen=window)  # True for success, False for failure
+        self.ejected_until: Optional[float] = None
+        self.ejections = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.recent:
+            return 0.0
+        return self.recent.count(False) / len(self.recent)
+
+
+class ProxyLease:
+    """
+    A single checked-out proxy slot. Call ``release`` exactly once when the
+    request finishes, or use the lease as a context manager.
+    """
+    def __init__(self, pool: 'ProxyPool', url: str):
+        self._pool = pool
+        self._started = pool._clock()
+        self._released = False
+        self.url = url
+        self.proxies = {'http': url, 'https': url}
+
+    def release(self, success: bool = True):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self.url, self._pool._clock() - self._started, success)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release(success=exc_type is None)
+        return False
+
+
+class ProxyPool:
+    """
+    Spreads requests across a set of HTTP(S) proxies.
+
+    Each proxy accepts at most ``max_concurrency`` requests at a time; callers
+    block in ``acquire`` until a slot is free. Per-proxy latency and error rates
+    are tracked, and a proxy whose error rate over the last ``window`` requests
+    reaches ``max_error_rate`` is ejected for ``eject_seconds`` before being
+    re-admitted with a clean window.
+    """
+    def __init__(self, proxies: Iterable[str], max_concurrency: int = 4, max_error_rate: float = 0.5,
+                 min_requests: int = 5, window: int = 20, eject_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        urls = [p.strip() for p in proxies if p and p.strip()]
+        if not urls:
+            raise ValueError("ProxyPool requires at least one proxy.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.max_error_rate = max_error_rate
+        self.min_requests = min_requests
+        self.eject_seconds = eject_seconds
+        self._clock = clock
+        self._created = clock()
+        self._cond = threading.Condition()
+        self._states: Dict[str, _ProxyState] = {url: _ProxyState(url, window) for url in dict.fromkeys(urls)}
+
+    @classmethod
+    def from_list(cls, proxies: Iterable[str], **kwargs) -> 'ProxyPool':
+        return cls(proxies, **kwargs)
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'ProxyPool':
+        """
+        Loads proxies from a text file with one proxy URL per line.
+        Blank lines and lines starting with ``#`` are ignored.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            proxies = [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+        return cls(proxies, **kwargs)
+
+    def __len__(self):
+        return len(self._states)
+
+    def _readmit_expired(self, now: float):
+        for state in self._states.values():
+            if state.ejected_until is not None and now >= state.ejected_until:
+                logger.info(f"Re-admitting proxy {state.url}")
+                state.ejected_until = None
+                state.recent.clear()
+
+    def _pick(self) -> Optional[_ProxyState]:
+        candidates = [s for s in self._states.values()
+                      if s.ejected_until is None and s.in_flight < self.max_concurrency]
+        if not candidates:
+            return None
+        # Least loaded first, then the one with the lowest recent error rate
+        return min(candidates, key=lambda s: (s.in_flight, s.error_rate, s.requests))
+
+    def _next_wakeup(self, now: float) -> Optional[float]:
+        pending = [s.ejected_until for s in self._states.values() if s.ejected_until is not None]
+        return min(pending) - now if pending else None
+
+    def acquire(self, timeout: Optional[float] = None) -> ProxyLease:
+        """
+        Checks out a slot on the healthiest, least loaded proxy.
+
+        Raises:
+            NoProxyAvailableError: If no slot frees up within ``timeout`` seconds.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._readmit_expired(now)
+                state = self._pick()
+                if state is not None:
+                    state.in_flight += 1
+                    return ProxyLease(self, state.url)
+                wait = self._next_wakeup(now)
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise NoProxyAvailableError("No healthy proxy available.")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def _release(self, url: str, latency: float, success: bool):
+        with self._cond:
+            state = self._states[url]
+            state.in_flight -= 1
+            state.requests += 1
+            state.total_latency += latency
+            state.recent.append(success)
+            if not success:
+                state.errors += 1
+                if (state.ejected_until is None and len(state.recent) >= self.min_requests
+                        and state.error_rate >= self.max_error_rate):
+                    state.ejected_until = self._clock() + self.eject_seconds
+                    state.ejections += 1
+                    logger.warning(f"Ejecting proxy {url} (error rate {state.error_rate:.0%}) for {self.eject_seconds}s")
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns per-proxy counters: requests, errors, recent error rate, average
+        latency, current in-flight count, health, ejections and throughput
+        (completed requests per second since the pool was created).
+        """
+        with self._cond:
+            uptime = max(self._clock() - self._created, 1e-9)
+            return {
+                state.url: {
+                    'requests': state.requests,
+                    'errors': state.errors,
+                    'error_rate': state.error_rate,
+                    'avg_latency_ms': (state.total_latency / state.requests * 1000) if state.requests else 0.0,
+                    'in_flight': state.in_flight,
+                    'healthy': state.ejected_until is None,
+                    'ejections': state.ejections,
+                    'throughput_rps': state.requests / uptime,
+                }
+                for state in self._states.values()
+            }
+
+    def healthy_proxies(self) -> List[str]:
+        with self._cond:
+            self._readmit_expired(self._clock())
+            return [s.url for s in self._states.values() if s.ejected_until is None]
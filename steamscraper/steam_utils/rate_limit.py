@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second refill a bucket that
+    holds at most ``burst`` tokens. Each request spends one token (or ``n``).
+    """
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, n: float = 1) -> bool:
+        """Spends ``n`` tokens if they are available right now."""
+        with self._cond:
+            self._refill()
+            if self._tokens >= n:
+                self._tokens -= n
+                self.granted += 1
+                return True
+            return False
+
+    def acquire(self, n: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until ``n`` tokens are available (or ``timeout`` seconds pass) and
+        spends them. Returns False on timeout.
+        """
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= n:
+                    self._tokens -= n
+                    self.granted += 1
+                    self.waited += time.monotonic() - started
+                    return True
+                wait = (n - self._tokens) / self.rate
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            self._refill()
+            return {'rate': self.rate, 'burst': self.burst, 'tokens': self._tokens,
+                    'granted': self.granted, 'waited_seconds': self.waited}
@@ -0,0 +1,252 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_MISSING = object()
+
+
+class SharedCache:
+    """
+    Key-value cache shared by every process on a host, stored in one SQLite
+    file in WAL mode with memory-mapped reads (``mmap_size``): readers never
+    block each other or the writer, and writers are serialized by SQLite's
+    file locks, so any number of worker processes can use it concurrently.
+
+    Values are JSON-serializable objects (parsed records), ``str`` or
+    ``bytes`` (raw responses); large strings and bytes are zlib-compressed.
+    ``get(key, fields=...)`` extracts only the requested top-level keys of a
+    stored record inside SQLite, so readers never decode the whole record.
+
+    Entries expire ``ttl`` seconds after they were written. Expired entries are
+    skipped on read and purged (together with the oldest entries beyond
+    ``max_entries``) every ``purge_every`` writes.
+
+    Hit/miss counters are kept per process; ``stats()`` also reports the sum
+    over all processes, which each process publishes on writes and on
+    ``flush_stats()``. Processes that have not published for ``stats_window``
+    seconds (exited ones, or ones whose pid was reused) are left out of the sum,
+    and their rows are removed by the purge.
+    """
+    def __init__(self, path: str, ttl: Optional[float] = 300.0, max_entries: int = 100000,
+                 mmap_size: int = 256 * 1024 * 1024, compress_min_size: int = 4096, purge_every: int = 256,
+                 stats_window: float = 3600.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mmap_size = mmap_size
+        self.compress_min_size = compress_min_size
+        self.purge_every = purge_every
+        self.stats_window = stats_window
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._reset_counters()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                value BLOB,
+                stored_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored_at);
+            CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at);
+            CREATE TABLE IF NOT EXISTS metrics (
+                pid INTEGER PRIMARY KEY,
+                hits INTEGER NOT NULL,
+                misses INTEGER NOT NULL,
+                writes INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+
+    def _reset_counters(self):
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __getstate__(self):
+        # Connections and counters belong to one process; a pickled copy starts fresh
+        state = self.__dict__.copy()
+        del state['_local'], state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked child: counters inherited from the parent are not ours
+            self._reset_counters()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _encode(self, value: Any):
+        if isinstance(value, bytes):
+            kind, data = 'bytes', value
+        elif isinstance(value, str):
+            kind, data = 'text', value.encode('utf-8')
+        else:
+            # Stored as TEXT so that field projections can use SQLite's JSON functions
+            return 'json', json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        if len(data) >= self.compress_min_size:
+            return kind + '.z', zlib.compress(data, 1)
+        return kind, data
+
+    @staticmethod
+    def _decode(kind: str, value) -> Any:
+        if kind == 'json':
+            return json.loads(value)
+        if kind.endswith('.z'):
+            value = zlib.decompress(value)
+            kind = kind[:-2]
+        return value.decode('utf-8') if kind == 'text' else bytes(value)
+
+    def get(self, key: str, default: Any = None, fields: Optional[Iterable[str]] = None) -> Any:
+        """
+        Returns the value stored under ``key``, or ``default`` if it is missing or
+        expired. With ``fields``, returns only those top-level keys of a stored record.
+        """
+        conn = self._connection()
+        now = self._clock()
+        if fields is None:
+            row = conn.execute("SELECT kind, value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                               (key, now)).fetchone()
+            self._count(row is not None)
+            return default if row is None else self._decode(*row)
+
+        fields = list(fields)
+        # One read transaction, so that both statements see the same snapshot even
+        # if another process replaces or purges the entry in between
+        conn.execute('BEGIN')
+        try:
+            row = conn.execute("SELECT kind FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                               (key, now)).fetchone()
+            if row is None:
+                value = _MISSING
+            elif row[0] != 'json':
+                # Raw responses have no fields to project
+                value = self._decode(*conn.execute("SELECT kind, value FROM entries WHERE key = ?", (key,)).fetchone())
+            else:
+                value = {}
+                for field, value_type, field_value in conn.execute(f"""
+                    SELECT j.key, j.type, j.value FROM entries, json_each(entries.value) AS j
+                    WHERE entries.key = ? AND j.key IN ({','.join('?' * len(fields))})
+                """, [key] + fields):
+                    if value_type in ('object', 'array'):
+                        field_value = json.loads(field_value)
+                    elif value_type in ('true', 'false'):
+                        field_value = value_type == 'true'
+                    value[field] = field_value
+        finally:
+            conn.execute('COMMIT')
+        self._count(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = _MISSING):
+        ttl = self.ttl if ttl is _MISSING else ttl
+        now = self._clock()
+        kind, data = self._encode(value)
+        conn = self._connection()
+        with self._lock:
+            self.writes += 1
+            writes, hits, misses = self.writes, self.hits, self.misses
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute("INSERT OR REPLACE INTO entries (key, kind, value, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                         (key, kind, data, now, None if ttl is None else now + ttl))
+            conn.execute("INSERT OR REPLACE INTO metrics (pid, hits, misses, writes, updated_at) VALUES (?, ?, ?, ?, ?)",
+                         (os.getpid(), hits, misses, writes, now))
+            if writes % self.purge_every == 0:
+                self._purge(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _purge(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute("DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY stored_at LIMIT ?)", (excess,))
+        conn.execute("DELETE FROM metrics WHERE updated_at <= ?", (now - self.stats_window,))
+
+    def purge(self):
+        """Removes expired entries and the oldest entries beyond ``max_entries``."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._purge(conn, self._clock())
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, key: str) -> bool:
+        return self._connection().execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+
+    def __contains__(self, key: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, self._clock())).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM entries WHERE expires_at IS NULL OR expires_at > ?", (self._clock(),)).fetchone()[0]
+
+    def flush_stats(self):
+        """Publishes this process's counters so that ``stats()`` in other processes includes them."""
+        conn = self._connection()
+        with self._lock:
+            row = (os.getpid(), self.hits, self.misses, self.writes, self._clock())
+        conn.execute("INSERT OR REPLACE INTO metrics (pid, hits, misses, writes, updated_at) VALUES (?, ?, ?, ?, ?)", row)
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connection()
+        with self._lock:
+            hits, misses, writes = self.hits, self.misses, self.writes
+        total_hits, total_misses, total_writes, processes = conn.execute(
+            "SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0), COALESCE(SUM(writes), 0), COUNT(*) FROM metrics "
+            "WHERE pid != ? AND updated_at > ?", (os.getpid(), self._clock() - self.stats_window)).fetchone()
+        total_hits, total_misses, total_writes = total_hits + hits, total_misses + misses, total_writes + writes
+        return {
+            'entries': len(self),
+            'hits': hits,
+            'misses': misses,
+            'writes': writes,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'all_processes': {
+                'processes': processes + 1,
+                'hits': total_hits,
+                'misses': total_misses,
+                'writes': total_writes,
+                'hit_rate': total_hits / (total_hits + total_misses) if total_hits + total_misses else 0.0,
+            },
+        }
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,22 +1,31 @@
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 
+import codecs
 import requests
 import logging
 import os
+import threading
+import time
+from types import MappingProxyType
+
+from .proxy_pool import NoProxyAvailableError, ProxyPool
+from .rate_limit import TokenBucket
+from .priority_lanes import PriorityLanes
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
-DEFAULT_COOKIES = {
+# Read-only: every thread shares them, and each request gets its own copy
+DEFAULT_COOKIES = MappingProxyType({
     'birthtime': '568022401',
     'mature_content': '1',
     'lastagecheckage': '1-January-1990'
-}
-DEFAULT_HEADERS = {
+})
+DEFAULT_HEADERS = MappingProxyType({
     'User-Agent': DEFAULT_USER_AGENT,
     'Referer': 'https://www.google.com/',
     'Host': 'store.steampowered.com'
-}
+})
 
 def get_proxies_from_env() -> dict:
     """
@@ -33,7 +42,71 @@ def get_proxies_from_env() -> dict:
         proxies['https'] = https_proxy
     return proxies
 
-def fetch_steam_store_html(url: str, lang: str = 'english', headers: Optional[dict] = None, cookies: Optional[dict] = None, proxies: Optional[dict] = None) -> Optional[str]:
+class SharedSession(requests.Session):
+    """
+    A ``requests.Session`` meant to be shared by every source in a process:
+    one keep-alive connection pool per host and, optionally, one token bucket
+    that every outgoing request has to pass.
+
+    With ``lanes`` (a PriorityLanes) requests are admitted per fetch lane
+    instead: each request waits in the queue of the current lane (see
+    ``fetch_lane``) and the lanes share the concurrency and the rate limit by
+    weight. The rate limit is then the lanes' ``rate_limiter``.
+    """
+    def __init__(self, pool_size: int = 32, rate_limiter: Optional[TokenBucket] = None,
+                 lanes: Optional[PriorityLanes] = None):
+        super().__init__()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.rate_limiter = rate_limiter
+        self.lanes = lanes
+
+    def request(self, *args, **kwargs):
+        if self.lanes is not None:
+            # Streamed bodies are read after the slot is released
+            with self.lanes.slot():
+                return super().request(*args, **kwargs)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return super().request(*args, **kwargs)
+
+
+def _merge_env_proxies(proxies: Optional[dict]) -> Optional[dict]:
+    # Get proxies from environment variables
+    env_proxies = get_proxies_from_env()
+    # Merge with provided proxies, giving precedence to env_proxies. The caller's
+    # dict is left alone: it may be shared with requests running in other threads
+    if env_proxies:
+        return {**proxies, **env_proxies} if proxies else env_proxies
+    return proxies
+
+def _response_encoding(response: requests.Response) -> str:
+    """The charset of the response, or utf-8 when it is missing or unknown to Python."""
+    encoding = response.encoding or 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        logger.warning(f"Unknown charset {encoding!r} in response; decoding as utf-8")
+        return 'utf-8'
+    return encoding
+
+def read_cancellable(response: requests.Response, cancel: threading.Event, chunk_size: int = 64 * 1024) -> Optional[bytes]:
+    """
+    Reads a streamed response body chunk by chunk, closing the connection and
+    returning None as soon as ``cancel`` is set (e.g. a hedged duplicate won).
+    """
+    parts = []
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if cancel.is_set():
+            response.close()
+            return None
+        parts.append(chunk)
+    return b''.join(parts)
+
+def fetch_steam_store_html(url: str, lang: str = 'english', headers: Optional[dict] = None, cookies: Optional[dict] = None, proxies: Optional[dict] = None, proxy_pool: Optional[ProxyPool] = None,
+                           session: Optional[requests.Session] = None, cancel: Optional[threading.Event] = None,
+                           on_response: Optional[Callable[[requests.Response], None]] = None) -> Optional[str]:
     """
     Fetches the HTML content of a Steam store page with appropriate headers.
 
@@ -47,27 +120,129 @@ def fetch_steam_store_html(url: str, lang: str = 'english', headers: Optional[di
         :param url: The URL of the Steam store page.
         :param lang: The language for the request.
         :param headers: Headers to use for the request.
+        :param proxy_pool: Optional pool to route the request through. Takes precedence over ``proxies``.
+        :param session: Optional session (e.g. a SharedSession) whose connection pool is reused.
+        :param cancel: Optional event; once set, the download is abandoned and None is returned.
+        :param on_response: Optional callback receiving the final response (after redirects) before its status is checked.
     """
-    if cookies is None:
-        cookies = DEFAULT_COOKIES
-    if headers is None:
-        headers = DEFAULT_HEADERS
+    cookies = dict(DEFAULT_COOKIES if cookies is None else cookies)
+    headers = dict(DEFAULT_HEADERS if headers is None else headers)
     params = {'l': lang}
 
-    # Get proxies from environment variables
-    env_proxies = get_proxies_from_env()
-    # Merge with provided proxies, giving precedence to env_proxies
-    if env_proxies:
-        if proxies:
-            proxies.update(env_proxies)
-        else:
-            proxies = env_proxies
+    proxies = _merge_env_proxies(proxies)
+
+    lease = None
+    if proxy_pool is not None:
+        try:
+            lease = proxy_pool.acquire()
+        except NoProxyAvailableError as e:
+            logger.error(f"Error fetching URL {url}: {e}")
+            return None
+        proxies = lease.proxies
 
     logger.info(f"Fetching HTML from: {url}")
+    success = False
+    try:
+        if cancel is None:
+            response = (session or requests).get(url, headers=headers, cookies=cookies, params=params, timeout=10, proxies=proxies)
+            if on_response is not None:
+                on_response(response)
+            response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+            text = response.text
+        else:
+            with (session or requests).get(url, headers=headers, cookies=cookies, params=params, timeout=10,
+                                           proxies=proxies, stream=True) as response:
+                if on_response is not None:
+                    on_response(response)
+                response.raise_for_status()
+                body = read_cancellable(response, cancel)
+            text = body.decode(_response_encoding(response), errors='replace') if body is not None else None
+            if text is None:
+                logger.info(f"Fetch of {url} cancelled")
+        success = True
+        return text
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error fetching URL {url}: {e}")
+        return None
+    finally:
+        # Also on errors raised by on_response or while decoding, or the slot is lost for good
+        if lease:
+            lease.release(success=success)
+
+class StreamedHtml(NamedTuple):
+    """Result of ``stream_steam_store_html``."""
+    text: str
+    bytes_read: int
+    terminated_early: bool
+    elapsed: float
+
+
+def stream_steam_store_html(url: str, stop_when: Callable[[str], bool], lang: str = 'english', headers: Optional[dict] = None,
+                            cookies: Optional[dict] = None, proxies: Optional[dict] = None, proxy_pool: Optional[ProxyPool] = None,
+                            chunk_size: int = 16 * 1024, session: Optional[requests.Session] = None,
+                            on_response: Optional[Callable[[requests.Response], None]] = None) -> Optional[StreamedHtml]:
+    """
+    Streams a Steam store page, handing each decoded chunk to ``stop_when``.
+    As soon as ``stop_when`` returns True the connection is closed and the HTML
+    received so far is returned, so the unused tail of the page is never downloaded.
+    If ``stop_when`` raises, the whole page is read instead.
+    ``on_response`` (if given) receives the final response before its status is checked.
+
+    Returns:
+        A StreamedHtml with the (possibly truncated) HTML, the number of body bytes
+        read, whether the download was cut short and the elapsed time, or None on error.
+    """
+    cookies = dict(DEFAULT_COOKIES if cookies is None else cookies)
+    headers = dict(DEFAULT_HEADERS if headers is None else headers)
+    params = {'l': lang}
+    proxies = _merge_env_proxies(proxies)
+
+    lease = None
+    if proxy_pool is not None:
+        try:
+            lease = proxy_pool.acquire()
+        except NoProxyAvailableError as e:
+            logger.error(f"Error fetching URL {url}: {e}")
+            return None
+        proxies = lease.proxies
+
+    logger.info(f"Streaming HTML from: {url}")
+    started = time.perf_counter()
+    success = False
     try:
-        response = requests.get(url, headers=headers, cookies=cookies, params=params, timeout=10, proxies=proxies)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-        return response.text
+        with (session or requests).get(url, headers=headers, cookies=cookies, params=params, timeout=10,
+                                       proxies=proxies, stream=True) as response:
+            if on_response is not None:
+                on_response(response)
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(_response_encoding(response))(errors='replace')
+            parts = []
+            bytes_read = 0
+            terminated_early = False
+            watching = True
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                bytes_read += len(chunk)
+                text = decoder.decode(chunk)
+                parts.append(text)
+                if not watching:
+                    continue
+                try:
+                    stop = stop_when(text)
+                except Exception as e:
+                    # Read the rest of the page instead of losing it
+                    logger.warning(f"stop_when failed while streaming {url}, reading the whole page: {e}")
+                    watching = False
+                    continue
+                if stop:
+                    terminated_early = True
+                    break
+            if not terminated_early:
+                parts.append(decoder.decode(b'', final=True))
+        success = True
+        return StreamedHtml(''.join(parts), bytes_read, terminated_early, time.perf_counter() - started)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching URL {url}: {e}")
-        return None
\ No newline at end of file
+        return None
+    finally:
+        if lease:
+            lease.release(success=success)
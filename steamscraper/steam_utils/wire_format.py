@@ -0,0 +1,386 @@
+"""
+Compact binary encoding for shipping records between services.
+
+A stream is a header followed by length-prefixed frames, one per record:
+
+    stream  := header frame*
+    header  := 0x00 "SSW" version          (version is one byte)
+    frame   := varint(len(value)) value     (len > 0)
+
+A 0x00 byte where a frame length is expected is the header of a new stream,
+so streams written by different encoders (e.g. appended to one file) can be
+concatenated and read back in one pass.
+
+Values are tagged msgpack-style: ints 0-127 are a single byte, other ints
+are zigzag varints, floats are 8-byte doubles, and lists and dicts carry
+their length. Strings are deduplicated through a string table that encoder
+and decoder build in step: it starts with the field names of the version's
+schema (``SCHEMA_V1``), and every short string seen in a stream is appended
+to it, so repeated keys and values (tags, developer names, language names,
+``"Windows"``...) cost one or two bytes after their first occurrence. Long
+URLs are stored as their directory plus the last path segment, and the
+directories enter the table too, so the CDN prefixes shared by every media
+URL of a record are written once. The table lives for the whole stream, so
+each frame can only be decoded after the ones before it.
+
+Version 1 is frozen: a decoder refuses streams of a version it does not
+know, and new schema strings or tags need a new version.
+
+Usage:
+    with open('games.ssw', 'wb') as f:
+        encoder = WireEncoder(f)
+        for record in records:
+            encoder.write(record)
+
+    with open('games.ssw', 'rb') as f:
+        for record in WireDecoder(f):
+            ...
+"""
+import struct
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+VERSION = 1
+HEADER = b'\x00SSW' + bytes([VERSION])
+
+# Field names of store-html, appdetails and combined records, most frequent first.
+# The first SHORT_REFS entries are referenced with a single byte.
+SCHEMA_V1 = (
+    'name', 'link', 'title', 'url', 'thumbnail', 'id', 'description', 'path_thumbnail', 'path_full',
+    'interface', 'full_audio', 'subtitles', 'language', 'price', 'original_price', 'discount_price',
+    'webm_source', 'mp4_source', 'tooltip', 'os', 'processor', 'memory', 'graphics', 'storage',
+    'directx', 'sound card', 'additional notes', 'summary', 'score', 'recent', 'all',
+    'header_image', 'short_description', 'full_description', 'developer', 'publisher', 'release_date',
+    'media', 'tags', 'reviews', 'system_requirements', 'language_support', 'metacritic', 'dlcs',
+    'features', 'content_descriptors', 'videos', 'screenshots', 'win', 'mac', 'linux',
+    'coming_soon', 'date', 'minimum', 'recommended',
+    'type', 'steam_appid', 'required_age', 'is_free', 'controller_support', 'dlc',
+    'detailed_description', 'about_the_game', 'supported_languages', 'capsule_image', 'capsule_imagev5',
+    'website', 'pc_requirements', 'mac_requirements', 'linux_requirements', 'legal_notice', 'developers',
+    'publishers', 'price_overview', 'packages', 'package_groups', 'platforms', 'categories', 'genres',
+    'movies', 'recommendations', 'achievements', 'support_info', 'background', 'background_raw',
+    'ratings', 'windows', 'currency', 'initial', 'final', 'discount_percent', 'initial_formatted',
+    'final_formatted', 'total', 'highlighted', 'path',
+    'webm', 'mp4', '480', 'max', 'highlight', 'email', 'subs', 'packageid',
+    'percent_savings_text', 'percent_savings', 'option_text', 'option_description', 'can_get_free_license',
+    'is_free_license', 'price_in_cents_with_discount', 'display_type', 'is_recurring_subscription',
+    'save_text', 'selection_text', 'notes', 'ids', 'rating', 'banned', 'use_age_gate',
+    'rating_generated', 'descriptors', 'esrb', 'pegi', 'usk', 'oflc', 'nzoflc', 'kgrb', 'dejus', 'mda',
+    'csrr', 'crl', 'steam_germany',
+)
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _RAW_STR, _REF, _LIST, _DICT, _JOIN, _JOIN_STR = range(0x80, 0x8c)
+_SHORT_REF = 0xa0
+SHORT_REFS = 0x100 - _SHORT_REF
+
+_DOUBLE = struct.Struct('>d')
+_URL_SCHEMES = ('https://', 'http://')
+
+
+class WireFormatError(ValueError):
+    pass
+
+
+def _write_varint(out: bytearray, n: int):
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class WireEncoder:
+    """
+    Writes records to the binary stream ``fp`` (or only to ``encode``'s return
+    value when ``fp`` is None). Strings of at most ``max_interned_length``
+    characters (and URL directories of any length) enter the string table
+    until it holds ``max_strings`` entries; other strings (descriptions, the
+    file names at the end of URLs) are written inline every time.
+    """
+    def __init__(self, fp: Optional[BinaryIO] = None, max_interned_length: int = 64, max_strings: int = 262144):
+        self._fp = fp
+        self.max_interned_length = max_interned_length
+        self.max_strings = max_strings
+        self._index: Dict[str, int] = {string: index for index, string in enumerate(SCHEMA_V1)}
+        self._table_size = len(SCHEMA_V1)
+        self._header_written = False
+        self.count = 0
+
+    def encode(self, record: Any) -> bytes:
+        """Returns the next frame for ``record`` (preceded by the header for the first one)."""
+        payload = bytearray()
+        self._encode(record, payload)
+        frame = bytearray()
+        if not self._header_written:
+            frame += HEADER
+            self._header_written = True
+        _write_varint(frame, len(payload))
+        frame += payload
+        self.count += 1
+        return bytes(frame)
+
+    def write(self, record: Any):
+        self._fp.write(self.encode(record))
+
+    def write_all(self, records: Iterable[Any]) -> int:
+        """Writes every record of ``records`` and returns how many were written."""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def _encode_str(self, value: str, out: bytearray, intern: bool = True):
+        index = self._index.get(value)
+        if index is not None:
+            if index < SHORT_REFS:
+                out.append(_SHORT_REF + index)
+            else:
+                out.append(_REF)
+                _write_varint(out, index)
+            return
+        # Directories ending in '/' are worth interning whatever their length
+        is_dir = value.endswith('/')
+        can_intern = intern and self._table_size < self.max_strings and (is_dir or len(value) <= self.max_interned_length)
+        if len(value) > self.max_interned_length and value.startswith(_URL_SCHEMES):
+            split = value.rfind('/', 0, len(value) - 1) + 1
+            if split > len('https://'):
+                # A long URL is its directory (split the same way) plus its last segment
+                out.append(_JOIN_STR if can_intern else _JOIN)
+                self._encode_str(value[:split], out)
+                self._encode_str(value[split:], out, intern=is_dir)
+                if can_intern:
+                    self._index[value] = self._table_size
+                    self._table_size += 1
+                return
+        data = value.encode('utf-8')
+        if can_intern:
+            self._index[value] = self._table_size
+            self._table_size += 1
+            out.append(_STR)
+        else:
+            out.append(_RAW_STR)
+        _write_varint(out, len(data))
+        out += data
+
+    def _encode(self, value: Any, out: bytearray):
+        kind = type(value)
+        if kind is str:
+            self._encode_str(value, out)
+        elif kind is dict:
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                if type(key) is not str:
+                    # Same key coercion as json.dumps
+                    if isinstance(key, bool) or key is None:
+                        key = {True: 'true', False: 'false', None: 'null'}[key]
+                    elif isinstance(key, (int, float, str)):
+                        key = str(key)
+                    else:
+                        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+                self._encode_str(key, out)
+                self._encode(item, out)
+        elif kind is int:
+            if 0 <= value < 0x80:
+                out.append(value)
+            else:
+                out.append(_INT)
+                _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif kind is list or kind is tuple:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self._encode(item, out)
+        elif kind is float:
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            self._encode_str(str(value), out)
+        elif isinstance(value, int):
+            self._encode(int(value), out)
+        elif isinstance(value, float):
+            self._encode(float(value), out)
+        elif isinstance(value, dict):
+            self._encode(dict(value), out)
+        elif isinstance(value, (list, tuple)):
+            self._encode(list(value), out)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+class WireDecoder:
+    """
+    Reads records from the binary stream ``fp`` one frame at a time; iterate
+    over it or call ``read``. Use ``decode`` to feed frames from elsewhere
+    (e.g. a message queue) in the order they were encoded.
+    """
+    def __init__(self, fp: Optional[BinaryIO] = None):
+        self._fp = fp
+        self._strings: List[str] = []
+        self._started = False
+
+    def _reset(self, version: bytes):
+        if version != HEADER[4:]:
+            raise WireFormatError(f"unsupported wire format version {version[0] if version else None}")
+        self._strings = list(SCHEMA_V1)
+        self._started = True
+
+    def _read_exact(self, n: int) -> bytes:
+        data = self._fp.read(n)
+        if len(data) != n:
+            raise WireFormatError("truncated stream")
+        return data
+
+    def read(self) -> Any:
+        """Returns the next record; raises EOFError at the end of the stream."""
+        while True:
+            first = self._fp.read(1)
+            if not first:
+                raise EOFError
+            if first == b'\x00':
+                if self._read_exact(3) != HEADER[1:4]:
+                    raise WireFormatError("not a wire format stream")
+                self._reset(self._read_exact(1))
+                continue
+            if not self._started:
+                raise WireFormatError("not a wire format stream")
+            length, shift, byte = 0, 0, first[0]
+            while byte & 0x80:
+                length |= (byte & 0x7f) << shift
+                shift += 7
+                byte = self._read_exact(1)[0]
+            length |= byte << shift
+            return self._decode_payload(self._read_exact(length))
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                yield self.read()
+            except EOFError:
+                return
+
+    def decode(self, data: bytes) -> List[Any]:
+        """Decodes every frame (and header) in ``data`` and returns the records."""
+        records = []
+        pos, end = 0, len(data)
+        while pos < end:
+            if data[pos] == 0:
+                if data[pos + 1:pos + 4] != HEADER[1:4]:
+                    raise WireFormatError("not a wire format stream")
+                self._reset(data[pos + 4:pos + 5])
+                pos += len(HEADER)
+                continue
+            if not self._started:
+                raise WireFormatError("not a wire format stream")
+            length, pos = _read_varint(data, pos)
+            if pos + length > end:
+                raise WireFormatError("truncated stream")
+            records.append(self._decode_payload(data[pos:pos + length]))
+            pos += length
+        return records
+
+    def _decode_payload(self, payload: bytes) -> Any:
+        try:
+            value, pos = _decode_value(payload, 0, self._strings)
+        except (IndexError, UnicodeDecodeError, struct.error) as e:
+            raise WireFormatError(f"corrupt frame: {e}") from None
+        if pos != len(payload):
+            raise WireFormatError("trailing bytes in frame")
+        return value
+
+
+def _read_varint(data: bytes, pos: int):
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    n, shift = byte & 0x7f, 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _decode_value(data: bytes, pos: int, strings: List[str]):
+    # Hot path: string references and containers come first, and one-byte lengths are read inline
+    tag = data[pos]
+    pos += 1
+    if tag >= _SHORT_REF:
+        return strings[tag - _SHORT_REF], pos
+    if tag < 0x80:
+        return tag, pos
+    if tag == _DICT:
+        count = data[pos]
+        count, pos = (count, pos + 1) if count < 0x80 else _read_varint(data, pos)
+        result = {}
+        for _ in range(count):
+            tag = data[pos]
+            if tag >= _SHORT_REF:
+                key = strings[tag - _SHORT_REF]
+                pos += 1
+            else:
+                key, pos = _decode_value(data, pos, strings)
+            result[key], pos = _decode_value(data, pos, strings)
+        return result, pos
+    if tag == _STR or tag == _RAW_STR:
+        length = data[pos]
+        length, pos = (length, pos + 1) if length < 0x80 else _read_varint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise IndexError("string runs past the frame")
+        value = data[pos:end].decode('utf-8')
+        if tag == _STR:
+            strings.append(value)
+        return value, end
+    if tag == _LIST:
+        count = data[pos]
+        count, pos = (count, pos + 1) if count < 0x80 else _read_varint(data, pos)
+        result = []
+        append = result.append
+        for _ in range(count):
+            item, pos = _decode_value(data, pos, strings)
+            append(item)
+        return result, pos
+    if tag == _JOIN or tag == _JOIN_STR:
+        prefix, pos = _decode_value(data, pos, strings)
+        suffix, pos = _decode_value(data, pos, strings)
+        value = prefix + suffix
+        if tag == _JOIN_STR:
+            strings.append(value)
+        return value, pos
+    if tag == _REF:
+        index, pos = _read_varint(data, pos)
+        return strings[index], pos
+    if tag == _INT:
+        n, pos = _read_varint(data, pos)
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    raise WireFormatError(f"unknown tag 0x{tag:02x}")
+
+
+def dumps(record: Any) -> bytes:
+    """Encodes one record as a complete single-frame stream."""
+    return WireEncoder().encode(record)
+
+
+def loads(data: bytes) -> Any:
+    """Decodes a stream written by ``dumps`` (the first record of any stream)."""
+    records = WireDecoder().decode(data)
+    if not records:
+        raise WireFormatError("stream holds no record")
+    return records[0]
@@ -0,0 +1,372 @@
+"""
+Local stand-in for the Steam store, serving the fixtures in ``tests/test_data``.
+
+Routes:
+    /app/<app_id>/          store page HTML (``<Name>-<app_id>-<lang>.html`` fixtures)
+    /api/appdetails         appdetails JSON (``appdetails_<app_id>_<lang>.json`` fixtures)
+    /api/packagedetails     packagedetails JSON for the packages registered in ``packages``
+    /appreviews/<app_id>    synthetic, cursor-paginated reviews (``reviews_per_app`` per app)
+    /search/results/        search listing JSON: the ``search_results_<lang>.html`` fixture rows
+                            followed by ``search_apps`` synthetic rows, filtered by ``term``
+    /media/<name>           bytes registered in ``media``, with HTTP Range support
+    /agecheck/app/<app_id>/ an age gate (target of redirects for apps in ``agecheck_apps``)
+    /                       a minimal store front page (target of unknown-app redirects)
+
+Latency, jitter, tail-latency outliers, 5xx error rate, 429 rate and bandwidth are configurable so that
+concurrency, caching and retry behaviour can be benchmarked offline and
+reproducibly (the random generator is seeded).
+
+Usage as a library:
+    with MockSteamServer(latency=0.05, error_rate=0.01) as server:
+        ds = CombinedSteamDataSource(store_url=server.url)
+
+Usage from the command line:
+    python tests/mock_steam_server.py --port 8080 --latency 0.05 --jitter 0.02
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from html import unescape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from synthetic_pages import synthetic_search_row
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_data')
+
+_HTML_FIXTURE_RE = re.compile(r'^.+-(\d+)-(\w+)\.html$')
+_JSON_FIXTURE_RE = re.compile(r'^appdetails_(\d+)_(\w+)\.json$')
+_APP_PATH_RE = re.compile(r'^/app/(\d+)(?:/.*)?$')
+_REVIEWS_PATH_RE = re.compile(r'^/appreviews/(\d+)$')
+_SEARCH_FIXTURE_RE = re.compile(r'^search_results_(\w+)\.html$')
+_SEARCH_ROW_RE = re.compile(r'<a [^>]*class="search_result_row.*?</a>\s*', re.S)
+_SEARCH_TITLE_RE = re.compile(r'<span class="title">(.*?)</span>')
+
+HOMEPAGE_HTML = b"<html><head><title>Welcome to Steam</title></head><body><div id='home_maincap_v7'></div></body></html>"
+AGECHECK_HTML = (b"<html><head><title>Site Error</title></head><body><div id='app_agegate' class='agegate_birthday_selector'>"
+                 b"<form id='agecheck_form'></form></div></body></html>")
+
+
+def load_fixtures(data_dir: str = TEST_DATA_DIR) -> Tuple[Dict[tuple, bytes], Dict[tuple, dict]]:
+    """Returns ({(app_id, lang): html_bytes}, {(app_id, lang): appdetails_data})."""
+    pages, details = {}, {}
+    for path in glob.glob(os.path.join(data_dir, '*.html')):
+        match = _HTML_FIXTURE_RE.match(os.path.basename(path))
+        if match:
+            with open(path, 'rb') as f:
+                pages[(match.group(1), match.group(2))] = f.read()
+    for path in glob.glob(os.path.join(data_dir, '*.json')):
+        match = _JSON_FIXTURE_RE.match(os.path.basename(path))
+        if match:
+            with open(path, 'r', encoding='utf-8') as f:
+                details[(match.group(1), match.group(2))] = json.load(f)
+    return pages, details
+
+
+def load_search_rows(data_dir: str = TEST_DATA_DIR) -> Dict[str, List[Tuple[str, str]]]:
+    """Returns {lang: [(title, row_html), ...]} from the search listing fixtures."""
+    rows = {}
+    for path in glob.glob(os.path.join(data_dir, 'search_results_*.html')):
+        match = _SEARCH_FIXTURE_RE.match(os.path.basename(path))
+        if match:
+            with open(path, 'r', encoding='utf-8') as f:
+                rows[match.group(1)] = [(unescape(_SEARCH_TITLE_RE.search(row).group(1)), row)
+                                        for row in _SEARCH_ROW_RE.findall(f.read())]
+    return rows
+
+
+class MockSteamServer:
+    """
+    Threaded HTTP server that mimics the parts of the Steam store the scraper uses.
+
+    Args:
+        latency: Base delay in seconds before each response.
+        jitter: Extra uniformly distributed delay in [0, jitter] seconds.
+        error_rate: Probability of answering with a 500.
+        rate_limit_rate: Probability of answering with a 429.
+        bandwidth: Response body throughput in bytes per second (None for unlimited).
+        any_app: Serve a fixture for every App ID (picked deterministically by ID)
+            instead of redirecting unknown apps to the store front page.
+        seed: Seed for the random generator used for jitter and injected errors.
+        reviews_per_app: Number of synthetic reviews served by ``/appreviews/<app_id>``.
+        slow_rate: Probability that a response is a tail-latency outlier.
+        slow_latency: Extra delay in seconds added to outliers.
+        search_apps: Number of synthetic apps listed by ``/search/results/`` after the fixture rows.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, bandwidth: Optional[int] = None,
+                 any_app: bool = False, seed: int = 0, data_dir: str = TEST_DATA_DIR, reviews_per_app: int = 250,
+                 slow_rate: float = 0.0, slow_latency: float = 1.0, search_apps: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.bandwidth = bandwidth
+        self.any_app = any_app
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.reviews_per_app = reviews_per_app
+        # (app_id, cc) -> price_overview served instead of the fixture's
+        self.price_overrides: Dict[tuple, dict] = {}
+        # name -> bytes served at /media/<name>
+        self.media: Dict[str, bytes] = {}
+        # package_id -> packagedetails data served at /api/packagedetails
+        self.packages: Dict[str, dict] = {}
+        # App IDs whose store page redirects to an age gate, and App IDs whose store page answers 404
+        self.agecheck_apps: Set[str] = set()
+        self.removed_apps: Set[str] = set()
+        self.pages, self.details = load_fixtures(data_dir)
+        self.search_rows = load_search_rows(data_dir)
+        self.search_apps = search_apps
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockSteamServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _roll(self) -> Tuple[float, Optional[int]]:
+        """Returns (delay, injected status or None) for one request."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                delay += self.slow_latency
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def _lookup(self, table: dict, app_id: str, lang: str):
+        if (app_id, lang) in table:
+            return table[(app_id, lang)]
+        same_app = [value for (fixture_id, _), value in sorted(table.items()) if fixture_id == app_id]
+        if same_app:
+            return same_app[0]
+        if self.any_app and table:
+            values = [value for _, value in sorted(table.items())]
+            return values[int(app_id) % len(values)]
+        return None
+
+    def reviews_page(self, app_id: str, cursor: str, num_per_page: int) -> dict:
+        """Builds an appreviews response; cursors are opaque strings encoding the offset."""
+        offset = 0 if cursor == '*' else int(cursor[1:], 16)
+        end = min(offset + num_per_page, self.reviews_per_app)
+        reviews = [{
+            'recommendationid': str(int(app_id) * 1000000 + i),
+            'author': {'steamid': str(76561197960265728 + i), 'num_reviews': i % 50},
+            'language': 'english',
+            'review': f"Synthetic review {i} for app {app_id}.",
+            'voted_up': i % 5 != 0,
+            'votes_up': i % 17,
+            'timestamp_created': 1700000000 - i * 3600,
+        } for i in range(offset, end)]
+        payload = {'success': 1, 'reviews': reviews, 'cursor': f"c{end:x}" if reviews else cursor}
+        if cursor == '*':
+            positive = sum(1 for i in range(self.reviews_per_app) if i % 5 != 0)
+            payload['query_summary'] = {
+                'num_reviews': len(reviews),
+                'total_positive': positive,
+                'total_negative': self.reviews_per_app - positive,
+                'total_reviews': self.reviews_per_app,
+            }
+        else:
+            payload['query_summary'] = {'num_reviews': len(reviews)}
+        return payload
+
+    def search_page(self, term: str, start: int, count: int, lang: str) -> dict:
+        """Builds a search results response for rows ``start`` to ``start + count`` (at most 100)."""
+        rows = self.search_rows.get(lang) or self.search_rows.get('english') or []
+        synthetic = range(100000, 100000 + self.search_apps)
+        term = term.casefold()
+        if term:
+            rows = [row for row in rows if term in row[0].casefold()]
+            synthetic = [app_id for app_id in synthetic if term in f"game {app_id}"]
+        end = start + min(count, 100)
+        html = ''.join(row_html for _, row_html in rows[start:end])
+        html += ''.join(synthetic_search_row(app_id) for app_id in synthetic[max(0, start - len(rows)):max(0, end - len(rows))])
+        return {'success': 1, 'results_html': html, 'total_count': len(rows) + len(synthetic), 'start': start}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Avoid a delayed-ACK stall between the header and body writes of keep-alive responses
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = 'text/html; charset=utf-8', headers: Optional[dict] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                with server._lock:
+                    server.stats[status] += 1
+                    server.stats['bytes_sent'] += len(body)
+                try:
+                    if not server.bandwidth:
+                        self.wfile.write(body)
+                        return
+                    chunk = max(1024, server.bandwidth // 50)
+                    for i in range(0, len(body), chunk):
+                        self.wfile.write(body[i:i + chunk])
+                        time.sleep(len(body[i:i + chunk]) / server.bandwidth)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client closed the connection early (e.g. streaming fetch)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                delay, injected = server._roll()
+                if delay:
+                    time.sleep(delay)
+                if injected == 429:
+                    return self._send(429, b'Too Many Requests', 'text/plain', {'Retry-After': '1'})
+                if injected == 500:
+                    return self._send(500, b'Internal Server Error', 'text/plain')
+
+                if parsed.path == '/':
+                    return self._send(200, HOMEPAGE_HTML)
+
+                if parsed.path.startswith('/agecheck/'):
+                    return self._send(200, AGECHECK_HTML)
+
+                match = _APP_PATH_RE.match(parsed.path)
+                if match:
+                    if match.group(1) in server.removed_apps:
+                        return self._send(404, b'Not Found', 'text/plain')
+                    if match.group(1) in server.agecheck_apps:
+                        return self._send(302, b'', headers={'Location': f"/agecheck/app/{match.group(1)}/"})
+                    lang = query.get('l', ['english'])[0]
+                    page = server._lookup(server.pages, match.group(1), lang)
+                    if page is None:
+                        return self._send(302, b'', headers={'Location': '/'})
+                    return self._send(200, page)
+
+                if parsed.path.startswith('/media/'):
+                    body = server.media.get(parsed.path[len('/media/'):])
+                    if body is None:
+                        return self._send(404, b'Not Found', 'text/plain')
+                    etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                    range_header = self.headers.get('Range', '')
+                    if_range = self.headers.get('If-Range')
+                    if range_header.startswith('bytes=') and if_range in (None, etag):
+                        start = int(range_header[len('bytes='):].split('-')[0])
+                        if start >= len(body):
+                            return self._send(416, b'', 'application/octet-stream',
+                                              {'Content-Range': f'bytes */{len(body)}'})
+                        return self._send(206, body[start:], 'application/octet-stream',
+                                          {'Content-Range': f'bytes {start}-{len(body) - 1}/{len(body)}', 'ETag': etag})
+                    return self._send(200, body, 'application/octet-stream', {'ETag': etag})
+
+                match = _REVIEWS_PATH_RE.match(parsed.path)
+                if match:
+                    cursor = query.get('cursor', ['*'])[0]
+                    num_per_page = int(query.get('num_per_page', ['20'])[0])
+                    payload = server.reviews_page(match.group(1), cursor, num_per_page)
+                    return self._send(200, json.dumps(payload).encode('utf-8'), 'application/json; charset=utf-8')
+
+                if parsed.path == '/search/results/':
+                    payload = server.search_page(query.get('term', [''])[0], int(query.get('start', ['0'])[0]),
+                                                 int(query.get('count', ['50'])[0]), query.get('l', ['english'])[0])
+                    return self._send(200, json.dumps(payload).encode('utf-8'), 'application/json; charset=utf-8')
+
+                if parsed.path == '/api/appdetails':
+                    app_ids = query.get('appids', [''])[0].split(',')
+                    lang = query.get('l', ['english'])[0]
+                    cc = query.get('cc', [''])[0].lower()
+                    price_only = query.get('filters', [''])[0] == 'price_overview'
+                    if len(app_ids) > 1 and not price_only:
+                        # Steam only accepts multiple appids together with filters=price_overview
+                        return self._send(200, b'null', 'application/json; charset=utf-8')
+                    payload = {}
+                    for app_id in app_ids:
+                        data = server._lookup(server.details, app_id, lang)
+                        if data is None:
+                            payload[app_id] = {'success': False}
+                            continue
+                        data = dict(data, steam_appid=int(app_id))
+                        if (app_id, cc) in server.price_overrides:
+                            data['price_overview'] = server.price_overrides[(app_id, cc)]
+                        if price_only:
+                            data = {'price_overview': data['price_overview']} if data.get('price_overview') else []
+                        payload[app_id] = {'success': True, 'data': data}
+                    return self._send(200, json.dumps(payload).encode('utf-8'), 'application/json; charset=utf-8')
+
+                if parsed.path == '/api/packagedetails':
+                    payload = {}
+                    for package_id in query.get('packageids', [''])[0].split(','):
+                        data = server.packages.get(package_id)
+                        payload[package_id] = {'success': True, 'data': data} if data is not None else {'success': False}
+                    return self._send(200, json.dumps(payload).encode('utf-8'), 'application/json; charset=utf-8')
+
+                return self._send(404, b'Not Found', 'text/plain')
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock Steam store server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='Base response delay in seconds.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay in seconds.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 500 response.')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a 429 response.')
+    parser.add_argument('--bandwidth', type=int, help='Body throughput in bytes per second.')
+    parser.add_argument('--any-app', action='store_true', help='Serve a fixture for every App ID.')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Probability of a tail-latency outlier.')
+    parser.add_argument('--slow-latency', type=float, default=1.0, help='Extra delay of outliers in seconds.')
+    parser.add_argument('--search-apps', type=int, default=0, help='Synthetic apps in the search listing.')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockSteamServer(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                             args.rate_limit_rate, args.bandwidth, args.any_app, args.seed,
+                             slow_rate=args.slow_rate, slow_latency=args.slow_latency, search_apps=args.search_apps)
+    print(f"Mock Steam server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Synthetic Steam store pages for soak and scalability tests.
+
+Pages use the same markup the store-html parser looks for, with content
+derived deterministically from the App ID. Every repeated section of a real
+page (description paragraphs, tags, videos, screenshots, DLC rows, language
+rows, system requirement lines, features) has its own size parameter, so
+parser cost can be measured along one dimension at a time; sections with a
+size of 0 are left out. ``synthetic_search_row`` builds the matching store
+search listing row.
+"""
+from typing import Tuple
+
+
+def _videos(app_id: int, count: int) -> Tuple[str, str]:
+    players = ''.join(
+        f'<div role="button" class="highlight_player_item highlight_movie" id="highlight_movie_{app_id}{k:04d}" style="display: none;"\n'
+        f' data-video-title="Trailer {k}" data-video-category=""\n'
+        f' data-webm-source="https://video.fastly.steamstatic.com/store_trailers/{app_id}{k:04d}/movie480_vp9.webm"\n'
+        f' data-mp4-source="https://video.fastly.steamstatic.com/store_trailers/{app_id}{k:04d}/movie480.mp4"\n'
+        f' data-poster="https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{app_id}{k:04d}/movie.293x165.jpg">\n'
+        f'</div>\n' for k in range(count))
+    thumbs = ''.join(
+        f'<div role="button" class="highlight_strip_item highlight_strip_movie ttip" data-tooltip-text="" id="thumb_movie_{app_id}{k:04d}">\n'
+        f'<img class="movie_thumb" src="https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{app_id}{k:04d}/movie.184x123.jpg" alt="">\n'
+        f'<div class="highlight_movie_marker"></div>\n</div>\n' for k in range(count))
+    return players, thumbs
+
+
+def _screenshots(app_id: int, count: int) -> str:
+    return ''.join(
+        f'<div role="button" class="highlight_player_item highlight_screenshot" id="highlight_screenshot_ss_{app_id}_{k}.jpg" style="display: none;">\n'
+        f'<div class="screenshot_holder">\n'
+        f'<a class="highlight_screenshot_link" data-screenshotid="ss_{app_id}_{k}.jpg" '
+        f'href="https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{app_id}/ss_{app_id}_{k}.1920x1080.jpg" target="_blank" rel="">\n'
+        f'<img src="https://store.fastly.steamstatic.com/public/images/blank.gif" alt="Screenshot #{k}">\n</a>\n</div>\n</div>\n'
+        for k in range(count))
+
+
+def _dlc_rows(app_id: int, count: int) -> str:
+    rows = []
+    for k in range(count):
+        dlc_id = app_id * 1000 + k
+        # Every third row is on sale, as on large DLC catalogues
+        price = (f'<div class="discount_block"><div class="discount_pct">-50%</div><div class="discount_prices">'
+                 f'<div class="discount_original_price">${k % 20 + 1}.98</div><div class="discount_final_price">${k % 20}.99</div></div></div>'
+                 if k % 3 == 0 else f'<div class="game_area_dlc_price">\n${k % 20}.99\t\t\t</div>')
+        rows.append(
+            f'<a class="game_area_dlc_row  {"odd" if k % 2 else "even"} ds_collapse_flag ds_collapse_flag_tiny" id="dlc_row_{dlc_id}"\n'
+            f'href="https://store.steampowered.com/app/{dlc_id}/DLC_{k}/" data-ds-appid="{dlc_id}" data-ds-itemkey="App_{dlc_id}">\n'
+            f'<div class="game_area_dlc_name">\nGame {app_id} DLC {k}\t\t\t</div>\n{price}\n'
+            f'<input type="hidden" name="subid[]" value="{dlc_id}">\n</a>\n')
+    return ('<div id="gameAreaDLCSection" class="game_area_dlc_section">\n'
+            '<h2 class="gradientbg">Content For This Game</h2>\n'
+            '<div class="game_area_dlc_list"><div class="tableView"><div class="gameDlcBlocks">\n'
+            + ''.join(rows) + '</div></div></div>\n</div>\n')
+
+
+def _language_table(count: int) -> str:
+    check = '<span>&#10004;</span> \t\t\t\t'
+    rows = ''.join(
+        f'<tr style="" class="">\n<td style="width: 94px; text-align: left" class="ellipsis">\nLanguage {k}\t\t\t</td>\n'
+        f'<td class="checkcol">\n{check}</td>\n<td class="checkcol">\n{check if k % 2 else ""}</td>\n'
+        f'<td class="checkcol">\n{check if k % 3 else ""}</td>\n</tr>\n' for k in range(count))
+    return ('<table  class="game_language_options" cellpadding="0" cellspacing="0">\n<tr>\n<th style="width: 94px;"></th>\n'
+            '<th class="checkcol">Interface</th>\n<th class="checkcol">Full Audio</th>\n<th class="checkcol">Subtitles</th>\n</tr>\n'
+            + rows + '</table>\n')
+
+
+def _system_requirements(count: int) -> str:
+    items = ''.join(f'<li><strong>Requirement {k}:</strong> Value {k}<br></li>' for k in range(count))
+    return ('<div class="game_page_autocollapse sys_req">\n'
+            '<div class="game_area_sys_req sysreq_content active" data-os="win">\n<div class="game_area_sys_req_leftCol">\n'
+            f'<ul>\n<strong>Minimum:</strong><br><ul class="bb_ul">{items}</ul>\n</ul>\n</div>\n</div>\n</div>\n')
+
+
+def _features(count: int) -> str:
+    links = ''.join(
+        f'<a class="game_area_details_specs_ctn" href="https://store.steampowered.com/search/?category2={k}">'
+        f'<div class="icon"><img class="category_icon" src="https://store.fastly.steamstatic.com/public/images/v6/ico/ico_{k}.png" alt=""></div>'
+        f'<div class="label">Feature {k}</div></a>' for k in range(count))
+    return ('<div class="block responsive_apppage_details_left" id="category_block">\n'
+            f'<div class="game_area_features_list_ctn">{links}</div>\n</div>\n')
+
+
+def synthetic_store_page(app_id: int, paragraphs: int = 20, tags: int = 8, videos: int = 0, screenshots: int = 0,
+                         dlcs: int = 0, languages: int = 0, requirements: int = 0, features: int = 0) -> str:
+    tag_links = ''.join(f'<a class="app_tag">Tag{(app_id + k) % 50}</a>' for k in range(tags))
+    body = ''.join(f'<p>Paragraph {k} of the description for app {app_id}.</p>' for k in range(paragraphs))
+    highlights = ''
+    if videos or screenshots:
+        players, thumbs = _videos(app_id, videos)
+        highlights = (f'<div class="highlight_ctn">\n<div class="highlight_player_area">\n{players}{_screenshots(app_id, screenshots)}</div>\n'
+                      f'<div id="highlight_strip">\n<div id="highlight_strip_scroll">\n{thumbs}</div>\n</div>\n</div>\n')
+    return f"""<html><head><title>Game {app_id} on Steam</title></head><body>
+<div class="apphub_AppName">Game {app_id}</div>
+{highlights}<img class="game_header_image_full" src="https://cdn.fastly.steamstatic.com/steam/apps/{app_id}/header.jpg">
+<div class="game_description_snippet">Synthetic game number {app_id}.</div>
+<div id="game_area_description"><h2 class="game_area_description_section_title">About This Game</h2>{body}</div>
+<div class="glance_ctn">
+  <div class="dev_row"><div class="subtitle">Developer:</div><div class="summary"><a href="https://store.steampowered.com/developer/studio{app_id % 97}">Studio {app_id % 97}</a></div></div>
+  <div class="dev_row"><div class="subtitle">Publisher:</div><div class="summary"><a href="https://store.steampowered.com/publisher/pub{app_id % 31}">Publisher {app_id % 31}</a></div></div>
+</div>
+<div class="glance_tags popular_tags">{tag_links}</div>
+{_features(features) if features else ''}{_language_table(languages) if languages else ''}{_dlc_rows(app_id, dlcs) if dlcs else ''}{_system_requirements(requirements) if requirements else ''}</body></html>"""
+
+
+_REVIEW_SUMMARIES = ('Overwhelmingly Positive', 'Very Positive', 'Mostly Positive', 'Mixed', 'Mostly Negative')
+
+
+def synthetic_search_row(app_id: int) -> str:
+    """One store search listing row for the same app as ``synthetic_store_page``."""
+    discount = (0, 0, 10, 25, 50, 75)[app_id % 6]
+    original = 499 + (app_id % 12) * 500
+    final = original * (100 - discount) // 100
+    tag_ids = [(app_id + k) % 50 for k in range(5)]
+    summary = _REVIEW_SUMMARIES[app_id % len(_REVIEW_SUMMARIES)]
+    if discount:
+        price_block = (f'<div class="discount_block search_discount_block" data-price-final="{final}" data-bundlediscount="0" data-discount="{discount}">'
+                       f'<div class="discount_pct">-{discount}%</div><div class="discount_prices">'
+                       f'<div class="discount_original_price">${original / 100:.2f}</div><div class="discount_final_price">${final / 100:.2f}</div></div></div>')
+    else:
+        price_block = (f'<div class="discount_block search_discount_block no_discount" data-price-final="{final}" data-bundlediscount="0" data-discount="0">'
+                       f'<div class="discount_prices"><div class="discount_final_price">${final / 100:.2f}</div></div></div>')
+    return f"""<a href="https://store.steampowered.com/app/{app_id}/Game_{app_id}/" data-ds-appid="{app_id}" data-ds-itemkey="App_{app_id}" data-ds-tagids="{tag_ids}" class="search_result_row ds_collapse_flag " data-search-page="1">
+<div class="col search_capsule"><img src="https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{app_id}/capsule_sm_120.jpg"></div>
+<div class="responsive_search_name_combined">
+<div class="col search_name ellipsis"><span class="title">Game {app_id}</span><div><span class="platform_img win"></span></div></div>
+<div class="col search_released responsive_secondrow">{1 + app_id % 28} Mar, {2010 + app_id % 15}</div>
+<div class="col search_reviewscore responsive_secondrow"><span class="search_review_summary positive" data-tooltip-html="{summary}&lt;br&gt;{60 + app_id % 40}% of the {100 + app_id % 9000:,} user reviews for this game are positive."></span></div>
+<div class="col search_price_discount_combined responsive_secondrow" data-price-final="{final}"><div class="search_discount_and_price responsive_secondrow">{price_block}</div></div>
+</div>
+<div style="clear: left;"></div>
+</a>
+"""
+
+
+class SyntheticStoreSource:
+    """Data source that parses synthetic pages instead of fetching them."""
+    def __init__(self, **page_kwargs):
+        from steamscraper.steam_data.store_html import StoreHtmlDataSource
+        self._parser = StoreHtmlDataSource()
+        self._page_kwargs = page_kwargs
+
+    def get_data(self, identifier, **kwargs):
+        return self._parser.parse_static_content(synthetic_store_page(int(identifier), **self._page_kwargs))
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from synthetic_pages import SyntheticStoreSource
+from steamscraper.steam_crawl.bounded_crawl import JsonLinesSink, MemoryBoundedCrawler, current_rss
+
+
+class SlowSource:
+    def __init__(self, delay=0.005, fail_ids=()):
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def get_data(self, identifier, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if identifier in self.fail_ids:
+            return None
+        return {'id': identifier, 'kwargs': kwargs}
+
+def test_results_are_streamed_to_sink(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    source = SlowSource(fail_ids={3})
+    with JsonLinesSink(str(path)) as sink:
+        stats = MemoryBoundedCrawler(source, sink, max_workers=4, source_kwargs={'lang': 'english'}).run(range(20))
+    assert stats.processed == 19 and stats.failed == 1
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert sorted(line['id'] for line in lines) == [i for i in range(20) if i != 3]
+    assert lines[0]['data']['kwargs'] == {'lang': 'english'}
+
+def test_input_is_consumed_lazily():
+    pulled = []
+
+    def identifiers():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    source = SlowSource(delay=0.01)
+    sunk = []
+    seen_ahead = []
+
+    def sink(identifier, record):
+        seen_ahead.append(len(pulled) - len(sunk))
+        sunk.append(identifier)
+
+    MemoryBoundedCrawler(source, sink, max_workers=2, max_in_flight=4).run(identifiers())
+    assert source.max_active <= 2
+    # The producer never runs more than max_in_flight (+1 waiting for a slot) ahead of the sink
+    assert max(seen_ahead) <= 5
+
+def test_backpressure_pauses_fetching_near_ceiling():
+    rss_values = iter([100, 950, 950, 700] + [100] * 1000)
+    source = SlowSource(delay=0.01)
+    stats = MemoryBoundedCrawler(source, lambda i, r: None, memory_limit_mb=1000 / 2**20,
+                                 max_workers=4, check_every=8, rss=lambda: next(rss_values)).run(range(40))
+    assert stats.processed == 40
+    assert stats.backpressure_waits == 1
+    assert stats.peak_rss == 950
+
+def test_backpressure_does_not_deadlock_when_nothing_in_flight():
+    stats = MemoryBoundedCrawler(SlowSource(delay=0), lambda i, r: None, memory_limit_mb=1000 / 2**20,
+                                 check_every=1, rss=lambda: 2000).run(range(5))
+    assert stats.processed == 5
+    assert stats.backpressure_waits == 5
+
+def test_store_html_source_decomposes_parse_tree(mocker):
+    from bs4 import BeautifulSoup
+    from synthetic_pages import synthetic_store_page
+    from steamscraper.steam_data.store_html import StoreHtmlDataSource
+
+    decompose = mocker.spy(BeautifulSoup, 'decompose')
+    data = StoreHtmlDataSource().parse_static_content(synthetic_store_page(42))
+    assert data['title'] == 'Game 42'
+    assert decompose.call_count >= 1
+
+def test_soak_rss_stays_flat(tmp_path):
+    """
+    Crawls synthetic pages into a JSON-lines sink and checks that RSS after
+    warm-up does not keep growing. Set STEAMSCRAPER_SOAK_PAGES=50000 for the
+    full soak run.
+    """
+    pages = int(os.environ.get('STEAMSCRAPER_SOAK_PAGES', '2000'))
+    samples = []
+    lock = threading.Lock()
+
+    with JsonLinesSink(str(tmp_path / 'soak.jsonl')) as out:
+        def sink(identifier, record):
+            out(identifier, record)
+            if out.count % max(1, pages // 20) == 0:
+                with lock:
+                    samples.append(current_rss())
+
+        stats = MemoryBoundedCrawler(SyntheticStoreSource(), sink, max_workers=4, memory_limit_mb=1024).run(range(pages))
+
+    assert stats.processed == pages
+    warm = samples[len(samples) // 4]
+    growth = max(samples[len(samples) // 4:]) - warm
+    assert growth < 8 * 1024 * 1024, f"RSS grew by {growth / 2**20:.1f} MiB after warm-up: {samples}"
+
+def test_cli_crawl_mode(tmp_path, mocker):
+    from steamscraper import cli
+
+    ids_file = tmp_path / 'ids.txt'
+    ids_file.write_text('10\n\n20\n30\n', encoding='utf-8')
+    output = tmp_path / 'out.jsonl'
+    mocker.patch.object(cli, 'load_data_source', return_value=SlowSource(delay=0))
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(['--ids-file', str(ids_file), '--output', str(output), '--workers', '2', '--lang', 'schinese'])
+    assert exc.value.code == 0
+    lines = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert sorted(line['id'] for line in lines) == ['10', '20', '30']
+    assert lines[0]['data']['kwargs'] == {'lang': 'schinese'}
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from steamscraper.steam_utils.cache import SingleFlight, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_lru_eviction():
+    """Tests that the least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now most recently used
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_ttl_cache_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set('a', 1)
+    clock.now = 4.9
+    assert cache.get('a') == 1
+    clock.now = 5.0
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+def test_ttl_cache_hit_rate():
+    cache = TTLCache(maxsize=10)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == pytest.approx(2 / 3)
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Tests that concurrent callers with the same key share one execution."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        started.set()
+        release.wait(2)
+        return {'title': 'shared'}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', slow)))
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('k', slow))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    while flight.stats()['coalesced'] < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader] + followers:
+        t.join(2)
+
+    assert len(executions) == 1
+    assert len(results) == 5
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("upstream failed")
+
+    with pytest.raises(ValueError):
+        flight.do('k', boom)
+    assert flight.in_flight() == 0
+    assert flight.do('k', lambda: 42) == 42
@@ -10,6 +10,8 @@ from steamscraper.steam_utils.utils import is_valid_steam_url
 from steamscraper.steam_data.store_html import StoreHtmlDataSource
 from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
 from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_utils.proxy_pool import ProxyPool
+from steamscraper.steam_utils.web_utils import stream_steam_store_html
 
 @pytest.fixture(scope="module")
 def store_soup_fixture():
@@ -355,3 +357,115 @@ def test_combined_data_source_merge_logic(mock_extract, mock_api, mock_html):
     assert data['publisher']['name'] == 'API Pub' # API should fill in missing fields
     assert data['steam_appid'] == 123
     assert data['tags'] == ['HTML Tag1', 'HTML Tag2'] # HTML tags should be present, API tags will be ignored if HTML has them.
+
+@patch('steamscraper.steam_data.store_html.StoreHtmlDataSource.get_data', return_value={'title': 'HTML Title', 'price': 'HTML Price', 'tags': ['Tag']})
+@patch('steamscraper.steam_data.steam_app_details.SteamAppDetailsDataSource.get_data', return_value={'name': 'API Name'})
+def test_combined_data_source_result_cache(mock_api, mock_html):
+    """Tests that repeated lookups are served from the result cache."""
+    ds = CombinedSteamDataSource(cache_size=10)
+    first = ds.get_data("123", lang="english")
+    second = ds.get_data(123, lang="english")
+
+    assert first == second
+    assert mock_html.call_count == 1
+    assert mock_api.call_count == 1
+    stats = ds.cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+    ds.get_data(123, lang="schinese")  # Different language is a different key
+    assert mock_html.call_count == 2
+
+@patch('steamscraper.steam_data.store_html.StoreHtmlDataSource.get_data', return_value={'title': 'HTML Title', 'price': 'HTML Price', 'tags': ['Tag']})
+@patch('steamscraper.steam_data.steam_app_details.SteamAppDetailsDataSource.get_data', return_value={'name': 'API Name'})
+def test_combined_data_source_fields(mock_api, mock_html):
+    """Tests that the fields argument limits the returned keys."""
+    ds = CombinedSteamDataSource()
+    data = ds.get_data(123, fields=['title', 'name', 'missing'])
+    assert data == {'title': 'HTML Title', 'name': 'API Name'}
+
+@patch('steamscraper.steam_data.store_html.StoreHtmlDataSource.get_data', return_value=None)
+@patch('steamscraper.steam_data.steam_app_details.SteamAppDetailsDataSource.get_data', return_value=None)
+def test_combined_data_source_does_not_cache_failures(mock_api, mock_html):
+    ds = CombinedSteamDataSource(cache_size=10)
+    assert ds.get_data(123) is None
+    assert ds.get_data(123) is None
+    assert mock_html.call_count == 2
+
+# --- Tests for streaming store page fetches ---
+class _StreamingResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+    def __init__(self, body: bytes, chunk_size: int = 4096):
+        self.body = body
+        self.encoding = 'utf-8'
+        self.chunks_served = 0
+        self.closed = False
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size=4096):
+        for i in range(0, len(self.body), chunk_size):
+            self.chunks_served += 1
+            yield self.body[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+@patch('requests.get')
+def test_store_html_streaming_terminates_early(mock_get, cyberpunk_html_content, store_soup_fixture):
+    """Tests that streaming stops once the requested sections are parsed and matches the full parse."""
+    body = cyberpunk_html_content.encode('utf-8')
+    response = _StreamingResponse(body)
+    mock_get.return_value = response
+
+    ds = StoreHtmlDataSource(stream=True)
+    data = ds.get_data("1091500", lang="schinese", fields=['title', 'price', 'tags'])
+
+    full = StoreHtmlDataSource._parse_game_details(BeautifulSoup(cyberpunk_html_content, 'html.parser'))
+    assert data == {'title': full['title'], 'price': full['price'], 'tags': full['tags']}
+    assert mock_get.call_args.kwargs['stream'] is True
+    assert response.closed
+    assert response.chunks_served * 16 * 1024 < len(body)
+
+@patch('requests.get')
+def test_store_html_streaming_reads_whole_page_for_missing_section(mock_get, cyberpunk_html_content):
+    """Tests that a section absent from the page makes the stream fall back to the full download."""
+    html = cyberpunk_html_content.replace('game_rating_descriptors', 'renamed_descriptors')
+    response = _StreamingResponse(html.encode('utf-8'))
+    mock_get.return_value = response
+
+    data = StoreHtmlDataSource(stream=True).get_data("1091500", fields=['title', 'content_descriptors'])
+    assert data['title'] == "赛博朋克 2077"
+    assert data['content_descriptors'] == []
+    assert response.chunks_served == -(-len(response.body) // (16 * 1024))
+
+@patch('requests.get')
+def test_store_html_streaming_survives_bogus_charset(mock_get, cyberpunk_html_content):
+    """Tests that an unknown charset falls back to utf-8 and the proxy slot is given back."""
+    response = _StreamingResponse(cyberpunk_html_content.encode('utf-8'))
+    response.encoding = 'x-bogus'
+    mock_get.return_value = response
+    pool = ProxyPool.from_list(['http://p1'], max_concurrency=1)
+
+    data = StoreHtmlDataSource(stream=True, proxy_pool=pool).get_data("1091500", fields=['title'])
+    assert data == {'title': "赛博朋克 2077"}
+    assert pool.stats()['http://p1']['in_flight'] == 0
+
+@patch('requests.get')
+def test_streaming_reads_whole_page_when_stop_when_raises(mock_get, cyberpunk_html_content):
+    response = _StreamingResponse(cyberpunk_html_content.encode('utf-8'))
+    mock_get.return_value = response
+    pool = ProxyPool.from_list(['http://p1'], max_concurrency=1)
+
+    def stop_when(text):
+        raise ValueError("tracker bug")
+
+    streamed = stream_steam_store_html("https://store.steampowered.com/app/1091500/", stop_when, proxy_pool=pool)
+    assert streamed.text == cyberpunk_html_content
+    assert not streamed.terminated_early
+    assert pool.stats()['http://p1']['errors'] == 0
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from steamscraper.steam_data.combined_data import PARTIAL_KEY, CombinedSteamDataSource
+
+
+class FakeLeg:
+    """Stands in for one underlying source with a controllable delay and result."""
+    def __init__(self, result, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def get_data(self, identifier, **kwargs):
+        self.calls += 1
+        self.finished.clear()
+        time.sleep(self.delay)
+        self.finished.set()
+        return dict(self.result) if self.result is not None else None
+
+
+HTML = {'title': 'Game', 'short_description': 'From the store page'}
+API = {'name': 'Game', 'short_description': 'From the API', 'price_overview': {'final': 999}}
+
+def _source(html_delay=0.0, api_delay=0.0, html=HTML, api=API, **kwargs):
+    source = CombinedSteamDataSource(**kwargs)
+    source.store_html_source = FakeLeg(html, html_delay)
+    source.steampowered_api_source = FakeLeg(api, api_delay)
+    return source
+
+def test_complete_within_deadline():
+    source = _source(cache_size=10)
+    data = source.get_data(1, deadline=1.0)
+    assert data == {'title': 'Game', 'short_description': 'From the store page', 'name': 'Game', 'price_overview': {'final': 999}}
+    assert PARTIAL_KEY not in data
+    # Legs ran concurrently and the complete record is cached
+    time.sleep(0.05)
+    assert source.get_data(1, deadline=1.0) == data
+    assert source.steampowered_api_source.calls == 1
+
+def test_slow_leg_returns_partial_and_warms_cache():
+    source = _source(api_delay=0.4, cache_size=10)
+    started = time.monotonic()
+    data = source.get_data(1, deadline=0.1)
+    assert time.monotonic() - started < 0.3
+    assert data['title'] == 'Game' and 'price_overview' not in data
+    assert data[PARTIAL_KEY] == {'pending': ['appdetails'], 'stale': [], 'failed': [], 'missing_fields': []}
+
+    assert source.steampowered_api_source.finished.wait(1)
+    time.sleep(0.05)
+    # The late leg finished in the background and the complete record was cached
+    data = source.get_data(1, deadline=0.1)
+    assert PARTIAL_KEY not in data and data['price_overview'] == {'final': 999}
+    assert source.steampowered_api_source.calls == 1
+
+def test_missing_fields_are_listed():
+    source = _source(api_delay=0.4)
+    data = source.get_data(1, fields=['title', 'price_overview'], deadline=0.1)
+    assert data == {'title': 'Game', PARTIAL_KEY: {'pending': ['appdetails'], 'stale': [], 'failed': [],
+                                                   'missing_fields': ['price_overview']}}
+
+def test_stale_leg_fills_in():
+    source = _source()
+    assert PARTIAL_KEY not in source.get_data(1, deadline=1.0)
+    time.sleep(0.05)
+    source.steampowered_api_source.delay = 0.4
+    data = source.get_data(1, deadline=0.1)
+    assert data['price_overview'] == {'final': 999}
+    assert data[PARTIAL_KEY]['pending'] == ['appdetails'] and data[PARTIAL_KEY]['stale'] == ['appdetails']
+
+def test_late_results_dropped_without_background_completion():
+    source = _source(api_delay=0.3, cache_size=10, background_completion=False, stale_ttl=None)
+    assert PARTIAL_KEY in source.get_data(1, deadline=0.05)
+    assert source.steampowered_api_source.finished.wait(1)
+    time.sleep(0.05)
+    assert len(source.result_cache) == 0
+
+def test_failed_leg_is_reported():
+    source = _source(html=None)
+    data = source.get_data(1, deadline=1.0)
+    assert data['name'] == 'Game'
+    assert data[PARTIAL_KEY]['failed'] == ['store_html'] and data[PARTIAL_KEY]['pending'] == []
+
+def test_nothing_in_time_returns_none():
+    source = _source(html_delay=0.3, api_delay=0.3)
+    assert source.get_data(1, deadline=0.05) is None
+
+def test_concurrent_callers_share_legs():
+    source = _source(api_delay=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(source.get_data(1, deadline=1.0))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4 and all(PARTIAL_KEY not in data for data in results)
+    assert source.steampowered_api_source.calls == 1
+
+def test_close_shuts_down_the_leg_and_hedge_threads():
+    source = _source()
+    assert source.get_data(1, deadline=1.0)['title'] == 'Game'
+    executor = source._executor
+    source.close()
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+    with CombinedSteamDataSource(hedging=True) as source:
+        hedgers = [source.store_html_source.hedger, source.steampowered_api_source.hedger]
+    for hedger in hedgers:
+        with pytest.raises(RuntimeError):
+            hedger.call(lambda cancel: 'page')
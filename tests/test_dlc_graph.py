@@ -0,0 +1,80 @@
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_crawl.dlc_graph import DlcGraphCrawler
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+
+
+def _app(name, app_type='game', dlc=(), packages=(), fullgame=None):
+    data = {'name': name, 'type': app_type, 'is_free': False, 'dlc': list(dlc), 'packages': list(packages)}
+    if fullgame:
+        data['fullgame'] = {'appid': str(fullgame), 'name': 'Base'}
+    return data
+
+@pytest.fixture
+def server():
+    with MockSteamServer() as server:
+        details = {
+            '100': _app('Base', dlc=[101, 102], packages=[500]),
+            '101': _app('DLC 1', 'dlc', packages=[501], fullgame=100),
+            '102': _app('DLC 2', 'dlc', dlc=[103], fullgame=100),
+            '103': _app('DLC 3', 'dlc', fullgame=100),
+        }
+        for app_id, data in details.items():
+            server.details[(app_id, 'english')] = data
+        server.packages['500'] = {'name': 'Base Package', 'apps': [{'id': 100, 'name': 'Base'}], 'price': {'final': 999}}
+        server.packages['501'] = {'name': 'Bundle', 'apps': [{'id': 100, 'name': 'Base'}, {'id': 101, 'name': 'DLC 1'}, {'id': 104, 'name': 'Soundtrack'}]}
+        yield server
+
+def _source(server):
+    return SteamAppDetailsDataSource(store_url=server.url)
+
+def test_graph_is_normalized_and_deduplicated(server):
+    graph = DlcGraphCrawler(_source(server), max_depth=3).crawl(100)
+    data = graph.to_dict()
+
+    assert data['root'] == 'app:100'
+    assert set(data['nodes']) == {'app:100', 'app:101', 'app:102', 'app:103', 'app:104', 'package:500', 'package:501'}
+    assert data['nodes']['app:101'] == {'kind': 'app', 'id': 101, 'depth': 1, 'fetched': True, 'name': 'DLC 1', 'type': 'dlc', 'is_free': False}
+    assert data['nodes']['package:501']['depth'] == 2
+    # 104 is unknown to the store: referenced by the bundle but never fetched successfully
+    assert data['nodes']['app:104']['fetched'] is False
+    assert data['truncated'] == {'failed': 1}
+
+    edges = {(e['from'], e['to'], e['relation']) for e in data['edges']}
+    assert ('app:100', 'app:101', 'dlc') in edges
+    assert ('app:101', 'app:100', 'fullgame') in edges
+    assert ('package:501', 'app:101', 'contains') in edges
+    assert len(edges) == len(data['edges'])
+
+def test_each_node_fetched_once(server, mocker):
+    source = _source(server)
+    get_data = mocker.spy(source, 'get_data')
+    get_packages = mocker.spy(source, 'get_package_details')
+    DlcGraphCrawler(source, max_depth=3).crawl(100)
+
+    fetched_apps = [call.args[0] for call in get_data.call_args_list]
+    assert sorted(fetched_apps) == ['100', '101', '102', '103', '104']
+    # Level 1 has package 500, level 2 has package 501: one batched request per level
+    assert [sorted(call.args[0]) for call in get_packages.call_args_list] == [[500], [501]]
+
+def test_depth_and_fanout_caps(server):
+    graph = DlcGraphCrawler(_source(server), max_depth=1).crawl(100)
+    nodes = graph.to_dict()['nodes']
+    assert nodes['app:101']['fetched'] and nodes['package:500']['fetched']
+    assert nodes['app:103']['fetched'] is False and nodes['package:501']['fetched'] is False
+    assert graph.truncated['depth'] == 2
+
+    graph = DlcGraphCrawler(_source(server), max_depth=3, max_fanout=1).crawl(100)
+    assert graph.truncated['fanout'] >= 2
+    assert 'app:102' not in graph.nodes
+
+def test_node_cap(server):
+    graph = DlcGraphCrawler(_source(server), max_depth=5, max_nodes=2).crawl(100)
+    fetched = [key for key, node in graph.nodes.items() if node['fetched']]
+    assert len(fetched) == 2
+    assert graph.truncated['nodes'] >= 1
+
+def test_get_package_details(server):
+    packages = _source(server).get_package_details([500, 999])
+    assert packages == {500: server.packages['500']}
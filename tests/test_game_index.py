@@ -0,0 +1,110 @@
+import json
+import os
+from datetime import date
+
+import pytest
+
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_index import GameIndex, Range, Term, parse_price, parse_release_date
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'test_data')
+
+
+def _record(tags=(), audio=(), recent=None, price='$9.99', released='1 Jan, 2020', developer='Studio', features=()):
+    return {
+        'tags': list(tags),
+        'features': list(features),
+        'developer': {'name': developer, 'link': None},
+        'language_support': [{'language': lang, 'interface': True, 'full_audio': True, 'subtitles': False} for lang in audio],
+        'reviews': {'recent': {'summary': recent, 'tooltip': ''}} if recent else {},
+        'price': price,
+        'release_date': released,
+    }
+
+@pytest.fixture
+def index():
+    index = GameIndex()
+    index.add(1, _record(tags=['Roguelike', 'Indie'], audio=['Japanese'], recent='Mostly Positive', price='$14.99'))
+    index.add(2, _record(tags=['Roguelike'], audio=['English'], recent='Mostly Positive', price='$4.99', released='5 Mar, 2018'))
+    index.add(3, _record(tags=['RPG'], audio=['Japanese', 'English'], recent='Very Positive', price='Free to Play'))
+    index.add(4, _record(tags=['roguelike'], audio=['Japanese'], recent='Mostly Positive', price='$29.99', released='10 Oct, 2023'))
+    return index
+
+def test_boolean_queries(index):
+    query = Term('tag', 'Roguelike') & Term('audio_language', 'Japanese') & Term('recent_reviews', 'Mostly Positive')
+    assert index.search(query) == [1, 4]
+    assert index.search(Term('tag', 'RPG') | Term('tag', 'Indie')) == [1, 3]
+    assert index.search(~Term('tag', 'roguelike')) == [3]
+    assert index.count(Term('language', 'english')) == 2
+    assert index.search(Term('tag', 'does not exist')) == []
+
+def test_range_queries_and_sorting(index):
+    assert index.search(Range('price', high=15)) == [1, 2, 3]
+    assert index.search(Term('tag', 'Roguelike') & Range('price', 5, 30)) == [1, 4]
+    assert index.search(Range('release_date', low=date(2020, 1, 1))) == [1, 3, 4]
+    assert index.search(Term('tag', 'Roguelike'), sort_by='price') == [2, 1, 4]
+    assert index.search(Term('tag', 'Roguelike'), sort_by='release_date', descending=True, limit=2) == [4, 1]
+
+def test_incremental_update_and_remove(index):
+    index.add(2, _record(tags=['Puzzle'], price='$0.99'))
+    assert index.search(Term('tag', 'Roguelike')) == [1, 4]
+    assert index.search(Term('tag', 'Puzzle')) == [2]
+    assert index.search(Range('price', high=1), sort_by='price') == [3, 2]
+
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert 1 not in index and len(index) == 3
+    assert index.search(Term('tag', 'Roguelike')) == [4]
+    assert index.search(~Term('tag', 'Roguelike')) == [2, 3]
+    assert index.search(Range('price', low=10)) == [4]
+
+    index.add(5, _record(tags=['Roguelike'], audio=['Japanese'], recent='Mostly Positive'))
+    assert index.search(Term('tag', 'Roguelike') & Term('audio_language', 'Japanese')) == [4, 5]
+
+def test_indexes_parsed_store_pages():
+    index = GameIndex()
+    source = StoreHtmlDataSource()
+    for name, app_id in (('Cyberpunk_2077-1091500-schinese.html', 1091500), ('ELDEN_RING-1245620-english.html', 1245620)):
+        with open(os.path.join(TEST_DATA_DIR, name), 'r', encoding='utf-8') as f:
+            index.add(app_id, source.parse_static_content(f.read()))
+
+    assert index.search(Term('developer', 'FromSoftware, Inc.') & Term('recent_reviews', 'very positive')) == [1245620]
+    assert index.search(Term('audio_language', '日语')) == [1091500]
+    assert index.search(Range('release_date', high=date(2021, 1, 1))) == [1091500]
+    assert index.search(Range('price', low=0), sort_by='price', descending=True) == [1245620, 1091500]
+
+def test_indexes_api_shaped_records():
+    with open(os.path.join(TEST_DATA_DIR, 'appdetails_1091500_english.json'), 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    index = GameIndex()
+    index.add(1091500, record)
+    assert index.search(Term('developer', record['developers'][0])) == [1091500]
+    assert index.count(Range('release_date')) == 1
+
+@pytest.mark.parametrize('price, expected', [
+    ('$19.99', 19.99),
+    ('19,99€', 19.99),
+    ('1.234,56€', 1234.56),
+    ('₩ 66,000', 66000.0),
+    ('¥ 298.00', 298.0),
+    ('Free to Play', 0.0),
+    ('免费开玩', 0.0),
+    ('N/A', None),
+])
+def test_parse_price(price, expected):
+    assert parse_price({'price': price}) == expected
+
+def test_parse_price_prefers_price_overview():
+    assert parse_price({'price': '$99.99', 'price_overview': {'final': 1999}}) == 19.99
+    assert parse_price({'price': {'discount_price': '$5.00', 'original_price': '$10.00'}}) == 5.0
+
+def test_parse_release_date():
+    assert parse_release_date({'release_date': '24 Feb, 2022'}) == date(2022, 2, 24).toordinal()
+    assert parse_release_date({'release_date': {'coming_soon': False, 'date': 'Dec 9, 2020'}}) == date(2020, 12, 9).toordinal()
+    assert parse_release_date({'release_date': 'Coming soon'}) is None
+
+def test_unknown_facet_is_rejected():
+    with pytest.raises(ValueError):
+        Term('genre', 'Action')
+    with pytest.raises(ValueError):
+        Range('metacritic', 50)
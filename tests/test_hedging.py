@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.hedging import Hedger, LatencyTracker
+
+
+def _warm(hedger, latency=0.001, n=20):
+    for _ in range(n):
+        hedger.latencies.record(latency)
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95) is None
+    for i in range(1, 201):
+        tracker.record(i / 1000)
+    # Only the last 100 samples are kept
+    assert len(tracker) == 100
+    assert tracker.percentile(50) == 0.15
+    assert tracker.percentile(95) == 0.195
+
+def test_no_hedging_until_enough_samples():
+    hedger = Hedger(min_samples=5)
+    assert hedger.call(lambda cancel: time.sleep(0.02) or 'ok') == 'ok'
+    assert hedger.stats()['hedged'] == 0
+    assert hedger.hedge_delay() is None
+
+def test_slow_primary_is_hedged_and_cancelled():
+    hedger = Hedger(budget=1.0, min_delay=0.001)
+    _warm(hedger)
+    calls = []
+
+    def attempt(cancel):
+        calls.append(cancel)
+        if len(calls) == 1:
+            # The primary is stuck until it is cancelled
+            cancel.wait(5)
+            return 'primary' if not cancel.is_set() else None
+        return 'hedge'
+
+    started = time.perf_counter()
+    assert hedger.call(attempt) == 'hedge'
+    assert time.perf_counter() - started < 1
+    assert calls[0].is_set() and not calls[1].is_set()
+    stats = hedger.stats()
+    assert stats['hedged'] == 1 and stats['hedge_wins'] == 1
+
+def test_failed_attempt_waits_for_the_other():
+    hedger = Hedger(budget=1.0, min_delay=0.001)
+    _warm(hedger)
+    calls = []
+
+    def attempt(cancel):
+        calls.append(cancel)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            return 'primary'
+        return None  # The hedge fails fast
+
+    assert hedger.call(attempt) == 'primary'
+    assert hedger.stats()['hedge_wins'] == 0
+    assert hedger.call(lambda cancel: time.sleep(0.01)) is None
+
+def test_exceptions_propagate_when_every_attempt_fails():
+    hedger = Hedger(budget=1.0, min_delay=0.001)
+    _warm(hedger)
+
+    def attempt(cancel):
+        time.sleep(0.01)
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        hedger.call(attempt)
+
+def test_budget_caps_hedge_rate():
+    hedger = Hedger(budget=0.05, min_delay=0.001)
+    _warm(hedger, latency=0.0001, n=100)
+    for _ in range(100):
+        hedger.call(lambda cancel: time.sleep(0.003) or 'ok')
+    stats = hedger.stats()
+    # One initial token plus 5% of 100 calls
+    assert 1 <= stats['hedged'] <= 6
+    assert stats['hedge_rate'] <= 0.06
+
+@pytest.fixture(scope="module")
+def slow_server():
+    with MockSteamServer(slow_rate=0.3, slow_latency=0.3, seed=3) as server:
+        yield server
+
+def test_hedged_sources_cut_tail_latency(slow_server):
+    # 30% of responses are outliers, so trigger below them
+    hedgers = [Hedger(percentile=75, budget=0.5, min_samples=5), Hedger(percentile=75, budget=0.5, min_samples=5)]
+    html_source = StoreHtmlDataSource(store_url=slow_server.url, hedger=hedgers[0])
+    api_source = SteamAppDetailsDataSource(store_url=slow_server.url, hedger=hedgers[1])
+
+    for _ in range(20):
+        assert html_source.get_data('1245620')['title'] == 'ELDEN RING'
+        assert api_source.get_data('1091500')['name'] == 'Cyberpunk 2077'
+
+    assert sum(hedger.stats()['hedge_wins'] for hedger in hedgers) >= 1
+    assert sum(hedger.stats()['saved_seconds'] for hedger in hedgers) > 0
+    for hedger in hedgers:
+        hedger.close()
+
+def test_closed_hedger_takes_no_more_calls():
+    with Hedger() as hedger:
+        assert hedger.call(lambda cancel: 'page') == 'page'
+    with pytest.raises(RuntimeError):
+        hedger.call(lambda cancel: 'page')
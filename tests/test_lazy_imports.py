@@ -0,0 +1,74 @@
+import subprocess
+import sys
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_modules_after(code: str) -> set:
+    """Runs ``code`` in a fresh interpreter and returns the names in sys.modules."""
+    script = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+def test_package_import_does_not_load_heavy_dependencies():
+    """Importing the package and reading SUPPORTED_LANGUAGES must not import requests or bs4."""
+    modules = _loaded_modules_after("import steamscraper\nsteamscraper.SUPPORTED_LANGUAGES")
+    assert 'requests' not in modules
+    assert 'bs4' not in modules
+    assert 'steamscraper.steam_data.store_html' not in modules
+
+def test_cli_import_does_not_load_sources():
+    """Importing the CLI module must not import any data source."""
+    modules = _loaded_modules_after("import steamscraper.cli")
+    assert 'requests' not in modules
+    assert not any(name.startswith('steamscraper.steam_data.') for name in modules)
+
+def test_selecting_one_source_imports_only_that_source():
+    """Loading the API source must not import the HTML source or bs4."""
+    modules = _loaded_modules_after("from steamscraper.cli import load_data_source\nload_data_source('steampowered-api')")
+    assert 'steamscraper.steam_data.steam_app_details' in modules
+    assert 'steamscraper.steam_data.store_html' not in modules
+    assert 'bs4' not in modules
+
+def test_crawl_package_import_does_not_load_pipelines():
+    """Importing steam_crawl, or one pipeline from it, must not import the others."""
+    modules = _loaded_modules_after("import steamscraper.steam_crawl")
+    assert 'sqlite3' not in modules
+    assert not any(name.startswith('steamscraper.steam_crawl.') for name in modules)
+    modules = _loaded_modules_after("from steamscraper.steam_crawl import RefreshScheduler")
+    assert 'steamscraper.steam_crawl.refresh_scheduler' in modules
+    assert 'steamscraper.steam_crawl.work_queue' not in modules
+
+def test_lazy_attributes_resolve():
+    """Lazily exported names resolve to the real objects."""
+    import steamscraper
+    from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+    from steamscraper.steam_utils.web_utils import fetch_steam_store_html
+
+    assert steamscraper.CombinedSteamDataSource is CombinedSteamDataSource
+    assert steamscraper.fetch_steam_store_html is fetch_steam_store_html
+    assert set(steamscraper.__all__) <= set(dir(steamscraper))
+    with pytest.raises(AttributeError):
+        steamscraper.DoesNotExist
+
+    import steamscraper.steam_crawl as steam_crawl
+    from steamscraper.steam_crawl.work_queue import SQLiteJobQueue
+    assert steam_crawl.SQLiteJobQueue is SQLiteJobQueue
+    assert set(steam_crawl.__all__) == set(steam_crawl._LAZY_EXPORTS)
+
+    import steamscraper.steam_utils as steam_utils
+    assert {'SharedCache', 'web_utils', 'STORE_BASE_URL'} <= set(dir(steam_utils))
+    assert steam_utils.web_utils.SharedSession is steam_utils.SharedSession
+    with pytest.raises(AttributeError, match="'steamscraper.steam_utils' has no attribute 'DoesNotExist'"):
+        steam_utils.DoesNotExist
+
+def test_cli_source_registry_covers_all_choices():
+    """Every CLI --source choice maps to an importable SteamDataSource."""
+    from steamscraper.cli import DATA_SOURCES, load_data_source
+    from steamscraper.steam_data.base import SteamDataSource
+
+    for name in DATA_SOURCES:
+        assert isinstance(load_data_source(name), SteamDataSource)
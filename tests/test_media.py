@@ -0,0 +1,130 @@
+import hashlib
+import os
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_crawl.media import MediaDownloader, MediaStore, collect_media_urls, normalize_media_url
+
+
+@pytest.fixture
+def media_server():
+    with MockSteamServer() as server:
+        server.media['trailer.webm'] = os.urandom(300 * 1024)
+        server.media['trailer_copy.webm'] = server.media['trailer.webm']
+        server.media['shot.jpg'] = os.urandom(20 * 1024)
+        yield server
+
+def test_normalize_media_url():
+    a = "https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/1/ss_1.jpg?t=1749198613"
+    b = "https://shared.akamai.steamstatic.com/store_item_assets/steam/apps/1/ss_1.jpg?t=1749198613"
+    assert normalize_media_url(a) == normalize_media_url(b)
+    assert normalize_media_url(a) != normalize_media_url(a.replace('ss_1', 'ss_2'))
+
+def test_normalize_media_url_keeps_the_asset_version():
+    # Steam bumps t when it replaces an asset under the same path
+    steam = "https://video.fastly.steamstatic.com/store_trailers/1/movie480.webm?t=1&quality=hd"
+    assert normalize_media_url(steam) == "https://steamstatic/store_trailers/1/movie480.webm?t=1&quality=hd"
+    assert normalize_media_url(steam) != normalize_media_url(steam.replace('t=1', 't=2'))
+
+def test_normalize_media_url_keeps_the_query_of_other_hosts():
+    signed = "https://media.example.com/clip.mp4?t=1&sig=abc"
+    assert normalize_media_url(signed) == signed
+    assert normalize_media_url(signed) != normalize_media_url("https://media.example.com/clip.mp4?t=1&sig=def")
+    assert normalize_media_url("https://media.example.com/clip.mp4?t=1") != normalize_media_url("https://media.example.com/clip.mp4?t=2")
+
+def test_collect_media_urls():
+    record = {
+        'header_image': 'h.jpg',
+        'media': {'screenshots': ['s1.jpg'], 'videos': [{'thumbnail': 't.jpg', 'webm_source': 'v.webm', 'mp4_source': ''}]},
+    }
+    assert collect_media_urls(record) == ['h.jpg', 's1.jpg', 't.jpg', 'v.webm']
+
+def test_media_downloader_dedupes(media_server, tmp_path):
+    """Tests URL dedupe before download, hash dedupe after download, and skip on re-run."""
+    store = MediaStore(str(tmp_path))
+    downloader = MediaDownloader(store, max_workers=4)
+    base = f"{media_server.url}/media"
+    # The first two URLs differ only in the fragment, which is not part of the key
+    urls = [f"{base}/trailer.webm", f"{base}/trailer.webm#player", f"{base}/trailer_copy.webm", f"{base}/shot.jpg"]
+
+    report = downloader.download_all(urls)
+    assert report.downloaded == 3
+    assert report.skipped_known == 1
+    assert report.duplicate_content == 1
+    assert report.storage_saved == 300 * 1024
+    assert report.bandwidth_saved == 300 * 1024
+    digest = hashlib.sha256(media_server.media['trailer.webm']).hexdigest()
+    with open(store.object_path(digest), 'rb') as f:
+        assert f.read() == media_server.media['trailer.webm']
+
+    rerun = MediaDownloader(MediaStore(str(tmp_path))).download_all(urls)
+    assert rerun.downloaded == 0
+    assert rerun.skipped_known == 4
+    assert rerun.bandwidth_saved == 3 * 300 * 1024 + 20 * 1024
+
+def test_media_downloader_resumes(media_server, tmp_path):
+    """Tests that an interrupted download resumes with a Range request."""
+    store = MediaStore(str(tmp_path))
+    url = f"{media_server.url}/media/trailer.webm"
+    body = media_server.media['trailer.webm']
+    _interrupt(store, url, body[:100 * 1024], _etag(body))
+
+    report = MediaDownloader(store).download_all([url])
+    assert report.bytes_resumed == 100 * 1024
+    assert report.bytes_downloaded == len(body) - 100 * 1024
+    assert media_server.stats[206] == 1
+    with open(store.object_path(hashlib.sha256(body).hexdigest()), 'rb') as f:
+        assert f.read() == body
+
+def _etag(body):
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+def _interrupt(store, url, partial, validator):
+    """Leaves a partial download of ``url`` in the store, as an interrupted run would."""
+    key = normalize_media_url(url)
+    with open(store.partial_path(key), 'wb') as f:
+        f.write(partial)
+    with open(store.validator_path(key), 'w', encoding='utf-8') as f:
+        f.write(validator)
+
+def test_media_downloader_restarts_when_the_asset_changed(media_server, tmp_path):
+    """Tests that a partial download of an older version is not spliced onto the new one."""
+    store = MediaStore(str(tmp_path))
+    url = f"{media_server.url}/media/trailer.webm"
+    old = os.urandom(300 * 1024)
+    _interrupt(store, url, old[:100 * 1024], _etag(old))
+
+    report = MediaDownloader(store).download_all([url])
+    body = media_server.media['trailer.webm']
+    assert (report.bytes_resumed, report.bytes_downloaded) == (0, len(body))
+    assert media_server.stats[206] == 0
+    assert store.lookup(normalize_media_url(url))['sha256'] == hashlib.sha256(body).hexdigest()
+    assert os.listdir(store.partial_dir) == []
+
+@pytest.mark.parametrize("partial_size, resumed", [(300 * 1024, 300 * 1024), (400 * 1024, 0)])
+def test_media_downloader_checks_the_size_on_416(media_server, tmp_path, partial_size, resumed):
+    """Tests that a 416 completes the download only when the partial file has the full size."""
+    store = MediaStore(str(tmp_path))
+    url = f"{media_server.url}/media/trailer.webm"
+    body = media_server.media['trailer.webm']
+    _interrupt(store, url, (body + os.urandom(100 * 1024))[:partial_size], _etag(body))
+
+    report = MediaDownloader(store).download_all([url])
+    assert report.bytes_resumed == resumed
+    assert media_server.stats[416] == 1
+    assert store.lookup(normalize_media_url(url))['sha256'] == hashlib.sha256(body).hexdigest()
+
+def test_partial_downloads_without_a_validator_start_over(media_server, tmp_path):
+    store = MediaStore(str(tmp_path))
+    url = f"{media_server.url}/media/shot.jpg"
+    with open(store.partial_path(normalize_media_url(url)), 'wb') as f:
+        f.write(b'stale')
+
+    report = MediaDownloader(store).download_all([url])
+    assert (report.bytes_resumed, report.bytes_downloaded) == (0, 20 * 1024)
+
+def test_media_downloader_failure(media_server, tmp_path):
+    report = MediaDownloader(MediaStore(str(tmp_path))).download_all([f"{media_server.url}/media/missing.jpg"])
+    assert report.failed == 1
+    assert report.downloaded == 0
@@ -0,0 +1,46 @@
+import pytest
+import requests
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockSteamServer() as server:
+        yield server
+
+def test_mock_server_store_page(mock_server):
+    """Tests StoreHtmlDataSource end to end against the mock server."""
+    data = StoreHtmlDataSource(store_url=mock_server.url).get_data("1091500", lang="schinese")
+    assert data['title'] == "赛博朋克 2077"
+    assert data['developer']['name'] == "CD PROJEKT RED"
+
+def test_mock_server_appdetails(mock_server):
+    data = SteamAppDetailsDataSource(store_url=mock_server.url).get_data("1091500")
+    assert data['steam_appid'] == 1091500
+    assert data['name'] == "Cyberpunk 2077"
+    assert SteamAppDetailsDataSource(store_url=mock_server.url).get_data("42") is None
+
+def test_mock_server_combined(mock_server):
+    data = CombinedSteamDataSource(store_url=mock_server.url).get_data(1245620, lang="english")
+    assert data['title'] == "ELDEN RING"
+
+def test_mock_server_unknown_app_redirects(mock_server):
+    response = requests.get(f"{mock_server.url}/app/42/", allow_redirects=False)
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/'
+
+def test_mock_server_injected_errors():
+    """Tests that injected 429 and 500 responses surface as failed lookups."""
+    with MockSteamServer(rate_limit_rate=0.5, error_rate=0.5) as server:
+        statuses = {requests.get(f"{server.url}/app/1091500/").status_code for _ in range(20)}
+        assert statuses == {429, 500}
+        assert StoreHtmlDataSource(store_url=server.url).get_data("1091500") is None
+
+def test_mock_server_any_app():
+    with MockSteamServer(any_app=True) as server:
+        data = SteamAppDetailsDataSource(store_url=server.url).get_data("1000001")
+        assert data['steam_appid'] == 1000001
@@ -0,0 +1,108 @@
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.negative_cache import (AGE_CHECK, NOT_FOUND, REDIRECT_HOME, UNSUCCESSFUL,
+                                                     NegativeCache, is_agecheck_page)
+from steamscraper.steam_utils.shared_cache import SharedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def requests_made(server) -> int:
+    return sum(count for status, count in server.stats.items() if status != 'bytes_sent')
+
+
+@pytest.fixture
+def mock_server():
+    with MockSteamServer() as server:
+        server.agecheck_apps.add('1000')
+        server.removed_apps.add('1001')
+        yield server
+
+
+def test_entries_expire_per_reason():
+    clock = FakeClock()
+    cache = NegativeCache(ttl=100, ttls={AGE_CHECK: 10}, clock=clock)
+    cache.record('store_html', 5, REDIRECT_HOME)
+    cache.record('store_html', 6, AGE_CHECK)
+    cache.record('appdetails', 7, UNSUCCESSFUL, region='DE')
+    assert cache.check('store_html', 5) == REDIRECT_HOME
+    assert cache.check('appdetails', 5) is None
+    assert cache.check('appdetails', 7, region='de') == UNSUCCESSFUL
+    assert cache.check('appdetails', 7, region='us') is None
+
+    clock.now += 10
+    assert cache.check('store_html', 6) is None
+    assert cache.check('store_html', 5) == REDIRECT_HOME
+    clock.now += 90
+    assert cache.check('store_html', 5) is None
+
+    stats = cache.stats()
+    assert stats['recorded'] == {REDIRECT_HOME: 1, AGE_CHECK: 1, UNSUCCESSFUL: 1}
+    assert stats['skipped'] == 3
+    assert stats['skipped_by_reason'] == {REDIRECT_HOME: 2, UNSUCCESSFUL: 1}
+    assert stats['skipped_by_source'] == {'store_html': 2, 'appdetails': 1}
+
+
+def test_entries_shared_between_processes(tmp_path):
+    shared = SharedCache(str(tmp_path / 'cache.sqlite'))
+    NegativeCache(shared_cache=shared).record('store_html', 5, NOT_FOUND)
+    other = NegativeCache(shared_cache=SharedCache(str(tmp_path / 'cache.sqlite')))
+    assert other.check('store_html', 5) == NOT_FOUND
+    other.forget('store_html', 5)
+    assert NegativeCache(shared_cache=shared).check('store_html', 5) is None
+
+
+@pytest.mark.parametrize('app_id, reason', [('999999', REDIRECT_HOME), ('1000', AGE_CHECK), ('1001', NOT_FOUND)])
+def test_store_html_classifies_and_skips(mock_server, app_id, reason):
+    cache = NegativeCache()
+    source = StoreHtmlDataSource(store_url=mock_server.url, negative_cache=cache)
+    assert source.get_data(app_id) is None
+    assert cache.check('store_html', app_id) == reason
+
+    before = requests_made(mock_server)
+    assert source.get_data(app_id) is None
+    assert source.get_data(f"https://store.steampowered.com/app/{app_id}/") is None
+    assert requests_made(mock_server) == before
+    assert cache.stats()['skipped_by_source'] == {'store_html': 3}
+
+
+def test_live_apps_are_not_recorded(mock_server):
+    cache = NegativeCache()
+    assert StoreHtmlDataSource(store_url=mock_server.url, negative_cache=cache).get_data('1245620')['title'] == 'ELDEN RING'
+    assert SteamAppDetailsDataSource(store_url=mock_server.url, negative_cache=cache).get_data('1091500')
+    assert len(cache) == 0
+
+
+def test_agecheck_served_in_place_is_detected():
+    assert is_agecheck_page("<div id='app_agegate'><form id='agecheck_form'></form></div>")
+    assert not is_agecheck_page("<div class='game_area_description'>An age check awaits</div>")
+
+
+def test_appdetails_unsuccessful_is_skipped(mock_server):
+    cache = NegativeCache()
+    source = SteamAppDetailsDataSource(store_url=mock_server.url, negative_cache=cache)
+    assert source.get_data('999999') is None
+    before = requests_made(mock_server)
+    assert source.get_data('999999') is None
+    assert requests_made(mock_server) == before
+    assert cache.stats()['skipped_by_reason'] == {UNSUCCESSFUL: 1}
+
+
+def test_combined_skips_dead_apps_without_requests(mock_server):
+    cache = NegativeCache()
+    source = CombinedSteamDataSource(store_url=mock_server.url, negative_cache=cache)
+    assert source.get_data(999999) is None
+    before = requests_made(mock_server)
+    assert source.get_data(999999) is None
+    assert requests_made(mock_server) == before
+    assert source.cache_stats()['negative']['skipped_by_source'] == {'store_html': 1, 'appdetails': 1}
@@ -0,0 +1,94 @@
+"""
+Parse time must grow linearly with every repeated section of a store page.
+
+Each test parses synthetic pages with one section at 0, ``n`` and ``4n``
+items and checks the growth exponent of the section's share of the parse time,
+log((t(4n) - t(0)) / (t(n) - t(0))) / log(4): 1 for a linear parser and 2 for a
+quadratic one (the reference parser's root-level find per video measures about
+1.7 at these sizes). Timings are the best of a few runs with the garbage
+collector off, and a check is repeated before it fails, since timing noise is
+sporadic while a superlinear parser is slow every time.
+"""
+import gc
+import math
+import time
+
+import pytest
+
+from synthetic_pages import synthetic_store_page
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_data.store_html_sections import StoreSectionTracker
+
+MAX_EXPONENT = 1.4
+REPEATS = 3
+ATTEMPTS = 3
+
+
+def best_time(fn, arg) -> float:
+    best = math.inf
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            fn(arg)
+            best = min(best, time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return best
+
+
+def growth_exponent(fn, dimension: str, n: int) -> float:
+    """Lowest growth exponent over up to ``ATTEMPTS`` measurements (stops once one is below the bound)."""
+    pages = [synthetic_store_page(7, **{dimension: size}) for size in (0, n, 4 * n)]
+    exponent = math.inf
+    for _ in range(ATTEMPTS):
+        base, small, large = (best_time(fn, page) for page in pages)
+        exponent = min(exponent, math.log(max(large - base, 1e-9) / max(small - base, 1e-9)) / math.log(4))
+        if exponent < MAX_EXPONENT:
+            break
+    return exponent
+
+
+def parse(html: str) -> dict:
+    return StoreHtmlDataSource().parse_static_content(html)
+
+
+@pytest.mark.parametrize('dimension, n', [
+    ('paragraphs', 1000),
+    ('tags', 150),
+    ('videos', 60),
+    ('screenshots', 100),
+    ('dlcs', 100),
+    ('languages', 100),
+    ('requirements', 1000),
+    ('features', 150),
+])
+def test_parse_time_is_linear(dimension, n):
+    exponent = growth_exponent(parse, dimension, n)
+    assert exponent < MAX_EXPONENT, f"parse time grows like n^{exponent:.2f} in {dimension}"
+
+
+def test_section_tracker_is_linear_on_multi_megabyte_descriptions():
+    def stream(html):
+        # content_descriptors is absent, so the tracker reads the whole page
+        tracker = StoreSectionTracker(['content_descriptors'])
+        for i in range(0, len(html), 16 * 1024):
+            tracker.feed_chunk(html[i:i + 16 * 1024])
+
+    assert len(synthetic_store_page(7, paragraphs=40000)) > 2_000_000
+    exponent = growth_exponent(stream, 'paragraphs', 10000)
+    assert exponent < MAX_EXPONENT, f"section tracking grows like n^{exponent:.2f}"
+
+
+def test_large_sections_are_parsed_completely():
+    data = parse(synthetic_store_page(7, videos=120, screenshots=150, dlcs=300, languages=100, requirements=200, features=40))
+    assert len(data['media']['videos']) == 120
+    assert data['media']['videos'][119]['thumbnail'].endswith('/70119/movie.184x123.jpg')
+    assert len(data['media']['screenshots']) == 150
+    assert len(data['dlcs']) == 300
+    assert data['dlcs'][3] == {'name': 'Game 7 DLC 3', 'price': '$3.99'}
+    assert len(data['language_support']) == 100
+    assert data['language_support'][1] == {'language': 'Language 1', 'interface': True, 'full_audio': True, 'subtitles': True}
+    assert len(data['system_requirements']['win']) == 200
+    assert len(data['features']) == 40
+
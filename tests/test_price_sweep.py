@@ -0,0 +1,71 @@
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_crawl.price_history import PriceHistory, PricePoint
+from steamscraper.steam_crawl.price_sweep import PriceSweeper
+
+
+def _price(final, initial=None, discount=0, currency='USD'):
+    return {'currency': currency, 'initial': initial if initial is not None else final, 'final': final, 'discount_percent': discount}
+
+def test_price_history_stores_only_changes():
+    history = PriceHistory()
+    assert history.record(1, 'US', 100, _price(5999))
+    assert not history.record(1, 'us', 200, _price(5999))
+    assert history.record(1, 'us', 300, _price(2999, 5999, 50))
+    assert not history.record(1, 'us', 400, _price(2999, 5999, 50))
+    assert history.record(1, 'us', 500, _price(5999))
+    assert history.point_count() == 3
+    assert history.currency(1, 'us') == 'USD'
+
+def test_price_history_range_queries():
+    history = PriceHistory()
+    for ts, final in [(100, 5999), (300, 2999), (500, 5999), (700, 1999)]:
+        history.record(1, 'us', ts, _price(final))
+
+    # The price in effect at the start of the range is included
+    assert [p.final for p in history.history(1, 'us', start=350, end=600)] == [2999, 5999]
+    assert [p.timestamp for p in history.history(1, 'us', end=300)] == [100, 300]
+    assert history.history(1, 'de') == []
+    assert history.price_at(1, 'us', 299) == PricePoint(100, 5999, 5999, 0)
+    assert history.price_at(1, 'us', 50) is None
+
+def test_price_history_rejects_out_of_order():
+    history = PriceHistory()
+    history.record(1, 'us', 100, _price(5999))
+    with pytest.raises(ValueError):
+        history.record(1, 'us', 50, _price(4999))
+
+def test_price_history_round_trip(tmp_path):
+    """Tests that the delta-encoded file format round-trips and stays compact."""
+    history = PriceHistory()
+    for app_id in range(50):
+        for region in ('us', 'de', 'jp'):
+            for step in range(20):
+                history.record(app_id, region, 1700000000 + step * 3600 * 6, _price(5999 - (step % 3) * 1000, 5999, (step % 3) * 15))
+    path = tmp_path / 'prices.bin'
+    history.save(str(path))
+    loaded = PriceHistory.load(str(path))
+
+    assert loaded.point_count() == history.point_count()
+    for app_id, region in history.series_keys():
+        assert loaded.history(app_id, region) == history.history(app_id, region)
+    assert path.stat().st_size / history.point_count() < 10  # bytes per stored change
+
+def test_price_sweep_against_mock_server():
+    """Tests a multi-region sweep with batching and change detection."""
+    with MockSteamServer(any_app=True) as server:
+        server.price_overrides[('1091500', 'us')] = _price(5999)
+        server.price_overrides[('1091500', 'de')] = _price(5999, currency='EUR')
+        sweeper = PriceSweeper(store_url=server.url, batch_size=2, max_workers=4)
+        history = PriceHistory()
+
+        stats = sweeper.sweep_into(history, [1091500, 1000001, 1000002], ['US', 'DE'], timestamp=100)
+        assert stats == {'observations': 6, 'changes': 6, 'failed_batches': 0}
+        assert server.stats[200] == 4  # two batches per region
+
+        server.price_overrides[('1091500', 'us')] = _price(2999, 5999, 50)
+        stats = sweeper.sweep_into(history, [1091500, 1000001, 1000002], ['US', 'DE'], timestamp=200)
+        assert stats['changes'] == 1
+        assert [p.final for p in history.history(1091500, 'us')] == [5999, 2999]
+        assert history.currency(1091500, 'de') == 'EUR'
@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.server import ScraperService
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_utils.priority_lanes import (CRAWL, INTERACTIVE, LaneConfig, PriorityLanes, current_lane,
+                                                     fetch_lane, submit_in_context)
+from steamscraper.steam_utils.rate_limit import TokenBucket
+from steamscraper.steam_utils.web_utils import SharedSession
+
+
+def _wait_queued(lanes, lane, n, timeout=5):
+    deadline = time.monotonic() + timeout
+    while lanes.stats()['lanes'][lane]['queued'] < n:
+        assert time.monotonic() < deadline, f"{lane} never queued {n} requests"
+        time.sleep(0.005)
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockSteamServer() as server:
+        yield server
+
+def test_lanes_share_grants_by_weight():
+    lanes = PriorityLanes({'hold': LaneConfig(), 'a': LaneConfig(weight=3.0), 'b': LaneConfig()},
+                          max_concurrency=1, default_lane='hold')
+    order = []
+
+    def worker(lane):
+        with lanes.slot(lane):
+            order.append(lane)
+
+    lanes.acquire('hold')
+    threads = [threading.Thread(target=worker, args=(lane,)) for lane in 'ab' for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    _wait_queued(lanes, 'a', 4)
+    _wait_queued(lanes, 'b', 4)
+    lanes.release('hold')
+    for thread in threads:
+        thread.join(5)
+    # Both lanes join at the same virtual time; 'a' then gets three grants for every one of 'b'
+    assert order == ['a', 'b', 'a', 'a', 'a', 'b', 'b', 'b']
+    assert lanes.stats()['lanes']['a']['granted'] == 4
+
+def test_interactive_request_skips_the_crawl_backlog():
+    lanes = PriorityLanes(max_concurrency=16, rate_limiter=TokenBucket(rate=20, burst=1))
+    lanes.acquire(CRAWL)
+    lanes.release(CRAWL)
+    crawl = [threading.Thread(target=lanes.acquire, args=(CRAWL,)) for _ in range(10)]
+    for thread in crawl:
+        thread.start()
+    _wait_queued(lanes, CRAWL, 8)
+
+    # The crawl backlog needs ~0.5s of tokens; an interactive request only waits for the next one or two
+    assert lanes.acquire(INTERACTIVE) < 0.2
+    assert lanes.stats()['lanes'][CRAWL]['queued'] > 0
+    for thread in crawl:
+        thread.join(5)
+    stats = lanes.stats()['lanes']
+    assert stats[CRAWL]['granted'] == 11 and stats[INTERACTIVE]['granted'] == 1
+    assert stats[CRAWL]['max_wait'] > stats[INTERACTIVE]['max_wait']
+
+def test_reserved_slots_are_kept_for_their_lane():
+    lanes = PriorityLanes({INTERACTIVE: LaneConfig(reserved=1), CRAWL: LaneConfig()}, max_concurrency=2)
+    lanes.acquire(CRAWL)
+    blocked = threading.Thread(target=lanes.acquire, args=(CRAWL,))
+    blocked.start()
+    _wait_queued(lanes, CRAWL, 1)
+    assert lanes.acquire(INTERACTIVE) < 0.1
+    assert lanes.stats()['lanes'][CRAWL]['in_flight'] == 1
+
+    lanes.release(CRAWL)
+    blocked.join(5)
+    assert lanes.stats()['lanes'][CRAWL]['in_flight'] == 1
+
+def test_fetch_lane_follows_the_context():
+    assert current_lane() is None
+    with ThreadPoolExecutor(max_workers=1) as executor, fetch_lane(CRAWL):
+        assert current_lane() == CRAWL
+        assert submit_in_context(executor, current_lane).result() == CRAWL
+        assert executor.submit(current_lane).result() is None
+    assert current_lane() is None
+
+def test_invalid_lane_configuration():
+    with pytest.raises(ValueError):
+        PriorityLanes({CRAWL: LaneConfig()})
+    with pytest.raises(ValueError):
+        PriorityLanes({INTERACTIVE: LaneConfig(weight=0)})
+    with pytest.raises(ValueError):
+        PriorityLanes({INTERACTIVE: LaneConfig(reserved=3)}, max_concurrency=2)
+    with pytest.raises(ValueError):
+        PriorityLanes().acquire('bulk')
+
+def test_shared_session_admits_requests_per_lane(mock_server):
+    lanes = PriorityLanes(max_concurrency=4, rate_limiter=TokenBucket(1000, burst=1000))
+    with SharedSession(pool_size=4, lanes=lanes) as session:
+        source = CombinedSteamDataSource(store_url=mock_server.url, session=session)
+        with fetch_lane(CRAWL):
+            assert source.get_data('1091500', lang='schinese')['title']
+        assert SteamAppDetailsDataSource(store_url=mock_server.url, session=session).get_data('1091500')
+
+    stats = lanes.stats()['lanes']
+    # Both legs of the combined lookup ran on the worker pool, still in the crawl lane
+    assert stats[CRAWL]['granted'] == 2
+    assert stats[INTERACTIVE]['granted'] == 1
+    assert stats[CRAWL]['in_flight'] == stats[INTERACTIVE]['in_flight'] == 0
+
+def test_service_runs_batches_in_the_crawl_lane(mock_server):
+    lanes = PriorityLanes(max_concurrency=4)
+    with SharedSession(pool_size=4, lanes=lanes) as session:
+        service = ScraperService(SteamAppDetailsDataSource(store_url=mock_server.url, session=session),
+                                 max_workers=2, lanes=lanes)
+        assert service.get(1091500)
+        assert dict(service.get_many([1091500, 1245620], fields=('name',)))[1091500]['name']
+        stats = service.stats()['lanes']['lanes']
+    assert stats[INTERACTIVE]['granted'] == 1
+    assert stats[CRAWL]['granted'] == 2
@@ -0,0 +1,132 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from steamscraper.steam_utils.proxy_pool import NoProxyAvailableError, ProxyPool
+from steamscraper.steam_utils.web_utils import fetch_steam_store_html
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_proxy_pool_from_file(tmp_path):
+    """Tests that proxies are loaded from a file, skipping comments and blank lines."""
+    proxy_file = tmp_path / 'proxies.txt'
+    proxy_file.write_text("# egress pool\nhttp://p1:8080\n\nhttp://p2:8080\nhttp://p1:8080\n", encoding='utf-8')
+    pool = ProxyPool.from_file(str(proxy_file))
+    assert len(pool) == 2
+    assert pool.healthy_proxies() == ['http://p1:8080', 'http://p2:8080']
+
+def test_proxy_pool_requires_proxies():
+    with pytest.raises(ValueError):
+        ProxyPool.from_list([])
+
+def test_proxy_pool_spreads_load():
+    """Tests that concurrent leases go to the least loaded proxy."""
+    pool = ProxyPool.from_list(['http://p1', 'http://p2'], max_concurrency=2)
+    leases = [pool.acquire() for _ in range(4)]
+    assert sorted(lease.url for lease in leases) == ['http://p1', 'http://p1', 'http://p2', 'http://p2']
+    with pytest.raises(NoProxyAvailableError):
+        pool.acquire(timeout=0.01)
+    leases[0].release()
+    assert pool.acquire(timeout=0.01).url == leases[0].url
+
+def test_proxy_pool_blocks_until_slot_frees():
+    """Tests that acquire waits for a release when every proxy is at its concurrency cap."""
+    pool = ProxyPool.from_list(['http://p1'], max_concurrency=1)
+    lease = pool.acquire()
+    threading.Timer(0.05, lease.release).start()
+    assert pool.acquire(timeout=2).url == 'http://p1'
+
+def test_proxy_pool_ejects_and_readmits():
+    """Tests that a failing proxy is ejected and re-admitted after the cooldown."""
+    clock = FakeClock()
+    pool = ProxyPool.from_list(['http://bad', 'http://good'], max_concurrency=10, min_requests=3,
+                               max_error_rate=0.5, eject_seconds=30, clock=clock)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            with _lease_on(pool, 'http://bad'):
+                raise RuntimeError("proxy refused")
+    assert pool.healthy_proxies() == ['http://good']
+    assert pool.stats()['http://bad']['ejections'] == 1
+    assert pool.acquire().url == 'http://good'
+
+    clock.now += 31
+    assert pool.healthy_proxies() == ['http://bad', 'http://good']
+    assert pool.stats()['http://bad']['error_rate'] == 0.0
+
+def _lease_on(pool, url):
+    """Acquires leases until one lands on ``url``, releasing the others."""
+    others = []
+    while True:
+        lease = pool.acquire()
+        if lease.url == url:
+            for other in others:
+                other.release()
+            return lease
+        others.append(lease)
+
+def test_proxy_pool_stats():
+    clock = FakeClock()
+    pool = ProxyPool.from_list(['http://p1'], clock=clock)
+    lease = pool.acquire()
+    clock.now += 0.2
+    lease.release(success=True)
+    clock.now += 0.8
+    stats = pool.stats()['http://p1']
+    assert stats['requests'] == 1
+    assert stats['errors'] == 0
+    assert stats['avg_latency_ms'] == pytest.approx(200)
+    assert stats['throughput_rps'] == pytest.approx(1.0)
+
+@patch('requests.get')
+def test_fetch_steam_store_html_uses_proxy_pool(mock_get):
+    """Tests that fetch_steam_store_html routes through the pool and records failures."""
+    mock_get.return_value.text = "<html></html>"
+    mock_get.return_value.raise_for_status.return_value = None
+    pool = ProxyPool.from_list(['http://p1'])
+
+    assert fetch_steam_store_html("https://store.steampowered.com/app/1/", proxy_pool=pool) == "<html></html>"
+    assert mock_get.call_args.kwargs['proxies'] == {'http': 'http://p1', 'https': 'http://p1'}
+
+    mock_get.return_value.raise_for_status.side_effect = requests.exceptions.RequestException("429")
+    assert fetch_steam_store_html("https://store.steampowered.com/app/1/", proxy_pool=pool) is None
+    stats = pool.stats()['http://p1']
+    assert stats['requests'] == 2
+    assert stats['errors'] == 1
+    assert stats['in_flight'] == 0
+
+@patch('requests.get')
+def test_app_details_uses_proxy_pool(mock_get):
+    mock_get.return_value.json.return_value = {"1": {"success": True, "data": {"steam_appid": 1}}}
+    mock_get.return_value.raise_for_status.return_value = None
+    pool = ProxyPool.from_list(['http://p1', 'http://p2'])
+
+    ds = SteamAppDetailsDataSource(proxy_pool=pool)
+    assert ds.get_data("1") == {"steam_appid": 1}
+    assert mock_get.call_args.kwargs['proxies']['https'] in ('http://p1', 'http://p2')
+    assert sum(s['requests'] for s in pool.stats().values()) == 1
+
+@patch('requests.get')
+def test_fetch_releases_the_lease_when_the_callback_raises(mock_get):
+    """Tests that an exception other than a RequestException still frees the proxy slot."""
+    mock_get.return_value.text = "<html></html>"
+    pool = ProxyPool.from_list(['http://p1'], max_concurrency=1)
+
+    def on_response(response):
+        raise ValueError("bad response")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fetch_steam_store_html("https://store.steampowered.com/app/1/", proxy_pool=pool, on_response=on_response)
+    stats = pool.stats()['http://p1']
+    assert (stats['in_flight'], stats['requests'], stats['errors']) == (0, 2, 2)
+    assert pool.acquire(timeout=0.01).url == 'http://p1'
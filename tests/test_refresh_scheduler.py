@@ -0,0 +1,168 @@
+import time
+
+import pytest
+
+from steamscraper.steam_crawl.refresh_scheduler import RefreshScheduler, is_discounted, review_count
+from steamscraper.steam_utils.rate_limit import TokenBucket
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _record(version=0, reviews=0, discounted=False):
+    tooltip = f"90% of the {reviews:,} user reviews for this game are positive."
+    price = {'discount_price': '$5', 'original_price': '$10'} if discounted else '$10'
+    return {'title': 'Game', 'short_description': f'v{version}', 'price': price,
+            'reviews': {'all': {'summary': 'Positive', 'tooltip': tooltip}}}
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def scheduler(clock):
+    return RefreshScheduler(requests_per_hour=3600, burst=1000, base_interval=DAY, min_interval=HOUR, clock=clock)
+
+def test_review_count_and_discount():
+    assert review_count(_record(reviews=123456)) == 123456
+    assert review_count({'reviews': {'all': {'tooltip': '过去 30 天内的 9,329 篇用户评测中有 95% 为好评。'}}}) == 9329
+    assert review_count({'recommendations': {'total': 42}}) == 42
+    assert review_count({}) == 0
+    assert is_discounted(_record(discounted=True))
+    assert is_discounted({'price_overview': {'discount_percent': 50}})
+    assert not is_discounted({'price_overview': {'discount_percent': 0}})
+    assert not is_discounted(_record())
+
+def _refresh(scheduler, clock, app_id, versions):
+    """Fetches app_id whenever due, returning the list of intervals between fetches."""
+    intervals = []
+    for version in versions:
+        clock.now = scheduler.state(app_id).next_due
+        before = scheduler.state(app_id).last_fetched
+        scheduler.record_fetch(app_id, _record(version))
+        if before is not None:
+            intervals.append(clock.now - before)
+    return intervals
+
+def test_intervals_adapt_to_change_rate(scheduler, clock):
+    scheduler.add([1, 2])
+    changing = _refresh(scheduler, clock, 1, range(10))
+    static = _refresh(scheduler, clock, 2, [0] * 10)
+    assert changing[-1] < changing[0]
+    assert static[-1] > static[0]
+    assert scheduler.state(1).change_rate > scheduler.state(2).change_rate
+    assert scheduler.state(1).changes == 9 and scheduler.state(2).changes == 0
+
+def test_intervals_are_clamped(clock):
+    scheduler = RefreshScheduler(base_interval=DAY, min_interval=HOUR, max_interval=2 * DAY, clock=clock)
+    scheduler.add([1, 2])
+    for interval in _refresh(scheduler, clock, 1, range(30)) + _refresh(scheduler, clock, 2, [0] * 30):
+        assert HOUR - 1e-6 <= interval <= 2 * DAY + 1e-6
+
+def test_failures_back_off(scheduler, clock):
+    scheduler.add([1])
+    scheduler.record_fetch(1, None)
+    first = scheduler.state(1).next_due
+    scheduler.record_fetch(1, None)
+    assert scheduler.state(1).next_due - clock.now == 2 * (first - clock.now)
+    scheduler.record_fetch(1, _record())
+    assert scheduler.state(1).failures == 0
+
+def test_popular_and_discounted_apps_come_first(scheduler, clock):
+    scheduler.add([1, 2, 3])
+    scheduler.record_fetch(1, _record(reviews=10))
+    scheduler.record_fetch(2, _record(reviews=100000))
+    scheduler.record_fetch(3, _record(reviews=10, discounted=True))
+    assert scheduler.weight(scheduler.state(2)) > scheduler.weight(scheduler.state(1))
+    assert scheduler.weight(scheduler.state(3)) == 2 * scheduler.weight(scheduler.state(1))
+
+    clock.now = 30 * DAY
+    assert scheduler.due() == [2, 3, 1]
+    assert scheduler.due(limit=1) == [2]
+
+def test_budget_limits_batches(clock):
+    scheduler = RefreshScheduler(requests_per_hour=3600, burst=5, clock=clock)
+    scheduler.add(range(20))
+    assert len(scheduler.next_batch(max_size=50)) == 5
+    assert scheduler.next_batch(max_size=50) == []
+    clock.now += 3
+    assert len(scheduler.next_batch(max_size=50)) == 3
+    # Unfetched apps stay due
+    assert len(scheduler.due()) == 20
+
+def test_removed_apps_are_not_due(scheduler):
+    scheduler.add([1, 2])
+    assert scheduler.remove(1)
+    assert not scheduler.remove(1)
+    assert scheduler.due() == [2]
+
+def test_save_and_load(scheduler, clock, tmp_path):
+    scheduler.add([1, 2])
+    _refresh(scheduler, clock, 1, range(3))
+    path = str(tmp_path / 'schedule.json')
+    scheduler.save(path)
+
+    restored = RefreshScheduler(base_interval=DAY, clock=clock)
+    restored.load(path)
+    assert len(restored) == 2
+    assert restored.state(1).to_dict() == scheduler.state(1).to_dict()
+    clock.now = scheduler.state(1).next_due
+    assert 1 in restored.due()
+
+def test_run_once(scheduler, clock):
+    class Source:
+        def get_data(self, identifier, lang='english'):
+            if identifier == '3':
+                raise ValueError('boom')
+            return _record(version=clock.now)
+
+    scheduler.add([1, 2, 3])
+    assert scheduler.run_once(Source()) == {'fetched': 3, 'changed': 0, 'failed': 1}
+    clock.now = 30 * DAY
+    # The failed app is retried once its backoff has passed
+    assert scheduler.run_once(Source(), lang='english') == {'fetched': 3, 'changed': 2, 'failed': 1}
+    assert scheduler.stats()['changes'] == 2
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(rate=2, burst=4, clock=clock)
+    assert all(bucket.try_acquire() for _ in range(4))
+    assert not bucket.try_acquire()
+    clock.now += 1
+    assert bucket.available() == 2
+    assert bucket.try_acquire(2)
+    assert bucket.stats()['granted'] == 5
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_batches_from_a_large_due_set_do_not_rescan_it(clock):
+    scheduler = RefreshScheduler(requests_per_hour=3600, burst=10 ** 6, base_interval=DAY, min_interval=HOUR, clock=clock)
+    scheduler.add(range(100000))
+    scheduler.record_fetch(99999, _record(reviews=100000))
+    clock.now = 30 * DAY
+    # The first call moves every app into the due set
+    assert scheduler.due(limit=1) == [99999]
+
+    calls = []
+    priority = scheduler.priority
+    scheduler.priority = lambda state, now: calls.append(state.app_id) or priority(state, now)
+    started = time.perf_counter()
+    drained = []
+    for _ in range(20):
+        batch = scheduler.next_batch(max_size=50)
+        for app_id in batch:
+            scheduler.record_fetch(app_id, _record())
+        drained.extend(batch)
+    elapsed = time.perf_counter() - started
+    assert len(drained) == len(set(drained)) == 1000
+    assert drained[0] == 99999
+    # Refetched apps leave the due set without re-ranking the remaining ones
+    assert calls == []
+    assert elapsed < 1.0
@@ -0,0 +1,69 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.steam_reviews import SteamReviewsDataSource
+
+
+@pytest.fixture(scope="module")
+def reviews_server():
+    with MockSteamServer(reviews_per_app=250) as server:
+        yield server
+
+def test_reviews_iterates_all_pages(reviews_server):
+    """Tests that the generator follows the cursor until the last page."""
+    ds = SteamReviewsDataSource(store_url=reviews_server.url, num_per_page=100)
+    pages = list(ds.iter_pages("1091500"))
+    assert [len(p.reviews) for p in pages] == [100, 100, 50]
+    assert pages[0].query_summary['total_reviews'] == 250
+    assert list(ds.iter_reviews("1091500", cursor=pages[-1].next_cursor)) == []
+    ids = [r['recommendationid'] for p in pages for r in p.reviews]
+    assert len(set(ids)) == 250
+
+def test_reviews_resume_from_cursor(reviews_server):
+    """Tests that a crawl resumed from a saved cursor continues where it left off."""
+    ds = SteamReviewsDataSource(store_url=reviews_server.url, num_per_page=100)
+    first = next(ds.iter_pages("1091500"))
+    resumed = list(ds.iter_reviews("1091500", cursor=first.next_cursor))
+    assert len(resumed) == 150
+    assert resumed[0]['review'] == "Synthetic review 100 for app 1091500."
+
+def test_reviews_max_reviews_and_get_data(reviews_server):
+    ds = SteamReviewsDataSource(store_url=reviews_server.url, num_per_page=40)
+    assert len(list(ds.iter_reviews("1091500", max_reviews=55))) == 55
+
+    data = ds.get_data("1091500", max_reviews=60)
+    assert len(data['reviews']) == 60
+    assert data['query_summary']['total_reviews'] == 250
+    # The second page was cut short, so the cursor points back at it
+    assert next(ds.iter_reviews("1091500", cursor=data['cursor']))['review'] == "Synthetic review 40 for app 1091500."
+
+def test_reviews_prefetches_next_page():
+    """Tests that the next page is requested while the caller still holds the current one."""
+    fetched = []
+    second_requested = threading.Event()
+
+    def fake_fetch(self, app_id, cursor, lang, review_filter):
+        fetched.append(cursor)
+        if cursor == 'c1':
+            second_requested.set()
+            return {'success': 1, 'reviews': [{'n': 2}], 'cursor': 'c1'}
+        return {'success': 1, 'reviews': [{'n': 1}], 'cursor': 'c1', 'query_summary': {}}
+
+    with patch.object(SteamReviewsDataSource, '_fetch_page', fake_fetch):
+        pages = SteamReviewsDataSource().iter_pages("10")
+        first = next(pages)
+        assert first.reviews == [{'n': 1}]
+        assert second_requested.wait(2)
+        assert [p.reviews for p in pages] == [[{'n': 2}]]
+    assert fetched == ['*', 'c1']
+
+@patch('requests.get')
+def test_reviews_unsuccessful_response(mock_get):
+    mock_get.return_value.raise_for_status.return_value = None
+    mock_get.return_value.json.return_value = {'success': 2}
+    ds = SteamReviewsDataSource()
+    assert list(ds.iter_pages("10")) == []
+    assert ds.get_data("10") is None
@@ -0,0 +1,124 @@
+import json
+import socket
+import threading
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from mock_steam_server import MockSteamServer
+from steamscraper.server import MAX_BODY_BYTES, WIRE_CONTENT_TYPE, ScraperService, SteamScraperServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.steam_app_details import SteamAppDetailsDataSource
+from steamscraper.steam_utils.rate_limit import TokenBucket
+from steamscraper.steam_utils.web_utils import SharedSession
+from steamscraper.steam_utils.wire_format import WireDecoder
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockSteamServer(latency=0.02) as server:
+        yield server
+
+@pytest.fixture
+def session():
+    with SharedSession(pool_size=8, rate_limiter=TokenBucket(1000, burst=1000)) as session:
+        yield session
+
+@pytest.fixture
+def server(mock_server, session):
+    source = CombinedSteamDataSource(store_url=mock_server.url, session=session)
+    with SteamScraperServer(ScraperService(source, max_workers=4, rate_limiter=session.rate_limiter), port=0) as server:
+        yield server
+
+def test_app_lookup_with_fields(server):
+    response = requests.get(f"{server.url}/app/1245620", params={'fields': 'title,developer'})
+    assert response.status_code == 200
+    assert response.json() == {'title': 'ELDEN RING', 'developer': response.json()['developer']}
+
+    response = requests.get(f"{server.url}/app/1091500", params={'lang': 'schinese', 'fields': 'title'})
+    assert response.json() == {'title': '赛博朋克 2077'}
+
+def _post_with_length(server, length: str) -> bytes:
+    """Sends a POST with a raw Content-Length header and returns the start of the response."""
+    address = urlparse(server.url)
+    with socket.create_connection((address.hostname, address.port), timeout=5) as sock:
+        sock.sendall(f"POST /apps HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n{{}}".encode())
+        return sock.recv(64)
+
+def test_bad_requests(server):
+    assert requests.get(f"{server.url}/app/abc").status_code == 400
+    assert requests.get(f"{server.url}/app/1245620", params={'lang': 'klingon'}).status_code == 400
+    assert requests.get(f"{server.url}/apps", params={'ids': '1,x'}).status_code == 400
+    assert requests.post(f"{server.url}/apps", data=b'not json').status_code == 400
+    for length in ('abc', '-1'):
+        assert _post_with_length(server, length).startswith(b'HTTP/1.1 400 ')
+    assert _post_with_length(server, str(MAX_BODY_BYTES + 1)).startswith(b'HTTP/1.1 413 ')
+    assert requests.get(f"{server.url}/nope").status_code == 404
+
+def test_missing_app_is_404(mock_server, session):
+    source = SteamAppDetailsDataSource(store_url=mock_server.url, session=session)
+    with SteamScraperServer(ScraperService(source), port=0) as server:
+        assert requests.get(f"{server.url}/app/42").status_code == 404
+
+def test_concurrent_clients_share_cache_and_upstream_calls(server, mock_server):
+    before = sum(mock_server.stats[status] for status in (200, 302))
+    barrier = threading.Barrier(8)
+
+    def client():
+        barrier.wait()
+        return requests.get(f"{server.url}/app/1245620", params={'fields': 'title'}).json()
+
+    threads_results = []
+    threads = [threading.Thread(target=lambda: threads_results.append(client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert threads_results == [{'title': 'ELDEN RING'}] * 8
+    requests.get(f"{server.url}/app/1245620", params={'fields': 'title'})
+
+    stats = requests.get(f"{server.url}/stats").json()
+    # One lookup = one store page + one appdetails request
+    assert stats['upstream_lookups'] == 1
+    assert sum(mock_server.stats[status] for status in (200, 302)) - before == 2
+    assert stats['app_requests'] == 9
+    assert stats['cache']['hits'] >= 1
+    assert stats['rate_limit']['granted'] == 2
+
+def test_batch_streams_json_lines(server):
+    with requests.get(f"{server.url}/apps", params={'ids': '1245620,1091500,42', 'fields': 'title'}, stream=True) as response:
+        assert response.headers['Transfer-Encoding'] == 'chunked'
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+    results = {line['app_id']: line['data'] for line in lines}
+    assert set(results) == {1245620, 1091500, 42}
+    assert results[1245620] == {'title': 'ELDEN RING'}
+
+    response = requests.post(f"{server.url}/apps", json={'ids': [1245620], 'fields': ['title']})
+    assert [json.loads(line) for line in response.iter_lines() if line] == [{'app_id': 1245620, 'data': {'title': 'ELDEN RING'}}]
+
+    stats = requests.get(f"{server.url}/stats").json()
+    assert stats['batch_requests'] == 2 and stats['batch_apps'] == 4
+
+def test_batch_streams_wire_frames(server):
+    params = {'ids': '1245620,1091500', 'fields': 'title', 'format': 'wire'}
+    with requests.get(f"{server.url}/apps", params=params, stream=True) as response:
+        assert response.headers['Content-Type'] == WIRE_CONTENT_TYPE
+        frames = list(WireDecoder(response.raw))
+    assert {frame['app_id']: frame['data'] for frame in frames} == {1245620: {'title': 'ELDEN RING'},
+                                                                    1091500: {'title': '赛博朋克 2077'}}
+    assert requests.get(f"{server.url}/apps", params={'ids': '1', 'format': 'xml'}).status_code == 400
+
+def test_batch_size_is_capped(mock_server):
+    source = CombinedSteamDataSource(store_url=mock_server.url)
+    with SteamScraperServer(ScraperService(source, max_batch=2), port=0) as server:
+        assert requests.get(f"{server.url}/apps", params={'ids': '1,2,3'}).status_code == 400
+        assert requests.get(f"{server.url}/apps").status_code == 400
+
+def test_shared_session_rate_limits_requests(mock_server):
+    limiter = TokenBucket(1000, burst=2)
+    with SharedSession(rate_limiter=limiter) as session:
+        for _ in range(3):
+            session.get(f"{mock_server.url}/")
+    assert limiter.stats()['granted'] == 3
+    assert limiter.stats()['waited_seconds'] > 0
@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.shared_cache import SharedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'cache.sqlite')
+
+def test_round_trips_records_and_raw_responses(cache_path):
+    cache = SharedCache(cache_path, compress_min_size=100)
+    record = {'title': '赛博朋克 2077', 'is_free': False, 'tags': ['RPG'], 'price': None}
+    cache.set('record', record)
+    cache.set('html', '<html>' + 'x' * 1000 + '</html>')
+    cache.set('raw', b'\x00\x01' * 100)
+    assert cache.get('record') == record
+    assert cache.get('html') == '<html>' + 'x' * 1000 + '</html>'
+    assert cache.get('raw') == b'\x00\x01' * 100
+    assert cache.get('missing', default='d') == 'd'
+    assert len(cache) == 3 and 'record' in cache
+
+def test_field_projection(cache_path):
+    cache = SharedCache(cache_path)
+    cache.set('record', {'title': 'Game', 'developer': {'name': 'Dev'}, 'tags': ['A', 'B'], 'is_free': True,
+                         'price': None, 'score': 91, 'rating': 4.5})
+    assert cache.get('record', fields=['developer', 'tags', 'is_free', 'price', 'score', 'rating', 'absent']) == {
+        'developer': {'name': 'Dev'}, 'tags': ['A', 'B'], 'is_free': True, 'price': None, 'score': 91, 'rating': 4.5}
+    assert cache.get('missing', fields=['title']) is None
+
+def test_ttl_and_purge(cache_path):
+    clock = FakeClock()
+    cache = SharedCache(cache_path, ttl=10, max_entries=3, purge_every=1000, clock=clock)
+    cache.set('a', 1)
+    cache.set('forever', 2, ttl=None)
+    clock.now += 10
+    assert cache.get('a') is None
+    assert cache.get('forever') == 2
+
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"k{i}", i)
+    cache.purge()
+    # The expired entry is gone, then the oldest entries beyond max_entries
+    assert len(cache) == 3
+    assert cache.get('k4') == 4 and cache.get('forever') is None
+
+def test_hit_rate(cache_path):
+    cache = SharedCache(cache_path)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('b')
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+    assert stats['all_processes']['processes'] == 1
+
+class _PurgeBetweenReads:
+    """Connection wrapper that lets another process replace an entry right after the existence check."""
+    def __init__(self, conn, other, key):
+        self.conn, self.other, self.key = conn, other, key
+
+    def execute(self, sql, *args):
+        cursor = self.conn.execute(sql, *args)
+        if sql.startswith("SELECT kind FROM entries"):
+            rows = _Rows(cursor)
+            self.other.delete(self.key)
+            return rows
+        return cursor
+
+
+class _Rows(list):
+    def fetchone(self):
+        return self[0] if self else None
+
+@pytest.mark.parametrize('value', [{'title': 'Game', 'tags': ['A']}, '<html></html>'])
+def test_field_projection_reads_one_snapshot(cache_path, value):
+    cache = SharedCache(cache_path)
+    cache.set('record', value)
+    cache._local.conn = _PurgeBetweenReads(cache._connection(), SharedCache(cache_path), 'record')
+    expected = {'title': 'Game'} if isinstance(value, dict) else value
+    assert cache.get('record', fields=['title']) == expected
+    assert cache.get('record', fields=['title']) is None
+
+def test_stats_leave_out_stale_processes(cache_path):
+    clock = FakeClock()
+    cache = SharedCache(cache_path, stats_window=60, clock=clock)
+    conn = cache._connection()
+    conn.execute("INSERT INTO metrics (pid, hits, misses, writes, updated_at) VALUES (?, 5, 5, 5, ?)", (-1, clock.now))
+    conn.execute("INSERT INTO metrics (pid, hits, misses, writes, updated_at) VALUES (?, 7, 0, 0, ?)", (-2, clock.now - 61))
+    assert cache.stats()['all_processes']['processes'] == 2
+    assert cache.stats()['all_processes']['hits'] == 5
+    clock.now += 61
+    cache.set('a', 1)
+    cache.purge()
+    assert conn.execute("SELECT pid FROM metrics ORDER BY pid").fetchall() == [(os.getpid(),)]
+
+def _writer(path, worker, count):
+    cache = SharedCache(path)
+    for i in range(count):
+        cache.set(f"{worker}:{i}", {'worker': worker, 'i': i})
+        assert cache.get(f"{worker}:{i}") == {'worker': worker, 'i': i}
+        cache.get(f"{(worker + 1) % 4}:{i}")
+    cache.flush_stats()
+
+def test_concurrent_writers_across_processes(cache_path):
+    SharedCache(cache_path)
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_writer, args=(cache_path, worker, 100)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+    assert [process.exitcode for process in processes] == [0] * 4
+
+    cache = SharedCache(cache_path)
+    assert len(cache) == 400
+    assert cache.get('3:99') == {'worker': 3, 'i': 99}
+    totals = cache.stats()['all_processes']
+    assert totals['processes'] == 5 and totals['writes'] == 400
+    assert totals['hits'] >= 400
+
+@pytest.fixture(scope="module")
+def mock_server():
+    with MockSteamServer() as server:
+        yield server
+
+def test_combined_records_are_shared_between_instances(mock_server, cache_path):
+    first = CombinedSteamDataSource(store_url=mock_server.url, shared_cache=SharedCache(cache_path))
+    record = first.get_data(1245620)
+    requests_before = sum(mock_server.stats[status] for status in (200, 302))
+
+    # A second instance (e.g. another worker process) is served from the shared file
+    second = CombinedSteamDataSource(store_url=mock_server.url, cache_size=10, shared_cache=SharedCache(cache_path))
+    assert second.get_data(1245620) == record
+    assert second.get_data(1245620, fields=['title', 'developer']) == {'title': 'ELDEN RING', 'developer': record['developer']}
+    assert sum(mock_server.stats[status] for status in (200, 302)) == requests_before
+    assert second.cache_stats()['shared']['hits'] == 2
+
+def test_raw_pages_are_shared(mock_server, cache_path):
+    cache = SharedCache(cache_path)
+    first = StoreHtmlDataSource(store_url=mock_server.url, shared_cache=cache).get_data('1245620')
+    requests_before = mock_server.stats[200]
+    second = StoreHtmlDataSource(store_url=mock_server.url, shared_cache=SharedCache(cache_path)).get_data('1245620')
+    assert second == first
+    assert mock_server.stats[200] == requests_before
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from legacy_store_parser import parse_game_details
+from synthetic_pages import synthetic_store_page
+from steamscraper.steam_data import store_html_extract
+from steamscraper.steam_data.store_html_extract import (STORE_EXTRACTOR, ExtractionEngine, Field, Rule, Selector,
+                                                      parse_store_html)
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'test_data')
+
+EDGE_CASE_PAGE = """<html><body>
+<div class="apphub_AppName"> First </div><div class="apphub_AppName">Second</div>
+<div id="game_area_description">
+  <h2 class="game_area_description_section_title">About</h2>
+  <div class="responsive_button"><a class="highlight_screenshot_link" href="hidden.jpg"></a></div>
+  Text 领取专属道具 reward
+</div>
+<div class="glance_ctn">
+  <div class="user_reviews_summary_row" data-tooltip-html="tip"><div class="subtitle">Recent Reviews:</div>
+    <span class="game_review_summary">Mixed</span></div>
+  <div class="user_reviews_summary_row"><div class="subtitle">All Reviews:</div></div>
+  <div class="dev_row"><div class="subtitle">Developer:</div><div class="summary">No link</div></div>
+  <div class="dev_row"><div class="subtitle">Publisher:</div><div class="summary"><a href="/pub">Pub</a></div></div>
+  <div class="release_date"><div class="date">1 Jan, 2020</div></div>
+</div>
+<div class="highlight_player_item highlight_movie" id="highlight_movie_7" data-video-title="Trailer"></div>
+<div class="highlight_player_item highlight_movie" id="highlight_movie_8"></div>
+<div id="thumb_movie_7"><img src="t7.jpg"></div><div id="thumb_movie_7"><img src="dup.jpg"></div>
+<a class="highlight_screenshot_link" href="s1.jpg"></a>
+<div class="glance_tags popular_tags"><a class="app_tag">A</a>
+  <div class="glance_tags popular_tags"><a class="app_tag app_tag">B</a></div></div>
+<a class="app_tag">Outside</a>
+<div class="game_purchase_action"><div class="discount_block"><div class="discount_final_price">$1</div></div></div>
+<div class="game_area_sys_req" data-os="Win"><ul class="bb_ul"><li><strong>OS:</strong> Windows</li><li>No key</li></ul></div>
+<div class="game_area_sys_req" data-os="mac"><ul class="bb_ul"></ul></div>
+<table class="game_language_options"><tr><th>h</th></tr>
+  <tr><td>English</td><td>✔</td><td></td><td>✓</td></tr><tr><td>short</td></tr></table>
+<div id="game_area_metascore"><div class="score">88</div><a href="mc">mc</a></div>
+<div class="game_area_dlc_row"><div class="game_area_dlc_name">DLC</div><div class="discount_final_price">$2</div></div>
+<div class="game_area_dlc_row"></div>
+<div class="game_area_details_specs_ctn"><div class="label">Single-player</div></div><div class="label">Outside</div>
+<div class="game_rating_descriptors">Violence<br>Blood</div>
+</body></html>"""
+
+
+def _both(html: str):
+    return STORE_EXTRACTOR.extract(BeautifulSoup(html, 'html.parser')), parse_game_details(BeautifulSoup(html, 'html.parser'))
+
+@pytest.mark.parametrize('name', ['Cyberpunk_2077-1091500-schinese.html', 'ELDEN_RING-1245620-english.html'])
+def test_engine_matches_reference_on_fixtures(name):
+    with open(os.path.join(TEST_DATA_DIR, name), 'r', encoding='utf-8') as f:
+        html = f.read()
+    engine, reference = _both(html)
+    # Same values and the same key order
+    assert json.dumps(engine, ensure_ascii=False) == json.dumps(reference, ensure_ascii=False)
+
+@pytest.mark.parametrize('html', [EDGE_CASE_PAGE, synthetic_store_page(5), '<html></html>', '<p>not a store page'])
+def test_engine_matches_reference_on_edge_cases(html):
+    engine, reference = _both(html)
+    assert json.dumps(engine, ensure_ascii=False) == json.dumps(reference, ensure_ascii=False)
+
+def test_edge_case_page_details():
+    engine, _ = _both(EDGE_CASE_PAGE)
+    assert engine['title'] == 'First'
+    assert engine['tags'] == ['A', 'B']
+    # The screenshot link inside the decomposed button is gone, as with the reference
+    assert engine['media']['screenshots'] == ['s1.jpg']
+    assert engine['media']['videos'][0]['thumbnail'] == 't7.jpg'
+    assert engine['media']['videos'][1]['thumbnail'] is None
+    assert engine['features'] == ['Single-player']
+
+def test_engine_walks_tree_once(mocker):
+    soup = BeautifulSoup(EDGE_CASE_PAGE, 'html.parser')
+    find = mocker.spy(BeautifulSoup, 'find')
+    select = mocker.spy(BeautifulSoup, 'select')
+    STORE_EXTRACTOR.extract(soup)
+    # No root-level searches; extractors only search inside matched elements
+    assert all(call.args[0] is not soup for call in find.call_args_list)
+    assert all(call.args[0] is not soup for call in select.call_args_list)
+
+def test_descendant_scope_excludes_scope_element_itself():
+    engine = ExtractionEngine([Field(
+        (Rule('items', Selector(classes=('x',)), scope=Selector(classes=('x',))),),
+        lambda m, data: data.update(items=[el['id'] for el in m['items']]))])
+    soup = BeautifulSoup('<div class="x" id="a"><div class="x" id="b"><i class="x" id="c"></i></div></div>'
+                         '<b class="x" id="d"></b>', 'html.parser')
+    assert engine.extract(soup) == {'items': ['b', 'c']}
+    assert [el['id'] for el in soup.select('.x .x')] == ['b', 'c']
+
+def test_store_parser_override_takes_effect(mocker):
+    """Fails when a bs4 upgrade drops the hook, so the quadratic void-tag list does not come back silently."""
+    assert store_html_extract._CUSTOM_PARSER_SUPPORTED
+    append = mocker.spy(store_html_extract._PendingEndTags, 'append')
+    soup = parse_store_html('<p>one<br>two<br><img src="a.jpg"></p>')
+    assert [call.args[1] for call in append.call_args_list] == ['br', 'br', 'img']
+    assert str(soup) == str(BeautifulSoup('<p>one<br>two<br><img src="a.jpg"></p>', 'html.parser'))
+
+def test_store_parser_falls_back_to_the_stock_builder(mocker):
+    mocker.patch.object(store_html_extract, '_CUSTOM_PARSER_SUPPORTED', False)
+    with open(os.path.join(TEST_DATA_DIR, 'ELDEN_RING-1245620-english.html'), encoding='utf-8') as f:
+        html = f.read()
+    fallback = STORE_EXTRACTOR.extract(parse_store_html(html))
+    mocker.stopall()
+    assert fallback == STORE_EXTRACTOR.extract(parse_store_html(html))
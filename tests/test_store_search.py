@@ -0,0 +1,111 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_data.store_search import StoreSearchDataSource, parse_search_rows
+from steamscraper.steam_index import GameIndex, Range, Term, parse_price
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'test_data')
+
+
+def _read(name):
+    with open(os.path.join(TEST_DATA_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+@pytest.fixture(scope="module")
+def search_server():
+    with MockSteamServer(search_apps=230) as server:
+        yield server
+
+def test_rows_parse_to_compact_records():
+    rows = parse_search_rows(_read('search_results_english.html'))
+    assert [row['item_key'] for row in rows] == ['App_1245620', 'App_1091500', 'Bundle_28631', 'App_1086940',
+                                                 'App_730', 'App_2622380']
+    elden_ring, _, bundle, baldurs_gate, counter_strike, nightreign = rows
+    assert elden_ring == {
+        'app_id': 1245620,
+        'item_key': 'App_1245620',
+        'title': 'ELDEN RING',
+        'release_date': '24 Feb, 2022',
+        'price': {'discount_price': 'S$47.94', 'original_price': 'S$79.90'},
+        'discount_percent': 40,
+        'reviews': {'all': {'summary': 'Very Positive',
+                            'tooltip': '93% of the 745,843 user reviews for this game are positive.'}},
+        'tag_ids': [29482, 1695, 4604, 122, 4026],
+    }
+    assert bundle['app_id'] is None and bundle['discount_percent'] == 61
+    assert baldurs_gate['title'] == "Baldur's Gate 3"
+    assert (baldurs_gate['price'], baldurs_gate['discount_percent']) == ('S$59.90', 0)
+    assert counter_strike['price'] == 'Free'
+    assert (nightreign['price'], nightreign['reviews'], nightreign['release_date']) == ('N/A', {}, 'Coming soon')
+
+def test_rows_match_the_store_page_fields():
+    """Shared fields carry the same values as the store page record, so either can refresh the other."""
+    row = parse_search_rows(_read('search_results_english.html'))[0]
+    page = StoreHtmlDataSource().parse_static_content(_read('ELDEN_RING-1245620-english.html'))
+    for field in ('title', 'release_date', 'price'):
+        assert row[field] == page[field]
+    assert row['reviews']['all']['summary'] == page['reviews']['all']['summary']
+    # Tag IDs resolve to the app's top store tags
+    names = {29482: 'Souls-like', 1695: 'Open World', 4604: 'Dark Fantasy', 122: 'RPG', 4026: 'Difficult'}
+    tagged = parse_search_rows(_read('search_results_english.html'), tag_names=names)[0]
+    assert tagged['tags'] == page['tags'][:5]
+
+def test_iter_pages_covers_the_listing(search_server):
+    ds = StoreSearchDataSource(store_url=search_server.url, page_size=100)
+    pages = list(ds.iter_pages())
+    assert [len(page.rows) for page in pages] == [100, 100, 36]
+    assert [page.start for page in pages] == [0, 100, 200]
+    assert pages[-1].next_start is None and pages[0].total_count == 236
+    app_ids = [row['app_id'] for page in pages for row in page.rows if row['app_id']]
+    assert len(app_ids) == len(set(app_ids)) == 235
+
+def test_iter_apps_skips_bundles_and_resumes(search_server):
+    ds = StoreSearchDataSource(store_url=search_server.url, page_size=4)
+    assert [row['title'] for row in ds.iter_apps('elden ring')] == ['ELDEN RING', 'ELDEN RING NIGHTREIGN']
+    assert len(list(ds.iter_apps(max_results=7))) == 7
+
+    data = ds.get_data('', max_results=5)
+    assert [row['app_id'] for row in data['apps']] == [1245620, 1091500, 1086940, 730, 2622380]
+    assert data['total_count'] == 236
+    # The second page was cut short after its second row, so the listing resumes inside it
+    assert data['next_start'] == 6
+    assert next(ds.iter_apps(start=data['next_start']))['app_id'] == 100000
+
+def test_iter_pages_prefetches_next_page():
+    fetched = []
+    second_requested = threading.Event()
+    row = _read('search_results_english.html')
+
+    def fake_fetch(self, term, start, lang, cc, filters):
+        fetched.append((start, filters))
+        if start:
+            second_requested.set()
+        return {'success': 1, 'results_html': row, 'total_count': 12, 'start': start}
+
+    with patch.object(StoreSearchDataSource, '_fetch_page', fake_fetch):
+        pages = StoreSearchDataSource().iter_pages(category1='998')
+        first = next(pages)
+        assert first.next_start == 6
+        assert second_requested.wait(2)
+        assert [page.start for page in pages] == [6]
+    assert fetched == [(0, {'category1': '998'}), (6, {'category1': '998'})]
+
+def test_failed_request_ends_the_listing():
+    with patch.object(StoreSearchDataSource, '_fetch_page', return_value=None):
+        ds = StoreSearchDataSource()
+        assert list(ds.iter_pages()) == []
+        assert ds.get_data('') is None
+
+def test_records_feed_the_game_index(search_server):
+    rows = list(StoreSearchDataSource(store_url=search_server.url).iter_apps())
+    index = GameIndex()
+    index.add_many((row['app_id'], row) for row in rows)
+    expected = {row['app_id'] for row in rows if row['reviews'] and row['reviews']['all']['summary'] == 'Overwhelmingly Positive'
+                and parse_price(row) is not None and parse_price(row) <= 10}
+    assert expected
+    assert set(index.search(Term('all_reviews', 'Overwhelmingly Positive') & Range('price', high=10))) == expected
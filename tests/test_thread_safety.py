@@ -0,0 +1,124 @@
+"""
+Sources shared across threads. On GIL builds the switch interval is lowered
+so threads interleave as often as possible; on free-threaded (no-GIL) builds
+the same tests run truly in parallel, and parsing is also checked to scale.
+"""
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mock_steam_server import MockSteamServer
+from steamscraper.steam_data.base import SteamDataSource
+from steamscraper.steam_data.combined_data import CombinedSteamDataSource
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.web_utils import DEFAULT_COOKIES, DEFAULT_HEADERS, fetch_steam_store_html
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'test_data')
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+
+class PageSource(SteamDataSource):
+    """Parses in-memory pages, so threads only compete for the CPU."""
+    def __init__(self, pages):
+        self.pages = pages
+        self.parser = StoreHtmlDataSource()
+
+    def get_data(self, identifier, **kwargs):
+        return self.parser.parse_static_content(self.pages[identifier])
+
+
+@pytest.fixture(scope="module")
+def pages():
+    result = {}
+    for name in ('Cyberpunk_2077-1091500-schinese.html', 'ELDEN_RING-1245620-english.html'):
+        with open(os.path.join(TEST_DATA_DIR, name), encoding='utf-8') as f:
+            result[name] = f.read()
+    return result
+
+@pytest.fixture
+def fast_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+def test_fetch_leaves_caller_proxies_alone(monkeypatch):
+    monkeypatch.setenv('HTTPS_PROXY', 'http://env-proxy:3128')
+    monkeypatch.delenv('HTTP_PROXY', raising=False)
+    proxies = {'http': 'http://caller-proxy:8080'}
+    with patch('requests.get') as get:
+        get.return_value = MagicMock(text='<html></html>')
+        fetch_steam_store_html('https://store.steampowered.com/app/1/', proxies=proxies)
+    assert proxies == {'http': 'http://caller-proxy:8080'}
+    assert get.call_args.kwargs['proxies'] == {'http': 'http://caller-proxy:8080', 'https': 'http://env-proxy:3128'}
+
+def test_default_headers_and_cookies_are_read_only():
+    with pytest.raises(TypeError):
+        DEFAULT_HEADERS['User-Agent'] = 'curl'
+    with pytest.raises(TypeError):
+        DEFAULT_COOKIES['birthtime'] = '0'
+    with patch('requests.get') as get:
+        get.return_value = MagicMock(text='<html></html>')
+        fetch_steam_store_html('https://store.steampowered.com/app/1/')
+    # Each request gets its own copies
+    assert get.call_args.kwargs['headers'] == dict(DEFAULT_HEADERS)
+    assert get.call_args.kwargs['headers'] is not DEFAULT_HEADERS
+
+def test_concurrent_parsing_matches_serial(pages, fast_switching):
+    source = PageSource(pages)
+    expected = {name: source.get_data(name) for name in pages}
+    identifiers = list(pages) * 16
+    results = list(source.get_many(identifiers, max_workers=16))
+    assert len(results) == len(identifiers)
+    for name, record in results:
+        assert record == expected[name]
+
+def test_get_many_streams_lazily_and_survives_errors():
+    consumed = []
+
+    class Flaky(SteamDataSource):
+        def get_data(self, identifier, **kwargs):
+            if identifier % 7 == 0:
+                raise RuntimeError("boom")
+            return {'id': identifier, 'lang': kwargs['lang']}
+
+    def identifiers():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    results = Flaky().get_many(identifiers(), max_workers=2, lang='english')
+    first = next(results)
+    # Only a bounded window of the input has been pulled
+    assert len(consumed) <= 5
+    results = dict([first, *results])
+    assert len(results) == 100
+    assert all(results[i] is None for i in range(0, 100, 7))
+    assert results[1] == {'id': 1, 'lang': 'english'}
+
+def test_shared_combined_source_across_threads(fast_switching):
+    with MockSteamServer(latency=0.005) as server:
+        source = CombinedSteamDataSource(store_url=server.url, cache_size=0)
+        expected = source.get_data('1091500', lang='schinese')
+        results = list(source.get_many(['1091500'] * 32, max_workers=16, lang='schinese'))
+    assert [record for _, record in results] == [expected] * 32
+
+@pytest.mark.skipif(not FREE_THREADED, reason="needs a free-threaded (no-GIL) CPython build")
+def test_parsing_scales_with_threads(pages):
+    source = PageSource(pages)
+    identifiers = list(pages) * 32
+
+    def throughput(workers):
+        started = time.perf_counter()
+        for _ in source.get_many(identifiers, max_workers=workers):
+            pass
+        return len(identifiers) / (time.perf_counter() - started)
+
+    workers = min(4, os.cpu_count() or 1)
+    if workers < 2:
+        pytest.skip("needs at least two CPUs")
+    throughput(1)  # Warm up
+    assert throughput(workers) > 1.5 * throughput(1)
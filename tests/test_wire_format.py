@@ -0,0 +1,100 @@
+import io
+import json
+import os
+
+import pytest
+
+from steamscraper.steam_crawl.bounded_crawl import WireSink
+from steamscraper.steam_data.store_html import StoreHtmlDataSource
+from steamscraper.steam_utils.wire_format import (HEADER, SCHEMA_V1, WireDecoder, WireEncoder, WireFormatError, dumps,
+                                                  loads)
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'test_data')
+
+
+def _fixture_records():
+    records = []
+    for name in ('Cyberpunk_2077-1091500-schinese.html', 'ELDEN_RING-1245620-english.html'):
+        with open(os.path.join(TEST_DATA_DIR, name), encoding='utf-8') as f:
+            records.append(StoreHtmlDataSource().parse_static_content(f.read()))
+    with open(os.path.join(TEST_DATA_DIR, 'appdetails_1091500_english.json'), encoding='utf-8') as f:
+        records.append(json.load(f))
+    return records
+
+def test_fixture_records_round_trip_smaller_than_json():
+    for record in _fixture_records():
+        encoded = dumps(record)
+        assert loads(encoded) == record
+        assert len(encoded) < 0.8 * len(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+
+def test_scalars_round_trip():
+    values = [None, True, False, 0, 127, 128, -1, -128, 2 ** 70, -2 ** 70, 0.5, -1e300, float('inf'),
+              '', 'Windows', '赛博朋克 2077', 'x' * 1000, [], {}, [[1, [2]], {'a': {'b': None}}],
+              'https://store.steampowered.com/app/1091500/', 'https://cdn.example.com/' + 'dir/' * 30 + 'file.jpg']
+    for value in values:
+        assert loads(dumps(value)) == value
+    assert loads(dumps((1, 'a'))) == [1, 'a']
+    # Keys are coerced like json.dumps does
+    assert loads(dumps({1: 'a', None: 'b', True: 'c'})) == json.loads(json.dumps({1: 'a', None: 'b', True: 'c'}))
+    with pytest.raises(TypeError):
+        dumps({'when': object()})
+
+def test_stream_shares_the_string_table_across_records():
+    records = [{'app_id': i, 'tags': ['Open World', 'RPG', 'Cyberpunk'], 'developer': {'name': 'CD PROJEKT RED'},
+                'screenshot': f'https://shared.fastly.steamstatic.com/store_item_assets/steam/apps/{i}/ss_{i}.jpg'}
+               for i in range(100)]
+    buffer = io.BytesIO()
+    encoder = WireEncoder(buffer)
+    assert encoder.write_all(records) == 100
+    buffer.seek(0)
+    assert list(WireDecoder(buffer)) == records
+    # Repeated strings and URL directories are references after the first record
+    assert len(buffer.getvalue()) / 100 < 0.5 * len(dumps(records[0]))
+
+def test_frames_decode_incrementally():
+    records = _fixture_records()
+    encoder = WireEncoder()
+    frames = [encoder.encode(record) for record in records]
+    assert frames[0].startswith(HEADER) and not frames[1].startswith(HEADER)
+    decoder = WireDecoder()
+    assert [record for frame in frames for record in decoder.decode(frame)] == records
+
+def test_schema_references_beyond_the_short_range():
+    key = SCHEMA_V1[-1]
+    encoded = dumps({key: 1})
+    # Frame length, dict tag and size, reference tag and two-byte index, value
+    assert len(encoded) == len(HEADER) + 7
+    assert loads(encoded) == {key: 1}
+
+def test_string_table_limit():
+    encoder = WireEncoder(max_strings=len(SCHEMA_V1) + 2)
+    values = [f'tag {i}' for i in range(10)] * 2
+    decoder = WireDecoder()
+    assert decoder.decode(encoder.encode(values)) == [values]
+    assert decoder.decode(encoder.encode(values)) == [values]
+
+def test_concatenated_streams_and_wire_sink(tmp_path):
+    path = str(tmp_path / 'records.ssw')
+    records = _fixture_records()
+    with WireSink(path) as sink:
+        sink('1091500', records[0])
+    with WireSink(path) as sink:
+        sink('1245620', records[1])
+        sink('1091500', records[2])
+        assert sink.count == 2
+    with open(path, 'rb') as f:
+        assert list(WireDecoder(f)) == [{'id': '1091500', 'data': records[0]}, {'id': '1245620', 'data': records[1]},
+                                        {'id': '1091500', 'data': records[2]}]
+
+def test_invalid_streams():
+    encoded = dumps({'title': 'ELDEN RING'})
+    with pytest.raises(WireFormatError):
+        loads(b'{"title": "ELDEN RING"}')
+    with pytest.raises(WireFormatError):
+        loads(HEADER[:4] + bytes([2]) + encoded[len(HEADER):])
+    with pytest.raises(WireFormatError):
+        list(WireDecoder(io.BytesIO(encoded[:-3])))
+    with pytest.raises(WireFormatError):
+        loads(encoded[:-1] + b'\x9f')
+    with pytest.raises(WireFormatError):
+        loads(HEADER)
@@ -0,0 +1,192 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from steamscraper.steam_crawl.work_queue import JobQueue, SQLiteJobQueue, run_worker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'jobs.sqlite')
+
+def test_enqueue_deduplicates(queue_path):
+    queue = SQLiteJobQueue(queue_path)
+    assert queue.enqueue([(1, 'english', None), (2, 'english', ['title', 'price'])]) == 2
+    # Field order does not make a job distinct
+    assert queue.enqueue([(1, 'english', None), (2, 'english', ['price', 'title']), (1, 'schinese', None)]) == 1
+    assert queue.stats() == {'pending': 3, 'leased': 0, 'done': 0, 'failed': 0}
+
+def test_dequeue_leases_and_acks(queue_path):
+    queue = SQLiteJobQueue(queue_path)
+    queue.enqueue([(app_id, 'english', ['title']) for app_id in range(5)])
+
+    first = queue.dequeue('w1', batch_size=3)
+    second = queue.dequeue('w2', batch_size=3)
+    assert [job.app_id for job in first] == [0, 1, 2]
+    assert [job.app_id for job in second] == [3, 4]
+    assert first[0].fields == ('title',)
+    assert queue.dequeue('w3') == []
+
+    # Only the lease holder can acknowledge a job
+    assert queue.ack('w2', [job.id for job in first]) == 0
+    assert queue.ack('w1', [job.id for job in first]) == 3
+    assert queue.stats() == {'pending': 0, 'leased': 2, 'done': 3, 'failed': 0}
+
+def test_expired_leases_are_reclaimed(queue_path):
+    clock = FakeClock()
+    queue = SQLiteJobQueue(queue_path, lease_seconds=60, clock=clock)
+    queue.enqueue([(1, 'english', None)])
+
+    job, = queue.dequeue('crashed')
+    clock.now += 30
+    assert queue.dequeue('w2') == []
+    clock.now += 31
+    reclaimed, = queue.dequeue('w2')
+    assert reclaimed.id == job.id and reclaimed.attempts == 2
+
+    # The original worker lost its lease and can no longer ack
+    assert queue.ack('crashed', [job.id]) == 0
+    assert queue.ack('w2', [job.id]) == 1
+
+def test_jobs_that_keep_losing_their_lease_fail(queue_path):
+    clock = FakeClock()
+    queue = SQLiteJobQueue(queue_path, lease_seconds=60, max_attempts=2, clock=clock)
+    queue.enqueue([(1, 'english', None), (2, 'english', None)])
+
+    poison, healthy = queue.dequeue('crashed')
+    assert queue.ack('crashed', [healthy.id]) == 1
+    clock.now += 61
+    job, = queue.dequeue('w2')
+    assert job.id == poison.id and job.attempts == 2
+    # The second worker dies too: the job is not leased a third time
+    clock.now += 61
+    assert queue.dequeue('w3') == []
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 1, 'failed': 1}
+    assert queue.is_drained()
+
+def test_extend_lease(queue_path):
+    clock = FakeClock()
+    queue = SQLiteJobQueue(queue_path, lease_seconds=60, clock=clock)
+    queue.enqueue([(1, 'english', None)])
+    job, = queue.dequeue('w1')
+    clock.now += 50
+    assert queue.extend_lease('w1', [job.id]) == 1
+    clock.now += 50
+    assert queue.dequeue('w2') == []
+
+def test_nack_retries_then_fails(queue_path):
+    clock = FakeClock()
+    queue = SQLiteJobQueue(queue_path, max_attempts=2, clock=clock)
+    queue.enqueue([(1, 'english', None)])
+
+    job, = queue.dequeue('w1')
+    assert queue.nack('w1', [job.id], error='boom', retry_delay=10) == 1
+    assert queue.dequeue('w1') == []  # Not yet available
+    clock.now += 10
+    job, = queue.dequeue('w1')
+    queue.nack('w1', [job.id], error='boom')
+    assert queue.stats()['failed'] == 1
+    assert queue.is_drained()
+
+
+def test_job_queue_interface_covers_run_worker():
+    """A backend written against the ABC must implement everything run_worker and callers use."""
+    assert JobQueue.__abstractmethods__ == {'enqueue', 'dequeue', 'extend_lease', 'ack', 'nack', 'stats', 'is_drained'}
+
+
+class RecordingSource:
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_data(self, identifier, lang='english', fields=None):
+        with self.lock:
+            self.calls.append(identifier)
+        if identifier in self.fail_ids:
+            return None
+        return {'steam_appid': identifier, 'lang': lang}
+
+def test_run_worker_processes_each_job_once(queue_path):
+    queue = SQLiteJobQueue(queue_path, max_attempts=1)
+    queue.enqueue([(app_id, 'english', None) for app_id in range(50)])
+    source = RecordingSource(fail_ids={7})
+    results = []
+    lock = threading.Lock()
+
+    def handle(job, data):
+        with lock:
+            results.append(data['steam_appid'])
+
+    threads = [threading.Thread(target=run_worker, args=(queue, source, handle),
+                                kwargs={'worker_id': f'w{i}', 'batch_size': 4, 'poll_interval': 0.01})
+               for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == [i for i in range(50) if i != 7]
+    assert sorted(source.calls) == list(range(50))
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 49, 'failed': 1}
+
+def test_run_worker_isolates_a_failing_result_handler(queue_path):
+    """A handler error fails only its own job; the rest of the batch is acked, not left leased."""
+    queue = SQLiteJobQueue(queue_path, max_attempts=2)
+    queue.enqueue([(app_id, 'english', None) for app_id in range(4)])
+    handled = []
+
+    def handle(job, data):
+        if job.app_id == 1:
+            raise OSError("disk full")
+        handled.append(job.app_id)
+
+    counts = run_worker(queue, RecordingSource(fail_ids={3}), handle, worker_id='w1', batch_size=4, retry_delay=0,
+                        poll_interval=0.01)
+    assert sorted(handled) == [0, 2]
+    assert counts == {'done': 2, 'retried': 2, 'failed': 2}
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 2}
+
+def test_run_worker_renews_the_batch_lease(queue_path):
+    clock = FakeClock()
+    queue = SQLiteJobQueue(queue_path, lease_seconds=10, clock=clock)
+    queue.enqueue([(app_id, 'english', None) for app_id in range(3)])
+    stolen = []
+
+    class SlowSource(RecordingSource):
+        def get_data(self, identifier, lang='english', fields=None):
+            clock.now += 6  # Each lookup takes more than half the lease
+            stolen.extend(queue.dequeue('w2'))
+            return super().get_data(identifier, lang, fields)
+
+    counts = run_worker(queue, SlowSource(), lambda job, data: None, worker_id='w1', batch_size=3, renew_interval=0)
+    assert stolen == []
+    assert counts == {'done': 3, 'retried': 0, 'failed': 0}
+
+
+def _process_worker(path, out, worker_id):
+    queue = SQLiteJobQueue(path)
+    run_worker(queue, RecordingSource(), lambda job, data: out.put(job.app_id), worker_id=worker_id,
+               batch_size=5, poll_interval=0.01)
+
+def test_queue_is_shared_across_processes(queue_path):
+    queue = SQLiteJobQueue(queue_path)
+    queue.enqueue([(app_id, 'english', None) for app_id in range(100)])
+    out = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_process_worker, args=(queue_path, out, f'p{i}')) for i in range(3)]
+    for p in procs:
+        p.start()
+    seen = [out.get(timeout=30) for _ in range(100)]
+    for p in procs:
+        p.join(timeout=30)
+    assert sorted(seen) == list(range(100))
+    assert queue.stats()['done'] == 100